@@ -0,0 +1,106 @@
+"""
+Core pose processing module
+"""
+
+from .landmarks import NUM_JOINTS, BODY_PARTS, as_sequence
+from .normalization import normalize_sequence, procrustes_align, prepare_reference
+from .scoring import score_attempt, score_batch, pad_sequences, resample_sequence, analyze_attempt, ScoreBreakdown
+from .feedback import generate_feedback, feedback_summary
+from .batching import ScoringBatcher
+from .alignment import align_sequences, warp_to_reference, nearest_sequence, lb_keogh
+from .sign_library import SignLibrary, open_sign_library, write_sign_library
+from .recognition import SignIndex, embed_window, embed_windows
+from .codec import encode_sequence, decode_sequence, decode_quantized
+from .estimators import PoseEstimator, StubEstimator, MediaPipeEstimator
+from .workers import LandmarkWorkerPool
+from .embedding import HashingEmbedder
+from .embedding_store import EmbeddingStore, BatchEmbedder, content_key
+from .retrieval import RetrievalIndex, load_retrieval_index, curriculum_documents
+from .answer_cache import AnswerCache
+from .chat import ChatAssistant, ChatStream, LocalChatModel, chat_metrics
+from .keywords import KeywordMatcher
+from .assessment import (
+    calculate_assessment_score, adaptive_assessment_score, adaptive_transcript_score,
+    generate_ai_recommendations
+)
+from .adaptive import ItemBank, AdaptiveSession, placement_item_bank
+from .content_store import ContentStore, open_content_store, build_content_store
+from .progress import ProgressAggregates, LevelProgress, progress_aggregates
+from .session_store import SessionStore, open_session_store
+from .event_log import EventLog, ActivityRollup, open_event_log
+from .analytics import ColumnarEvents, write_columnar, export_event_log
+from .streaming import FramePipeline, RingBuffer, practice_pipeline, synthetic_frames, video_file_frames
+
+__all__ = [
+    'NUM_JOINTS',
+    'BODY_PARTS',
+    'as_sequence',
+    'score_attempt',
+    'score_batch',
+    'pad_sequences',
+    'ScoringBatcher',
+    'align_sequences',
+    'warp_to_reference',
+    'nearest_sequence',
+    'lb_keogh',
+    'SignLibrary',
+    'open_sign_library',
+    'write_sign_library',
+    'SignIndex',
+    'embed_window',
+    'embed_windows',
+    'encode_sequence',
+    'decode_sequence',
+    'decode_quantized',
+    'PoseEstimator',
+    'StubEstimator',
+    'MediaPipeEstimator',
+    'LandmarkWorkerPool',
+    'FramePipeline',
+    'RingBuffer',
+    'practice_pipeline',
+    'synthetic_frames',
+    'video_file_frames',
+    'normalize_sequence',
+    'procrustes_align',
+    'prepare_reference',
+    'resample_sequence',
+    'analyze_attempt',
+    'ScoreBreakdown',
+    'generate_feedback',
+    'feedback_summary',
+    'HashingEmbedder',
+    'EmbeddingStore',
+    'BatchEmbedder',
+    'content_key',
+    'RetrievalIndex',
+    'load_retrieval_index',
+    'curriculum_documents',
+    'ChatAssistant',
+    'ChatStream',
+    'LocalChatModel',
+    'chat_metrics',
+    'AnswerCache',
+    'KeywordMatcher',
+    'calculate_assessment_score',
+    'generate_ai_recommendations',
+    'adaptive_assessment_score',
+    'adaptive_transcript_score',
+    'ItemBank',
+    'AdaptiveSession',
+    'placement_item_bank',
+    'ContentStore',
+    'open_content_store',
+    'build_content_store',
+    'ProgressAggregates',
+    'LevelProgress',
+    'progress_aggregates',
+    'SessionStore',
+    'open_session_store',
+    'EventLog',
+    'ActivityRollup',
+    'open_event_log',
+    'ColumnarEvents',
+    'write_columnar',
+    'export_event_log',
+]
@@ -0,0 +1,244 @@
+"""
+Adaptive placement testing
+
+Computerized adaptive testing under a three-parameter logistic (3PL) IRT
+model. Each multiple-choice item has a discrimination `a`, a difficulty `b`
+and a guessing floor `c`; the probability that a learner of ability theta
+answers correctly is
+
+    P(theta) = c + (1 - c) / (1 + exp(-a (theta - b)))
+
+(`c = 0` gives the 2PL model). The ability estimate is the posterior mean
+(EAP) over a fixed theta grid with a standard normal prior. Item
+probabilities and Fisher information are tabulated on the same grid when
+the bank is built, so:
+
+- updating the posterior after an answer adds one precomputed log-likelihood
+  row;
+- choosing the next item is one argmax over a precomputed information
+  column, at the grid point nearest the current estimate.
+
+The test stops once the posterior standard error drops to `target_se`, or
+after `max_items` questions.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from ..models.curriculum import LESSON_CONTENT, QUIZ_QUESTIONS
+
+# Theta grid for the posterior and the precomputed tables
+GRID_MIN = -4.0
+GRID_MAX = 4.0
+GRID_POINTS = 81
+# Stopping rule
+TARGET_SE = 0.45
+MIN_ITEMS = 3
+MAX_ITEMS = 6
+# Difficulty (b) for the `difficulty` labels used in the curriculum
+DIFFICULTY_B = {"beginner": -1.0, "intermediate": 0.0, "advanced": 1.0}
+DEFAULT_DISCRIMINATION = 1.2
+
+# Keeps log-likelihoods finite for items with P = 1 or c = 0
+_EPS = 1e-9
+
+
+class ItemBank:
+    """
+    Calibrated multiple-choice items with precomputed IRT tables
+
+    Args:
+        items: Question dicts with at least "id", "options" and "correct"
+        a, b, c: Discrimination, difficulty and guessing floor per item
+
+    Usage:
+        bank = placement_item_bank()
+        session = AdaptiveSession(bank)
+    """
+
+    def __init__(self, items: Sequence[Mapping[str, Any]], a: Sequence[float],
+                 b: Sequence[float], c: Sequence[float]):
+        self.items = list(items)
+        self.ids = [item["id"] for item in self.items]
+        self.index = {item_id: idx for idx, item_id in enumerate(self.ids)}
+        if len(self.index) != len(self.ids):
+            raise ValueError("Item ids must be unique")
+        self.a = np.asarray(a, dtype=np.float64)
+        self.b = np.asarray(b, dtype=np.float64)
+        self.c = np.asarray(c, dtype=np.float64)
+        if not (len(self.a) == len(self.b) == len(self.c) == len(self.items)):
+            raise ValueError("Need one a, b and c per item")
+
+        self.grid = np.linspace(GRID_MIN, GRID_MAX, GRID_POINTS)
+        logistic = 1.0 / (1.0 + np.exp(-self.a[:, None] * (self.grid[None, :] - self.b[:, None])))
+        # (items, grid) tables
+        self.p_correct = self.c[:, None] + (1.0 - self.c[:, None]) * logistic
+        self.log_p = np.log(np.clip(self.p_correct, _EPS, 1.0))
+        self.log_q = np.log(np.clip(1.0 - self.p_correct, _EPS, 1.0))
+        # 3PL Fisher information; reduces to a^2 P Q for c = 0
+        q = 1.0 - self.p_correct
+        self.information = (self.a[:, None] ** 2 * (q / np.clip(self.p_correct, _EPS, None))
+                            * ((self.p_correct - self.c[:, None]) / (1.0 - self.c[:, None])) ** 2)
+        # Transposed copy so an information column is contiguous
+        self._information_by_theta = np.ascontiguousarray(self.information.T)
+        self.log_prior = -0.5 * self.grid ** 2
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @classmethod
+    def from_questions(cls, questions: Sequence[Mapping[str, Any]],
+                       default_difficulty: str = "beginner") -> "ItemBank":
+        """
+        Build a bank from curriculum question dicts
+
+        Items may carry calibrated parameters in an "irt" dict with keys
+        "a", "b" and "c". Otherwise b comes from the "difficulty" label, a
+        is DEFAULT_DISCRIMINATION and c is the chance of guessing among
+        the options.
+        """
+        a, b, c = [], [], []
+        for question in questions:
+            irt = question.get("irt", {})
+            difficulty = question.get("difficulty", default_difficulty).lower()
+            a.append(irt.get("a", DEFAULT_DISCRIMINATION))
+            b.append(irt.get("b", DIFFICULTY_B.get(difficulty, 0.0)))
+            c.append(irt.get("c", 1.0 / len(question["options"])))
+        return cls(questions, a, b, c)
+
+    def grid_index(self, theta: float) -> int:
+        """Index of the grid point nearest theta"""
+        step = (GRID_MAX - GRID_MIN) / (GRID_POINTS - 1)
+        return int(np.clip(round((theta - GRID_MIN) / step), 0, GRID_POINTS - 1))
+
+    def most_informative(self, theta: float, available: np.ndarray) -> Optional[int]:
+        """
+        Item with maximum information at theta
+
+        Args:
+            theta: Ability estimate
+            available: Boolean mask of items that may be asked
+
+        Returns:
+            Item index, or None if no item is available
+        """
+        if not available.any():
+            return None
+        column = self._information_by_theta[self.grid_index(theta)]
+        return int(np.argmax(np.where(available, column, -np.inf)))
+
+    def expected_score(self, theta: float) -> float:
+        """Expected fraction of the whole bank answered correctly at theta"""
+        return float(self.p_correct[:, self.grid_index(theta)].mean())
+
+
+@dataclass
+class AdaptiveSession:
+    """
+    State of one adaptive test
+
+    Cheap to keep in Streamlit session state: the bank is shared and the
+    session holds only the posterior and the answers so far.
+
+    Usage:
+        session = AdaptiveSession(placement_item_bank())
+        while (item := session.next_item()) is not None:
+            session.record(item, answer == session.bank.items[item]["correct"])
+    """
+    bank: ItemBank
+    target_se: float = TARGET_SE
+    min_items: int = MIN_ITEMS
+    max_items: int = MAX_ITEMS
+
+    def __post_init__(self):
+        self.log_posterior = self.bank.log_prior.copy()
+        self.administered: List[int] = []
+        self.responses: List[bool] = []
+        self._available = np.ones(len(self.bank), dtype=bool)
+        self._pending: Optional[int] = None
+        self._update_estimate()
+
+    @classmethod
+    def from_answers(cls, bank: ItemBank, answers: Mapping[str, Any], **options) -> "AdaptiveSession":
+        """
+        Replay a test from its answers
+
+        Rebuilds the session of a learner resuming a test, or of an exported
+        transcript; the estimate does not depend on the order of the answers.
+
+        Args:
+            bank: Bank the test was drawn from
+            answers: Item id to chosen option; ids not in the bank (e.g.
+                short answers) are ignored
+            **options: target_se, min_items, max_items
+        """
+        session = cls(bank, **options)
+        for item_id, answer in answers.items():
+            item = bank.index.get(item_id)
+            if item is not None:
+                session.record(item, answer == bank.items[item]["correct"])
+        return session
+
+    def _update_estimate(self) -> None:
+        weights = np.exp(self.log_posterior - self.log_posterior.max())
+        weights /= weights.sum()
+        self.theta = float(weights @ self.bank.grid)
+        self.se = float(np.sqrt(weights @ (self.bank.grid - self.theta) ** 2))
+
+    @property
+    def finished(self) -> bool:
+        """Whether the stopping rule is met or the bank is exhausted"""
+        asked = len(self.administered)
+        return (asked >= self.max_items or not self._available.any()
+                or (asked >= self.min_items and self.se <= self.target_se))
+
+    @property
+    def correct(self) -> int:
+        """Number of correct answers so far"""
+        return sum(self.responses)
+
+    def next_item(self) -> Optional[int]:
+        """
+        Item to ask next
+
+        Returns the same item until it is answered, or None once the test
+        is finished.
+        """
+        if self._pending is None and not self.finished:
+            self._pending = self.bank.most_informative(self.theta, self._available)
+        return self._pending
+
+    def record(self, item: int, correct: bool) -> None:
+        """Update the ability estimate with the answer to an item"""
+        if not self._available[item]:
+            raise ValueError(f"Item {self.bank.ids[item]} was already answered")
+        self._available[item] = False
+        self._pending = None
+        self.administered.append(item)
+        self.responses.append(bool(correct))
+        self.log_posterior += self.bank.log_p[item] if correct else self.bank.log_q[item]
+        self._update_estimate()
+
+    def summary(self) -> Dict[str, Any]:
+        """Ability estimate and the answers behind it"""
+        return {
+            "ability": self.theta,
+            "ability_se": self.se,
+            "expected_score": self.bank.expected_score(self.theta),
+            "items": [self.bank.ids[item] for item in self.administered],
+            "correct": self.correct,
+            "asked": len(self.administered),
+        }
+
+
+@lru_cache(maxsize=1)
+def placement_item_bank() -> ItemBank:
+    """The placement questions plus the lesson quiz questions, built once per process"""
+    items = [dict(question) for question in QUIZ_QUESTIONS["multiple_choice"]]
+    for lesson_type, content in LESSON_CONTENT.items():
+        for idx, question in enumerate(content.get("questions", [])):
+            items.append({"id": f"lesson:{lesson_type.lower()}:{idx}", **question})
+    return ItemBank.from_questions(items)
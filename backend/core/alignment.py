@@ -0,0 +1,292 @@
+"""
+Dynamic time warping for landmark sequences
+
+Aligns a learner's attempt with a reference sign when they were performed
+at different speeds. The warping path is restricted to a Sakoe-Chiba band
+around the (length-scaled) diagonal, so alignment costs O(n * window)
+instead of O(n * m). LB_Keogh lower bounds and early abandoning let
+`nearest_sequence` skip most candidates without running full DTW.
+
+The frame cost is the weighted mean Euclidean distance between matching
+joints of normalized frames; undetected joints are placed at the body
+centre so every frame cost is finite.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .landmarks import JOINT_WEIGHTS, as_sequence
+from .normalization import normalize_sequence
+
+# Default band half-width as a fraction of the longer sequence
+DEFAULT_WINDOW_FRACTION = 0.1
+
+_NORMALIZED_WEIGHTS = (JOINT_WEIGHTS / JOINT_WEIGHTS.sum()).astype(np.float32)
+
+
+@dataclass(frozen=True)
+class Alignment:
+    """Result of aligning two sequences"""
+    cost: float
+    path: Optional[np.ndarray] = None  # (steps, 2) pairs of (query, candidate) frames
+
+    @property
+    def abandoned(self) -> bool:
+        return not np.isfinite(self.cost)
+
+
+def prepare_sequence(seq) -> np.ndarray:
+    """
+    Normalize a landmark sequence for alignment
+
+    Args:
+        seq: Landmarks of shape (frames, joints, 3)
+
+    Returns:
+        Normalized float32 array with undetected joints set to the body centre
+    """
+    return np.nan_to_num(normalize_sequence(as_sequence(seq)), nan=0.0)
+
+
+def frame_costs(query_frame: np.ndarray, candidate: np.ndarray) -> np.ndarray:
+    """Weighted mean joint distance between one frame and many frames"""
+    dist = np.linalg.norm(candidate - query_frame, axis=-1)
+    return dist @ _NORMALIZED_WEIGHTS
+
+
+def _band(n: int, m: int, window: Optional[int]) -> Tuple[np.ndarray, int]:
+    """Diagonal centre of each query row and the effective band half-width"""
+    if window is None:
+        window = int(np.ceil(DEFAULT_WINDOW_FRACTION * max(n, m)))
+    # The band must be at least as wide as the diagonal's slope to stay connected
+    window = max(int(window), int(np.ceil((m - 1) / max(n - 1, 1))), 1)
+    center = np.rint(np.arange(n) * ((m - 1) / max(n - 1, 1))).astype(np.intp)
+    return center, window
+
+
+def band_bounds(n: int, m: int, window: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sakoe-Chiba band around the diagonal scaled to the sequence lengths
+
+    Args:
+        n: Query length
+        m: Candidate length
+        window: Band half-width in frames; defaults to 10% of the longer length
+
+    Returns:
+        (lo, hi) arrays of length n; row i may match candidate frames lo[i]:hi[i]
+    """
+    center, window = _band(n, m, window)
+    return np.maximum(center - window, 0), np.minimum(center + window + 1, m)
+
+
+def _running_extreme(values: np.ndarray, width: int, reduce: np.ufunc) -> np.ndarray:
+    """
+    Minimum or maximum over every run of `width` consecutive frames
+
+    van Herk/Gil-Werman: within blocks of `width` frames, a suffix scan and a
+    prefix scan each cover part of any window, so a window's extreme is the
+    extreme of two values. Linear time and memory whatever the width.
+
+    Args:
+        values: Array of shape (frames, ...)
+        width: Window length in frames
+        reduce: np.minimum or np.maximum
+
+    Returns:
+        Array of shape (frames - width + 1, ...); row i covers frames i:i + width
+    """
+    frames = len(values)
+    blocks = -(-frames // width)
+    # The filler only ever meets windows that run past the last frame
+    padded = np.concatenate([values, np.repeat(values[-1:], blocks * width - frames, axis=0)])
+    shaped = padded.reshape(blocks, width, *values.shape[1:])
+    prefix = reduce.accumulate(shaped, axis=1).reshape(padded.shape)
+    suffix = reduce.accumulate(shaped[:, ::-1], axis=1)[:, ::-1].reshape(padded.shape)
+    count = frames - width + 1
+    return reduce(suffix[:count], prefix[width - 1:width - 1 + count])
+
+
+def lb_keogh(query: np.ndarray, candidate: np.ndarray, window: Optional[int] = None,
+             per_frame: bool = False):
+    """
+    LB_Keogh lower bound of the banded DTW cost between prepared sequences
+
+    Each query frame is compared with the per-coordinate min/max envelope of
+    the candidate frames it is allowed to match, which never exceeds the cost
+    of any actual match.
+
+    Args:
+        query: Prepared sequence of shape (n, joints, 3)
+        candidate: Prepared sequence of shape (m, joints, 3)
+        window: Band half-width in frames
+        per_frame: Return the bound contributed by each query frame
+
+    Returns:
+        Lower bound as a float, or an array of shape (n,) when per_frame is set
+    """
+    center, window = _band(len(query), len(candidate), window)
+    # Edge padding keeps windows clipped at either end correct, because the
+    # repeated edge frame is inside the clipped window anyway
+    padded = np.concatenate([
+        np.repeat(candidate[:1], window, axis=0),
+        candidate,
+        np.repeat(candidate[-1:], window, axis=0),
+    ])
+    upper = _running_extreme(padded, 2 * window + 1, np.maximum)[center]
+    lower = _running_extreme(padded, 2 * window + 1, np.minimum)[center]
+    outside = np.maximum(query - upper, 0.0)
+    outside += np.maximum(lower - query, 0.0)
+    bound = np.linalg.norm(outside, axis=-1) @ _NORMALIZED_WEIGHTS
+    return bound if per_frame else float(bound.sum())
+
+
+def dtw(query: np.ndarray, candidate: np.ndarray, window: Optional[int] = None,
+        abandon_above: float = np.inf, lower_bounds: Optional[np.ndarray] = None,
+        return_path: bool = False) -> Alignment:
+    """
+    Banded DTW between two prepared sequences
+
+    Rows are filled one query frame at a time; within a row the horizontal
+    recurrence is solved with a prefix minimum so there is no per-cell loop.
+
+    Args:
+        query: Prepared sequence of shape (n, joints, 3)
+        candidate: Prepared sequence of shape (m, joints, 3)
+        window: Band half-width in frames
+        abandon_above: Stop as soon as the cost is certain to exceed this value
+        lower_bounds: Optional per-frame LB_Keogh terms of the query, used to
+            tighten early abandoning with the bound of the rows still to come
+        return_path: Also return the warping path
+
+    Returns:
+        Alignment with an infinite cost if the computation was abandoned
+    """
+    n, m = len(query), len(candidate)
+    lo, hi = band_bounds(n, m, window)
+    if lower_bounds is not None:
+        remaining = np.concatenate([np.cumsum(lower_bounds[::-1])[::-1][1:], [0.0]])
+    else:
+        remaining = np.zeros(n)
+
+    rows: List[np.ndarray] = []
+    prev = None
+    for i in range(n):
+        start, stop = lo[i], hi[i]
+        costs = frame_costs(query[i], candidate[start:stop]).astype(np.float64)
+
+        # best[k] = min(D[i-1, j-1], D[i-1, j]) for j = start + k
+        best = np.full(stop - start, np.inf)
+        if prev is None:
+            best[0] = 0.0 if start == 0 else np.inf
+        else:
+            prev_start, prev_vals = prev
+            reach = np.full(stop - start + 1, np.inf)  # D[i-1, start-1 .. stop-1]
+            a = max(start - 1, prev_start)
+            b = min(stop, prev_start + len(prev_vals))
+            if a < b:
+                reach[a - start + 1:b - start + 1] = prev_vals[a - prev_start:b - prev_start]
+            best = np.minimum(reach[:-1], reach[1:])
+
+        # D[j] = c[j] + min(best[j], D[j-1])  ==  S[j] + min_{k<=j}(best[k] - S[k-1])
+        cumulative = np.cumsum(costs)
+        row = cumulative + np.minimum.accumulate(best - cumulative + costs)
+
+        if row.min() + remaining[i] > abandon_above:
+            return Alignment(np.inf)
+        if return_path:
+            rows.append(row)
+        prev = (start, row)
+
+    cost = float(prev[1][-1]) if hi[-1] == m else np.inf
+    if not return_path or not np.isfinite(cost):
+        return Alignment(cost)
+    return Alignment(cost, _backtrack(rows, lo))
+
+
+def _backtrack(rows: List[np.ndarray], lo: np.ndarray) -> np.ndarray:
+    """Recover the warping path from the stored band rows"""
+    def value(i: int, j: int) -> float:
+        k = j - lo[i]
+        return rows[i][k] if 0 <= k < len(rows[i]) else np.inf
+
+    i, j = len(rows) - 1, lo[-1] + len(rows[-1]) - 1
+    path = [(i, j)]
+    while i > 0 or j > 0:
+        steps = ((i - 1, j - 1), (i - 1, j), (i, j - 1))
+        costs = [value(a, b) if a >= 0 and b >= 0 else np.inf for a, b in steps]
+        i, j = steps[int(np.argmin(costs))]
+        path.append((i, j))
+    return np.array(path[::-1], dtype=np.intp)
+
+
+def align_sequences(query, candidate, window: Optional[int] = None) -> Alignment:
+    """
+    Align two landmark sequences and return the cost and warping path
+
+    Args:
+        query: Landmarks of shape (n, joints, 3)
+        candidate: Landmarks of shape (m, joints, 3)
+        window: Band half-width in frames
+
+    Returns:
+        Alignment with the path as (query_frame, candidate_frame) pairs
+    """
+    return dtw(prepare_sequence(query), prepare_sequence(candidate), window, return_path=True)
+
+
+def warp_to_reference(attempt, reference, window: Optional[int] = None) -> np.ndarray:
+    """
+    Resample an attempt onto the reference timeline along the DTW path
+
+    Args:
+        attempt: Landmarks of shape (n, joints, 3)
+        reference: Landmarks of shape (m, joints, 3)
+        window: Band half-width in frames
+
+    Returns:
+        Attempt landmarks of shape (m, joints, 3), one frame per reference frame
+    """
+    attempt = as_sequence(attempt)
+    path = align_sequences(attempt, reference, window).path
+    m = len(as_sequence(reference))
+    # Each reference frame takes the middle of the attempt frames matched to it
+    total = np.bincount(path[:, 1], weights=path[:, 0], minlength=m)
+    count = np.bincount(path[:, 1], minlength=m)
+    return attempt[np.rint(total / count).astype(np.intp)]
+
+
+def nearest_sequence(query, candidates: Sequence, window: Optional[int] = None) -> Tuple[int, float]:
+    """
+    Find the candidate with the lowest DTW cost to the query
+
+    Candidates are visited in order of their LB_Keogh bound; once the bound
+    exceeds the best cost found so far the remaining candidates are skipped,
+    and each DTW abandons as soon as it cannot beat the best.
+
+    Args:
+        query: Landmarks of shape (n, joints, 3)
+        candidates: Landmark sequences to search
+        window: Band half-width in frames
+
+    Returns:
+        (index, cost) of the best candidate
+    """
+    if not candidates:
+        raise ValueError("No candidates to search")
+    query = prepare_sequence(query)
+    prepared = [prepare_sequence(c) for c in candidates]
+    bounds = [lb_keogh(query, c, window, per_frame=True) for c in prepared]
+    order = np.argsort([b.sum() for b in bounds])
+
+    best_idx, best_cost = int(order[0]), np.inf
+    for idx in order:
+        if bounds[idx].sum() >= best_cost:
+            break
+        result = dtw(query, prepared[idx], window, abandon_above=best_cost,
+                     lower_bounds=bounds[idx])
+        if result.cost < best_cost:
+            best_idx, best_cost = int(idx), result.cost
+    return best_idx, best_cost
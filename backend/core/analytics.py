@@ -0,0 +1,473 @@
+"""
+Cohort analytics over learner events
+
+Copies the learning event history (`event_log.py`) into columnar files for
+instructor reports: practice accuracy per sign, drop-off per lesson and
+quiz item difficulty.
+
+The export is a directory of chunks of up to `CHUNK_ROWS` events, one
+NumPy `.npy` file per column, plus a `manifest.json` holding each chunk's
+row count and min/max zone map per column. String columns (user, event
+type, module, sign) are dictionary-encoded as integer codes, with the
+dictionaries in the manifest; missing values are -1 (NaN for floats).
+Each export batch is sorted by event type and time before it is cut into
+chunks, so filters on either skip most chunks.
+
+`ColumnarEvents.query` filters and groups over memory-mapped columns. A
+chunk whose zone map rules out the filter is never read; grouping uses
+`np.bincount` over dense group codes, so a query is a few vectorized
+passes over the columns it needs.
+
+Exports are incremental: `export_event_log` appends chunks for the events
+logged after the last exported one (by the log's sequence numbers, not by
+timestamp), so the history outlives the event log's retention.
+"""
+
+import json
+import os
+import shutil
+from functools import reduce
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .event_log import EVENT_TYPES, LESSON_STARTED, PRACTICE_SCORED, QUIZ_ANSWERED, EventLog, open_event_log
+
+DEFAULT_ANALYTICS_PATH = Path(
+    os.environ.get(
+        "POSE2POSE_ANALYTICS",
+        Path(__file__).resolve().parents[2] / "data" / "analytics",
+    )
+)
+CHUNK_ROWS = 1 << 16
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Column name -> dtype; string columns hold dictionary codes
+COLUMNS: Dict[str, Any] = {
+    "ts": np.float64,
+    "user": np.int32,
+    "type": np.int8,
+    "module": np.int32,
+    "lesson": np.int16,
+    "question": np.int16,
+    "sign": np.int32,
+    "correct": np.int8,
+    "score": np.float32,
+}
+DICTIONARY_COLUMNS = ("user", "type", "module", "sign")
+AGGREGATES = ("count", "sum", "mean", "min", "max", "nunique")
+# Largest number of group combinations grouped with a dense code space
+_DENSE_GROUPS = 1 << 24
+
+Condition = Union[Any, Tuple[Any, Any], List[Any]]
+
+
+def _null(column: str) -> Any:
+    return np.nan if np.issubdtype(COLUMNS[column], np.floating) else -1
+
+
+def _valid(column: str, values: np.ndarray) -> np.ndarray:
+    if np.issubdtype(values.dtype, np.floating):
+        return ~np.isnan(values)
+    return values != -1
+
+
+def write_columnar(events: Iterable[Mapping[str, Any]], directory: Union[str, Path],
+                   chunk_rows: int = CHUNK_ROWS) -> int:
+    """
+    Append events to a columnar export
+
+    Creates the export if needed. Chunk files are written before the
+    manifest that references them is replaced, so a failed export leaves
+    the previous one intact.
+
+    Args:
+        events: Event dicts as stored in the event log
+        directory: Export directory
+        chunk_rows: Events per chunk
+
+    Returns:
+        Number of events written
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = _read_manifest(directory)
+    dictionaries: Dict[str, List[str]] = manifest["dictionaries"]
+    codes = {column: {value: code for code, value in enumerate(values)}
+             for column, values in dictionaries.items()}
+
+    def encode(column: str, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        table = codes[column]
+        if value not in table:
+            table[value] = len(dictionaries[column])
+            dictionaries[column].append(value)
+        return table[value]
+
+    data: Dict[str, List[Any]] = {column: [] for column in COLUMNS}
+    last_seq = manifest.get("log_seq")
+    for event in events:
+        if event.get("seq") is not None:
+            last_seq = max(last_seq or 0, event["seq"])
+        for column in COLUMNS:
+            value = event.get(column)
+            if column in DICTIONARY_COLUMNS:
+                data[column].append(encode(column, None if value is None else str(value)))
+            elif column == "correct":
+                data[column].append(-1 if value is None else int(bool(value)))
+            else:
+                data[column].append(_null(column) if value is None else value)
+    rows = len(data["ts"])
+    if not rows:
+        return 0
+
+    columns = {column: np.asarray(values, dtype=COLUMNS[column]) for column, values in data.items()}
+    order = np.lexsort((columns["ts"], columns["type"]))
+    chunks = manifest["chunks"]
+    for start in range(0, rows, chunk_rows):
+        rows_here = order[start:start + chunk_rows]
+        name = f"chunk-{len(chunks):06d}"
+        (directory / name).mkdir(exist_ok=True)
+        zones = {}
+        for column, values in columns.items():
+            part = values[rows_here]
+            np.save(directory / name / f"{column}.npy", part)
+            present = part[_valid(column, part)]
+            zones[column] = [present.min().item(), present.max().item()] if len(present) else None
+        chunks.append({"name": name, "rows": len(rows_here), "zones": zones})
+
+    manifest["max_ts"] = max(manifest["max_ts"] or float("-inf"), float(columns["ts"].max()))
+    # Event log sequence number the export covers, where the next export resumes
+    manifest["log_seq"] = last_seq
+    tmp = directory / (MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps(manifest))
+    os.replace(tmp, directory / MANIFEST_NAME)
+    return rows
+
+
+def _read_manifest(directory: Path) -> Dict[str, Any]:
+    path = directory / MANIFEST_NAME
+    if path.exists():
+        manifest = json.loads(path.read_text())
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    return {
+        "version": MANIFEST_VERSION,
+        # Event types keep the event log's order so their codes are stable
+        "dictionaries": {column: list(EVENT_TYPES) if column == "type" else []
+                         for column in DICTIONARY_COLUMNS},
+        "chunks": [],
+        "max_ts": None,
+        "log_seq": None,
+    }
+
+
+def export_event_log(log: Optional[EventLog] = None, directory: Union[str, Path, None] = None) -> int:
+    """
+    Append the events logged since the last export
+
+    Resumes after the last exported event's sequence number, so events
+    sharing a timestamp, or logged by another process with an earlier
+    timestamp, are exported exactly once.
+
+    Returns:
+        Number of events exported
+    """
+    log = log or open_event_log()
+    directory = Path(directory or DEFAULT_ANALYTICS_PATH)
+    since = _read_manifest(directory).get("log_seq") if directory.exists() else None
+    return write_columnar(log.iter_events(after_seq=since), directory)
+
+
+def clear_export(directory: Union[str, Path, None] = None) -> None:
+    """Delete an export so the next one starts over"""
+    shutil.rmtree(Path(directory or DEFAULT_ANALYTICS_PATH), ignore_errors=True)
+
+
+class ColumnarEvents:
+    """
+    Read-only query engine over a columnar export
+
+    Usage:
+        events = ColumnarEvents(DEFAULT_ANALYTICS_PATH)
+        events.query(where={"type": "practice_scored"}, group_by=["sign"],
+                     agg={"accuracy": ("score", "mean")})
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        manifest = _read_manifest(self.directory)
+        self.dictionaries: Dict[str, List[str]] = manifest["dictionaries"]
+        self._codes = {column: {value: code for code, value in enumerate(values)}
+                       for column, values in self.dictionaries.items()}
+        self.chunks: List[Dict[str, Any]] = manifest["chunks"]
+        self._arrays: Dict[Tuple[int, str], np.ndarray] = {}
+        # Chunks read and skipped by the last query
+        self.last_scan = {"read": 0, "skipped": 0}
+
+    def __len__(self) -> int:
+        return sum(chunk["rows"] for chunk in self.chunks)
+
+    def _column(self, chunk: int, column: str) -> np.ndarray:
+        key = (chunk, column)
+        if key not in self._arrays:
+            path = self.directory / self.chunks[chunk]["name"] / f"{column}.npy"
+            self._arrays[key] = np.load(path, mmap_mode="r")
+        return self._arrays[key]
+
+    def _encode(self, column: str, value: Any) -> Any:
+        """Stored value of a filter value; None if a dictionary column never holds it"""
+        if value is None:
+            raise ValueError(f"Cannot filter {column} on missing values")
+        if column in DICTIONARY_COLUMNS:
+            return self._codes[column].get(value)
+        if column == "correct":
+            return int(bool(value))
+        return value
+
+    def _compile(self, where: Mapping[str, Condition]) -> Optional[List[Tuple[str, str, Any]]]:
+        """
+        Filters as (column, op, operand) on stored values
+
+        Returns None if no row can match (a value missing from a dictionary).
+        """
+        filters = []
+        for column, condition in where.items():
+            if column not in COLUMNS:
+                raise ValueError(f"Unknown column: {column}")
+            if isinstance(condition, tuple):
+                if column in DICTIONARY_COLUMNS:
+                    raise ValueError(f"Range filter on dictionary column: {column}")
+                filters.append((column, "range", condition))
+            elif isinstance(condition, (list, set, frozenset)):
+                values = [code for code in (self._encode(column, value) for value in condition)
+                          if code is not None]
+                if not values:
+                    return None
+                filters.append((column, "in", np.asarray(values)))
+            else:
+                code = self._encode(column, condition)
+                if code is None:
+                    return None
+                filters.append((column, "eq", code))
+        return filters
+
+    @staticmethod
+    def _may_match(zones: Mapping[str, Optional[List[float]]],
+                   filters: Sequence[Tuple[str, str, Any]]) -> bool:
+        """Whether a chunk's zone map allows a match"""
+        for column, op, operand in filters:
+            zone = zones.get(column)
+            if zone is None:
+                return False
+            low, high = zone
+            if op == "eq" and not low <= operand <= high:
+                return False
+            if op == "in" and not ((operand >= low) & (operand <= high)).any():
+                return False
+            if op == "range" and ((operand[0] is not None and operand[0] > high)
+                                  or (operand[1] is not None and operand[1] < low)):
+                return False
+        return True
+
+    @staticmethod
+    def _mask(values: np.ndarray, op: str, operand: Any) -> np.ndarray:
+        if op == "eq":
+            return values == operand
+        if op == "in":
+            return np.isin(values, operand)
+        low, high = operand
+        mask = np.ones(len(values), dtype=bool) if low is None else values >= low
+        if high is not None:
+            mask &= values <= high
+        return mask
+
+    def query(self, where: Optional[Mapping[str, Condition]] = None,
+              group_by: Sequence[str] = (),
+              agg: Optional[Mapping[str, Tuple[str, str]]] = None) -> List[Dict[str, Any]]:
+        """
+        Filter, group and aggregate events
+
+        Args:
+            where: Column -> value (equality), (low, high) inclusive range
+                with None for an open end, or list of values. Rows with a
+                missing value in a filtered column never match.
+            group_by: Integer or dictionary columns to group by
+            agg: Output name -> (column, function), function one of
+                AGGREGATES; ("*", "count") counts rows. Nulls are ignored.
+
+        Returns:
+            One dict per group, in group order, with the group values
+            (strings for dictionary columns, None for missing) and aggregates
+        """
+        agg = dict(agg or {"rows": ("*", "count")})
+        for column, function in agg.values():
+            if function not in AGGREGATES:
+                raise ValueError(f"Unknown aggregate: {function}")
+            if column not in COLUMNS and column != "*":
+                raise ValueError(f"Unknown column: {column}")
+            if function == "nunique" and np.issubdtype(COLUMNS.get(column, np.int64), np.floating):
+                raise ValueError(f"Cannot count distinct values of column: {column}")
+        for column in group_by:
+            if column not in COLUMNS or np.issubdtype(COLUMNS[column], np.floating):
+                raise ValueError(f"Cannot group by column: {column}")
+
+        filters = self._compile(where or {})
+        self.last_scan = {"read": 0, "skipped": 0}
+        if filters is None:
+            self.last_scan["skipped"] = len(self.chunks)
+            return []
+
+        needed = list(dict.fromkeys([*group_by, *(c for c, _ in agg.values() if c != "*")]))
+        parts: Dict[str, List[np.ndarray]] = {column: [] for column in needed}
+        rows = 0
+        for index, chunk in enumerate(self.chunks):
+            if not self._may_match(chunk["zones"], filters):
+                self.last_scan["skipped"] += 1
+                continue
+            self.last_scan["read"] += 1
+            mask = None
+            for column, op, operand in filters:
+                selected = self._mask(self._column(index, column), op, operand)
+                mask = selected if mask is None else mask & selected
+            rows += chunk["rows"] if mask is None else int(np.count_nonzero(mask))
+            for column in needed:
+                values = self._column(index, column)
+                parts[column].append(values[mask] if mask is not None else np.asarray(values))
+        if not rows:
+            return []
+        columns = {column: np.concatenate(arrays) for column, arrays in parts.items()}
+
+        keys, groups = self._group_codes(columns, group_by, rows)
+        present = np.bincount(keys, minlength=len(groups[0]) if group_by else 1) > 0
+        results: Dict[str, np.ndarray] = {}
+        for name, (column, function) in agg.items():
+            results[name] = self._aggregate(keys, columns.get(column), column, function, len(present))
+
+        output = []
+        for group in np.flatnonzero(present):
+            row: Dict[str, Any] = {}
+            for column, values in zip(group_by, groups):
+                value = values[group].item()
+                if column in DICTIONARY_COLUMNS:
+                    value = self.dictionaries[column][value] if value >= 0 else None
+                elif value == -1:
+                    value = None
+                row[column] = value
+            for name, values in results.items():
+                value = values[group].item()
+                row[name] = None if isinstance(value, float) and np.isnan(value) else value
+            output.append(row)
+        return output
+
+    @staticmethod
+    def _group_codes(columns: Mapping[str, np.ndarray], group_by: Sequence[str],
+                     rows: int) -> Tuple[np.ndarray, List[np.ndarray]]:
+        """
+        One integer code per row for its group, and the group values per code
+
+        Returns:
+            (row codes, per group-by column the value of each code)
+        """
+        if not group_by:
+            return np.zeros(rows, dtype=np.int64), []
+        offsets, radices = [], []
+        for column in group_by:
+            values = columns[column]
+            offsets.append(int(values.min()))
+            radices.append(int(values.max()) - offsets[-1] + 1)
+        if reduce(lambda a, b: a * b, radices, 1) <= _DENSE_GROUPS:
+            keys = np.zeros(rows, dtype=np.int64)
+            for column, offset, radix in zip(group_by, offsets, radices):
+                keys = keys * radix + (columns[column].astype(np.int64) - offset)
+            total = reduce(lambda a, b: a * b, radices, 1)
+            groups, remaining = [], np.arange(total, dtype=np.int64)
+            for offset, radix in reversed(list(zip(offsets, radices))):
+                groups.append(remaining % radix + offset)
+                remaining //= radix
+            return keys, groups[::-1]
+        # Too many combinations for a dense code space: number the groups present
+        stacked = np.stack([columns[column] for column in group_by], axis=1)
+        unique, keys = np.unique(stacked, axis=0, return_inverse=True)
+        return keys.reshape(-1), [unique[:, position] for position in range(len(group_by))]
+
+    @staticmethod
+    def _aggregate(keys: np.ndarray, values: Optional[np.ndarray], column: str, function: str,
+                   groups: int) -> np.ndarray:
+        if values is None:
+            return np.bincount(keys, minlength=groups)
+        valid = _valid(column, values)
+        keys, values = keys[valid], values[valid]
+        if function == "count":
+            return np.bincount(keys, minlength=groups)
+        if function == "nunique":
+            offset = int(values.min()) if len(values) else 0
+            radix = int(values.max()) - offset + 1 if len(values) else 1
+            pairs = keys * np.int64(radix) + (values.astype(np.int64) - offset)
+            if groups * radix <= _DENSE_GROUPS:
+                # Mark each (group, value) pair seen; linear instead of a sort
+                seen = np.zeros(groups * radix, dtype=bool)
+                seen[pairs] = True
+                pairs = np.flatnonzero(seen)
+            else:
+                pairs = np.unique(pairs)
+            return np.bincount(pairs // radix, minlength=groups)
+        totals = np.bincount(keys, weights=values, minlength=groups)
+        if function == "sum":
+            return totals
+        if function == "mean":
+            counts = np.bincount(keys, minlength=groups)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return np.where(counts > 0, totals / counts, np.nan)
+        out = np.full(groups, np.inf if function == "min" else -np.inf)
+        (np.minimum if function == "min" else np.maximum).at(out, keys, values)
+        return np.where(np.isfinite(out), out, np.nan)
+
+    # Instructor reports
+
+    def practice_accuracy_by_sign(self) -> List[Dict[str, Any]]:
+        """Practice attempts, learners and mean score per sign"""
+        return self.query(
+            where={"type": PRACTICE_SCORED},
+            group_by=["sign"],
+            agg={"attempts": ("score", "count"), "learners": ("user", "nunique"),
+                 "accuracy": ("score", "mean")},
+        )
+
+    def lesson_dropoff(self, module_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Learners starting each lesson, and the share lost since the previous one
+
+        Returns:
+            Rows with module, lesson, learners and dropoff (0-1, None for a
+            module's first lesson)
+        """
+        where: Dict[str, Condition] = {"type": LESSON_STARTED}
+        if module_id is not None:
+            where["module"] = module_id
+        rows = self.query(where=where, group_by=["module", "lesson"],
+                          agg={"learners": ("user", "nunique")})
+        previous: Dict[Optional[str], int] = {}
+        for row in rows:
+            before = previous.get(row["module"])
+            row["dropoff"] = 1 - row["learners"] / before if before else None
+            previous[row["module"]] = row["learners"]
+        return rows
+
+    def quiz_item_difficulty(self) -> List[Dict[str, Any]]:
+        """
+        Answers and share answered correctly per quiz question
+
+        Difficulty is the share answered incorrectly (1 - p-value).
+        """
+        rows = self.query(
+            where={"type": QUIZ_ANSWERED},
+            group_by=["module", "lesson", "question"],
+            agg={"answers": ("correct", "count"), "p_correct": ("correct", "mean")},
+        )
+        for row in rows:
+            row["difficulty"] = None if row["p_correct"] is None else 1 - row["p_correct"]
+        return rows
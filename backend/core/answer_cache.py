@@ -0,0 +1,256 @@
+"""
+Answer cache for the chat assistant
+
+Learners ask the same questions again and again. Answers are cached under
+the normalized question plus a fingerprint of the retrieved context, in two
+tiers:
+
+- exact: the normalized question matches a cached one
+- near-duplicate: the question embedding is within `near_threshold` cosine
+  similarity of a cached question whose best retrieved document is the
+  same, so "sign hello" never matches "sign help"
+
+Entries expire after a TTL and the least recently used ones are evicted to
+stay within a byte budget. Each entry remembers a digest of every document
+it cites; `sync` drops entries whose documents have changed since.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .embedding import HashingEmbedder
+from .retrieval import Document
+from .text import tokenize
+
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+DEFAULT_TTL = 24 * 60 * 60.0
+DEFAULT_NEAR_THRESHOLD = 0.75
+
+# Rough per-entry bookkeeping cost counted against the byte budget
+_ENTRY_OVERHEAD = 256
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, drop punctuation and stop words, stem"""
+    return " ".join(tokenize(question))
+
+
+def document_digest(document: Document) -> str:
+    """Digest of a document's content"""
+    return hashlib.blake2b(f"{document.title}\0{document.text}".encode(),
+                           digest_size=8).hexdigest()
+
+
+def context_fingerprint(documents: Sequence[Document]) -> str:
+    """Identifies a retrieved context by its documents and their content"""
+    digest = hashlib.blake2b(digest_size=16)
+    for document in documents:
+        digest.update(f"{document.doc_id}\0{document_digest(document)}\0".encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class CachedAnswer:
+    """A cached answer and what it was generated from"""
+    question: str
+    context: str
+    anchor: str
+    answer: str
+    citations: Dict[str, str]
+    vector: np.ndarray
+    created: float
+    generation_seconds: float
+    size: int
+
+
+class AnswerCache:
+    """
+    Two-tier LRU/TTL answer cache with a byte budget
+
+    Safe to share between threads (e.g. Streamlit sessions).
+
+    Usage:
+        cache = AnswerCache()
+        hit = cache.get(question, documents)
+        if hit is None:
+            answer = generate(...)
+            cache.put(question, documents, answer, generation_seconds)
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, ttl: float = DEFAULT_TTL,
+                 near_threshold: float = DEFAULT_NEAR_THRESHOLD,
+                 embedder: Optional[HashingEmbedder] = None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.near_threshold = near_threshold
+        self.embedder = embedder or HashingEmbedder()
+        self._entries: "OrderedDict[Tuple[str, str], CachedAnswer]" = OrderedDict()
+        self._by_anchor: Dict[str, Set[Tuple[str, str]]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.seconds_saved = 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """Bytes counted against the budget"""
+        return self._bytes
+
+    def get(self, question: str, documents: Sequence[Document]) -> Optional[Tuple[CachedAnswer, str]]:
+        """
+        Look up an answer
+
+        Args:
+            question: The user's question
+            documents: Context retrieved for it
+
+        Returns:
+            (entry, tier) with tier "exact" or "near", or None on a miss
+        """
+        normalized = normalize_question(question)
+        context = context_fingerprint(documents)
+        now = time.monotonic()
+        with self._lock:
+            key = (normalized, context)
+            entry = self._entries.get(key)
+            tier = "exact"
+            if entry is None or self._expired(entry, now):
+                anchor = context_fingerprint(documents[:1])
+                entry, tier = self._nearest(normalized, anchor, now), "near"
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((entry.question, entry.context))
+            if tier == "exact":
+                self.exact_hits += 1
+            else:
+                self.near_hits += 1
+            self.seconds_saved += entry.generation_seconds
+            return entry, tier
+
+    def put(self, question: str, documents: Sequence[Document], answer: str,
+            generation_seconds: float = 0.0) -> None:
+        """Cache a complete answer generated from the given context"""
+        normalized = normalize_question(question)
+        context = context_fingerprint(documents)
+        vector = self.embedder.embed_one(normalized)
+        citations = {document.doc_id: document_digest(document) for document in documents}
+        size = (len(answer.encode()) + len(normalized.encode()) + vector.nbytes
+                + 32 * len(citations) + _ENTRY_OVERHEAD)
+        if size > self.max_bytes:
+            return
+        anchor = context_fingerprint(documents[:1])
+        entry = CachedAnswer(normalized, context, anchor, answer, citations, vector,
+                             time.monotonic(), generation_seconds, size)
+        with self._lock:
+            self._remove((normalized, context))
+            self._entries[(normalized, context)] = entry
+            self._by_anchor.setdefault(anchor, set()).add((normalized, context))
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, doc_ids: Iterable[str]) -> int:
+        """
+        Drop every answer that cites one of the documents
+
+        Returns:
+            Number of entries removed
+        """
+        doc_ids = set(doc_ids)
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if doc_ids & entry.citations.keys()]
+            for key in stale:
+                self._remove(key)
+            self.invalidations += len(stale)
+        return len(stale)
+
+    def sync(self, documents: Iterable[Document]) -> int:
+        """
+        Drop answers citing documents that changed or no longer exist
+
+        Args:
+            documents: The current documents, e.g. `RetrievalIndex.documents`
+
+        Returns:
+            Number of entries removed
+        """
+        current = {document.doc_id: document_digest(document) for document in documents}
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items()
+                if any(current.get(doc_id) != digest for doc_id, digest in entry.citations.items())
+            ]
+            for key in stale:
+                self._remove(key)
+            self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Remove every entry; counters are kept"""
+        with self._lock:
+            self._entries.clear()
+            self._by_anchor.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Hit rate, latency saved and occupancy"""
+        lookups = self.exact_hits + self.near_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "exact_hits": self.exact_hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "hit_rate": (self.exact_hits + self.near_hits) / lookups if lookups else 0.0,
+            "seconds_saved": self.seconds_saved,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _expired(self, entry: CachedAnswer, now: float) -> bool:
+        if now - entry.created <= self.ttl:
+            return False
+        self._remove((entry.question, entry.context))
+        return True
+
+    def _nearest(self, normalized: str, anchor: str, now: float) -> Optional[CachedAnswer]:
+        """Most similar cached question with the same best document"""
+        keys = self._by_anchor.get(anchor)
+        if not keys:
+            return None
+        candidates: List[CachedAnswer] = [
+            entry for entry in (self._entries[key] for key in list(keys))
+            if not self._expired(entry, now)
+        ]
+        if not candidates:
+            return None
+        query = self.embedder.embed_one(normalized)
+        similarity = np.stack([entry.vector for entry in candidates]) @ query
+        best = int(similarity.argmax())
+        return candidates[best] if similarity[best] >= self.near_threshold else None
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        keys = self._by_anchor.get(entry.anchor)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_anchor[entry.anchor]
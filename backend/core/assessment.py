@@ -0,0 +1,198 @@
+"""
+Placement assessment scoring
+
+Grades an answer set: multiple-choice accuracy (70%) and keyword coverage
+of the short answers (30%), mapped to a proficiency level with a
+recommended learning path. `calculate_assessment_score` grades the fixed
+placement questions, as older exported answer sets use them;
+`adaptive_assessment_score` grades the Assessment page's adaptive test (see
+`adaptive.py`), and `adaptive_transcript_score` grades the same test from
+its answers alone, as the bulk grading CLI (`backend/grading.py`) does.
+
+The question and learning path tables are frozen when the module is
+imported. Scores are pure functions of the answers, so they are memoized
+on the answers to the known questions; regrading an answer set only adds a
+fresh timestamp.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Hashable, Mapping, Sequence, Tuple
+
+from ..models.curriculum import LEARNING_PATHS, QUIZ_QUESTIONS
+from .adaptive import AdaptiveSession, placement_item_bank
+from .keywords import KeywordMatcher
+
+# Keywords that show understanding in short answers, compiled once
+SHORT_ANSWER_MATCHER = KeywordMatcher([
+    "communication", "accessibility", "deaf", "inclusive", "community",
+    "hearing", "barrier", "culture", "language", "understand"
+])
+
+# Section weights of the final score
+MC_WEIGHT = 0.7
+SA_WEIGHT = 0.3
+# (minimum final score, level, CSS class), highest first
+LEVELS = (
+    (75, "Advanced", "level-advanced"),
+    (50, "Intermediate", "level-intermediate"),
+    (0, "Beginner", "level-beginner"),
+)
+MIN_WORDS = 10
+# "mode" of an answer set that is an adaptive test transcript
+ADAPTIVE_MODE = "adaptive"
+# Answer sets whose scores are kept
+SCORE_CACHE_SIZE = 4096
+
+# (question id, correct option) per multiple-choice question
+_MC_KEY: Tuple[Tuple[str, int], ...] = tuple(
+    (q["id"], q["correct"]) for q in QUIZ_QUESTIONS["multiple_choice"]
+)
+_SA_IDS: Tuple[str, ...] = tuple(q["id"] for q in QUIZ_QUESTIONS["short_answer"])
+
+_LEARNING_PATHS: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    level: MappingProxyType({
+        key: tuple(value) if isinstance(value, list) else value for key, value in path.items()
+    })
+    for level, path in LEARNING_PATHS.items()
+})
+
+
+def _short_answer_score(answer: Any) -> int:
+    """Length and keyword score of one short answer, out of 100"""
+    # Submissions can carry null or non-text answers (e.g. JSON from grade_line)
+    answer = str(answer or "")
+    score = 0
+    if len(answer.split()) >= MIN_WORDS:
+        score += 50
+    # Count distinct keywords, matched as whole words in any inflection
+    score += min(len(SHORT_ANSWER_MATCHER.matched_keywords(answer)) * 10, 50)
+    return min(score, 100)
+
+
+def _short_answer_percentage(sa_answers: Sequence[str]) -> float:
+    sa_scores = [_short_answer_score(answer) for answer in sa_answers]
+    return sum(sa_scores) / len(sa_scores) if sa_scores else 0
+
+
+def _final_and_level(mc_percentage: float, sa_percentage: float) -> Tuple[float, str, str]:
+    final_score = (mc_percentage * MC_WEIGHT) + (sa_percentage * SA_WEIGHT)
+    _, level, level_class = next(entry for entry in LEVELS if final_score >= entry[0])
+    return final_score, level, level_class
+
+
+def _score(mc_answers: Tuple[Hashable, ...], sa_answers: Tuple[str, ...]) -> Tuple:
+    """(final, mc, sa, mc_correct, level, level_class) for answers in question order"""
+    mc_correct = sum(answer == correct for answer, (_, correct) in zip(mc_answers, _MC_KEY))
+    mc_percentage = (mc_correct / len(_MC_KEY)) * 100
+    sa_percentage = _short_answer_percentage(sa_answers)
+    final_score, level, level_class = _final_and_level(mc_percentage, sa_percentage)
+    return final_score, mc_percentage, sa_percentage, mc_correct, level, level_class
+
+
+_cached_score = lru_cache(maxsize=SCORE_CACHE_SIZE)(_score)
+
+
+def calculate_assessment_score(quiz_answers: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Calculate quiz score and determine proficiency level
+
+    Args:
+        quiz_answers: Question id to answer: the chosen option index for
+            multiple-choice questions, free text for short answers
+
+    Returns:
+        Dict with final_score, mc_score, sa_score, mc_correct, mc_total,
+        level, level_class and timestamp
+    """
+    mc_answers = tuple(quiz_answers.get(question_id) for question_id, _ in _MC_KEY)
+    sa_answers = tuple(quiz_answers.get(question_id, "") for question_id in _SA_IDS)
+    try:
+        scored = _cached_score(mc_answers, sa_answers)
+    except TypeError:
+        # Unhashable answers (e.g. lists from a JSON export) are scored uncached
+        scored = _score(mc_answers, sa_answers)
+    final_score, mc_percentage, sa_percentage, mc_correct, level, level_class = scored
+
+    return {
+        "final_score": final_score,
+        "mc_score": mc_percentage,
+        "sa_score": sa_percentage,
+        "mc_correct": mc_correct,
+        "mc_total": len(_MC_KEY),
+        "level": level,
+        "level_class": level_class,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+def adaptive_assessment_score(session: AdaptiveSession,
+                              quiz_answers: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Score an adaptive test plus the short answers
+
+    The multiple-choice part is the score the learner's estimated ability
+    predicts on the whole item bank, so it is comparable however many and
+    whichever questions were asked.
+
+    Args:
+        session: Finished adaptive session
+        quiz_answers: Answers including the short-answer questions
+
+    Returns:
+        The fields of `calculate_assessment_score`, with mc_correct and
+        mc_total counting the questions asked, plus ability and ability_se
+    """
+    mc_percentage = session.bank.expected_score(session.theta) * 100
+    sa_percentage = _short_answer_percentage(
+        [quiz_answers.get(question_id, "") for question_id in _SA_IDS]
+    )
+    final_score, level, level_class = _final_and_level(mc_percentage, sa_percentage)
+    return {
+        "final_score": final_score,
+        "mc_score": mc_percentage,
+        "sa_score": sa_percentage,
+        "mc_correct": session.correct,
+        "mc_total": len(session.administered),
+        "level": level,
+        "level_class": level_class,
+        "ability": session.theta,
+        "ability_se": session.se,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+def adaptive_transcript_score(quiz_answers: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Score an adaptive test from its answers, as the Assessment page would
+
+    Args:
+        quiz_answers: Answers to the items the learner was asked plus the
+            short answers, e.g. the "answers" of a downloaded report
+
+    Returns:
+        The fields of `adaptive_assessment_score`
+    """
+    session = AdaptiveSession.from_answers(placement_item_bank(), quiz_answers)
+    return adaptive_assessment_score(session, quiz_answers)
+
+
+def generate_ai_recommendations(result: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Learning path for an assessment result
+
+    Args:
+        result: Output of `calculate_assessment_score`
+
+    Returns:
+        Dict with modules, focus_areas, estimated_time and next_steps;
+        the Beginner path for unknown levels
+    """
+    path = _LEARNING_PATHS.get(result["level"], _LEARNING_PATHS["Beginner"])
+    return dict(path)
+
+
+def clear_score_cache() -> None:
+    """Forget all memoized scores"""
+    _cached_score.cache_clear()
@@ -0,0 +1,138 @@
+"""
+Micro-batching queue for practice submissions
+
+Submissions that arrive within a few milliseconds of each other are grouped
+and scored with a single `score_batch` call, so concurrent Submit clicks
+share the per-call Python overhead instead of paying it once each.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .normalization import prepare_reference
+from .scoring import DEFAULT_TOLERANCE, pad_sequences, score_batch
+
+DEFAULT_WINDOW_MS = 5.0
+DEFAULT_MAX_BATCH = 64
+
+
+class ScoringBatcher:
+    """
+    Background scorer that batches submissions against a fixed reference set
+
+    Usage:
+        batcher = ScoringBatcher({"Hello": hello_landmarks, ...})
+        score = batcher.score(attempt, "Hello")
+    """
+
+    def __init__(self, references: Mapping[str, np.ndarray],
+                 window_ms: float = DEFAULT_WINDOW_MS,
+                 max_batch: int = DEFAULT_MAX_BATCH,
+                 tolerance: float = DEFAULT_TOLERANCE):
+        if not references:
+            raise ValueError("ScoringBatcher needs at least one reference")
+        self._names: Dict[str, int] = {name: idx for idx, name in enumerate(references)}
+        self._references = pad_sequences(
+            [prepare_reference(seq, key=name) for name, seq in references.items()], normalized=True
+        )
+        self._window = window_ms / 1000.0
+        self._max_batch = max_batch
+        self._tolerance = tolerance
+        self._queue: "queue.SimpleQueue[Tuple[np.ndarray, int, Future]]" = queue.SimpleQueue()
+        self._closed = False
+        # Orders submissions before the stop sentinel that close() queues
+        self._lock = threading.Lock()
+        self.batches_scored = 0
+        self.attempts_scored = 0
+        self._thread = threading.Thread(target=self._run, name="scoring-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, attempt: np.ndarray, reference: str) -> Future:
+        """
+        Queue an attempt for scoring
+
+        Args:
+            attempt: Landmarks of shape (frames, joints, 3)
+            reference: Name of the reference sign
+
+        Returns:
+            Future resolving to the score between 0.0 and 1.0
+        """
+        if reference not in self._names:
+            raise KeyError(f"Unknown reference sign: {reference}")
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ScoringBatcher is closed")
+            self._queue.put((attempt, self._names[reference], future))
+        return future
+
+    def score(self, attempt: np.ndarray, reference: str, timeout: Optional[float] = None) -> float:
+        """Submit an attempt and wait for its score"""
+        return self.submit(attempt, reference).result(timeout)
+
+    def close(self) -> None:
+        """Score anything still queued and stop the background thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self) -> "ScoringBatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _collect(self) -> Tuple[List, bool]:
+        """Block for one submission, then gather more until the window closes"""
+        item = self._queue.get()
+        if item is None:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self._window
+        while len(batch) < self._max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch, stop = self._collect()
+            if batch:
+                self._score(batch)
+
+    def _score(self, batch: List) -> None:
+        attempts, targets, futures = zip(*batch)
+        try:
+            scores = score_batch(attempts, self._references, targets, self._tolerance)
+        except Exception:
+            # Fall back to one call per attempt so a bad submission only
+            # fails its own future
+            for attempt, target, future in batch:
+                try:
+                    score = score_batch([attempt], self._references, [target], self._tolerance)[0]
+                    future.set_result(float(score))
+                except Exception as exc:
+                    future.set_exception(exc)
+        else:
+            for future, score in zip(futures, scores):
+                future.set_result(float(score))
+        self.batches_scored += 1
+        self.attempts_scored += len(batch)
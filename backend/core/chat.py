@@ -0,0 +1,273 @@
+"""
+Chat assistant response streaming
+
+Answers are produced as an async stream of tokens so the page can render
+the first words while the rest is still being generated. Each stream
+records its time to first token and throughput, and can be cancelled when
+the user navigates away.
+
+The model is pluggable through `ChatModel`. `LocalChatModel` is a
+deterministic stand-in that writes its answer from the retrieved lesson
+content without any network access. With an `AnswerCache`, repeated
+questions replay a cached answer instead of running the model.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional, Sequence
+
+from .answer_cache import AnswerCache
+from .retrieval import Document, RetrievalIndex, load_retrieval_index
+
+# Retrieved documents passed to the model
+DEFAULT_CONTEXT_SIZE = 3
+# Finished streams kept for `chat_metrics`
+METRICS_HISTORY = 200
+
+_TOKEN_RE = re.compile(r"\S+\s*|\s+")
+
+
+@dataclass
+class StreamMetrics:
+    """Timing of one streamed answer; times are `time.perf_counter()` values"""
+    started: float = field(default_factory=time.perf_counter)
+    first_token: Optional[float] = None
+    finished: Optional[float] = None
+    tokens: int = 0
+    cancelled: bool = False
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        """Seconds until the first token arrived"""
+        return None if self.first_token is None else self.first_token - self.started
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Generation rate after the first token"""
+        if self.first_token is None or self.finished is None or self.tokens < 2:
+            return None
+        elapsed = self.finished - self.first_token
+        return (self.tokens - 1) / elapsed if elapsed > 0 else None
+
+
+class ChatModel(ABC):
+    """Generates an answer token by token from a question and its context"""
+
+    name = "model"
+
+    @abstractmethod
+    def generate(self, question: str, documents: Sequence[Document]) -> AsyncIterator[str]:
+        """
+        Stream the answer
+
+        Args:
+            question: The user's question
+            documents: Retrieved context, most relevant first
+
+        Yields:
+            Text fragments that concatenate to the answer
+        """
+
+
+class LocalChatModel(ChatModel):
+    """
+    Deterministic answer writer for tests and offline use
+
+    Quotes the retrieved documents, one word per token. `token_delay`
+    simulates generation time.
+    """
+
+    name = "local"
+
+    def __init__(self, token_delay: float = 0.0):
+        self.token_delay = token_delay
+
+    @staticmethod
+    def compose(question: str, documents: Sequence[Document]) -> str:
+        """The full answer the model streams for a question"""
+        if not documents:
+            return ("I couldn't find that in the lessons yet. Try asking about hand shapes, "
+                    "greetings, fingerspelling or one of the learning modules.")
+        lines = ["Here is what the lessons say:", ""]
+        lines += [f"- **{document.title}** ({document.source}): {document.text}"
+                  for document in documents]
+        return "\n".join(lines)
+
+    async def generate(self, question: str, documents: Sequence[Document]) -> AsyncIterator[str]:
+        for token in _TOKEN_RE.findall(self.compose(question, documents)):
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            yield token
+
+
+class _ReplayModel(ChatModel):
+    """Streams a cached answer"""
+
+    name = "cache"
+
+    def __init__(self, answer: str):
+        self.answer = answer
+
+    async def generate(self, question: str, documents: Sequence[Document]) -> AsyncIterator[str]:
+        for token in _TOKEN_RE.findall(self.answer):
+            yield token
+
+
+_history: Deque[StreamMetrics] = deque(maxlen=METRICS_HISTORY)
+_history_lock = threading.Lock()
+
+
+class ChatStream:
+    """
+    One answer being streamed
+
+    `cached` is the cache tier ("exact" or "near") when the answer is
+    replayed from an `AnswerCache`, otherwise None. `on_complete` is called
+    once the answer has streamed to the end. Iterate with `async for`, or
+    use `iter_sync` from synchronous code such as `st.write_stream`. Call
+    `cancel` (or `aclose`) to stop generation.
+    """
+
+    def __init__(self, model: ChatModel, question: str, documents: Sequence[Document],
+                 on_complete: Optional[Callable[["ChatStream"], None]] = None,
+                 cached: Optional[str] = None):
+        self.question = question
+        self.documents = list(documents)
+        self.cached = cached
+        self.metrics = StreamMetrics()
+        self._on_complete = on_complete
+        self._parts: List[str] = []
+        self._tokens = model.generate(question, self.documents)
+        self._done = False
+
+    @property
+    def text(self) -> str:
+        """The answer streamed so far"""
+        return "".join(self._parts)
+
+    @property
+    def done(self) -> bool:
+        """Whether the stream finished or was cancelled"""
+        return self._done
+
+    def __aiter__(self) -> "ChatStream":
+        return self
+
+    async def __anext__(self) -> str:
+        if self._done:
+            raise StopAsyncIteration
+        try:
+            token = await self._tokens.__anext__()
+        except StopAsyncIteration:
+            self._finish(cancelled=False)
+            raise
+        except BaseException:
+            self._finish(cancelled=True)
+            raise
+        if self.metrics.first_token is None:
+            self.metrics.first_token = time.perf_counter()
+        self.metrics.tokens += 1
+        self._parts.append(token)
+        return token
+
+    async def aclose(self) -> None:
+        """Stop generation; the metrics record the stream as cancelled"""
+        if not self._done:
+            self._finish(cancelled=True)
+            await self._tokens.aclose()
+
+    def cancel(self) -> None:
+        """Synchronous `aclose` for code that is not running an event loop"""
+        asyncio.run(self.aclose())
+
+    def _finish(self, cancelled: bool) -> None:
+        self._done = True
+        self.metrics.finished = time.perf_counter()
+        self.metrics.cancelled = cancelled
+        with _history_lock:
+            _history.append(self.metrics)
+        if not cancelled and self._on_complete is not None:
+            self._on_complete(self)
+
+    def iter_sync(self) -> Iterator[str]:
+        """
+        Drive the stream from synchronous code
+
+        Closing the returned generator, which Streamlit does when the script
+        is stopped or rerun, cancels generation.
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(self.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            loop.run_until_complete(self.aclose())
+            loop.close()
+
+
+class ChatAssistant:
+    """
+    Retrieval-augmented chat over the curriculum
+
+    Usage:
+        assistant = ChatAssistant()
+        stream = assistant.ask("Are facial expressions optional?")
+        st.write_stream(stream.iter_sync())
+    """
+
+    def __init__(self, index: Optional[RetrievalIndex] = None,
+                 model: Optional[ChatModel] = None,
+                 context_size: int = DEFAULT_CONTEXT_SIZE,
+                 cache: Optional[AnswerCache] = None):
+        self.index = index or load_retrieval_index()
+        self.model = model or LocalChatModel()
+        self.context_size = context_size
+        self.cache = cache
+        if cache is not None:
+            cache.sync(self.index.documents)
+
+    def ask(self, question: str) -> ChatStream:
+        """Retrieve context for a question and start streaming the answer"""
+        results = self.index.search(question, k=self.context_size)
+        documents = [result.document for result in results]
+        if self.cache is None:
+            return ChatStream(self.model, question, documents)
+
+        hit = self.cache.get(question, documents)
+        if hit is not None:
+            entry, tier = hit
+            return ChatStream(_ReplayModel(entry.answer), question, documents, cached=tier)
+
+        def store(stream: ChatStream) -> None:
+            elapsed = stream.metrics.finished - stream.metrics.started
+            self.cache.put(question, documents, stream.text, elapsed)
+
+        return ChatStream(self.model, question, documents, on_complete=store)
+
+
+def chat_metrics() -> Dict[str, float]:
+    """
+    Aggregate metrics over recent streams
+
+    Returns:
+        Dict with the stream count, cancelled count, median time to first
+        token in milliseconds and median tokens per second
+    """
+    with _history_lock:
+        history = list(_history)
+    ttft = sorted(m.time_to_first_token for m in history if m.time_to_first_token is not None)
+    rates = sorted(m.tokens_per_second for m in history if m.tokens_per_second is not None)
+    return {
+        "streams": len(history),
+        "cancelled": sum(m.cancelled for m in history),
+        "ttft_ms_p50": ttft[len(ttft) // 2] * 1000 if ttft else 0.0,
+        "tokens_per_second_p50": rates[len(rates) // 2] if rates else 0.0,
+    }
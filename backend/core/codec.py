@@ -0,0 +1,182 @@
+"""
+Compact binary codec for landmark sequences
+
+Used for recorded attempts, reference demos and exports. Coordinates are
+quantized to int16 in steps of 1/2048 of the signer's shoulder width
+(sub-millimetre at webcam scale), each frame is stored as the difference
+from the previous one, and the result can be compressed with zlib or lzma.
+Neighbouring frames differ very little, so the deltas compress extremely
+well.
+
+A coordinate too far from the sequence's mean to fit in int16 at that
+step (e.g. a signer seen side-on has a tiny shoulder width) makes the
+encoder use a coarser step instead of clipping; `max_error` reads the step
+from the blob, so it stays a true bound.
+
+Blob layout: HEADER_DTYPE header followed by an int16 payload of shape
+(frames, joints, 3). Undetected joints are stored as -32768.
+"""
+
+import lzma
+import zlib
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .landmarks import LEFT_SHOULDER, RIGHT_SHOULDER
+
+MAGIC = b"P2PL"
+VERSION = 1
+
+# Quantization steps per shoulder width
+STEPS_PER_UNIT = 2048
+MISSING = np.iinfo(np.int16).min
+# Largest quantized magnitude, one step inside int16 to absorb float rounding
+_MAX_STEPS = np.iinfo(np.int16).max - 1
+
+FLAG_DELTA = 0x1
+_COMPRESSION_SHIFT = 1
+_COMPRESSORS = {
+    None: 0,
+    "zlib": 1,
+    "lzma": 2,
+}
+_DECOMPRESS = {
+    1: zlib.decompress,
+    2: lzma.decompress,
+}
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S4"),
+    ("version", "u1"),
+    ("flags", "u1"),
+    ("reserved", "<u2"),
+    ("frames", "<u4"),
+    ("joints", "<u4"),
+    ("origin", "<f4", (3,)),
+    ("step", "<f4"),
+])
+
+
+def _torso_scale(seq: np.ndarray) -> float:
+    """Median shoulder width, falling back to the spread of the data"""
+    width = np.linalg.norm(seq[:, LEFT_SHOULDER] - seq[:, RIGHT_SHOULDER], axis=-1)
+    width = width[np.isfinite(width) & (width > 0)]
+    if len(width):
+        return float(np.median(width))
+    finite = seq[np.isfinite(seq)]
+    spread = float(finite.max() - finite.min()) if len(finite) else 0.0
+    return spread if spread > 0 else 1.0
+
+
+def encode_sequence(seq: np.ndarray, compression: Optional[str] = "zlib",
+                    delta: bool = True) -> bytes:
+    """
+    Encode a landmark sequence
+
+    Args:
+        seq: Array of shape (frames, joints, 3); NaN marks undetected joints
+        compression: "zlib", "lzma" or None
+        delta: Store per-frame differences instead of absolute values
+
+    Returns:
+        Encoded bytes
+    """
+    if compression not in _COMPRESSORS:
+        raise ValueError(f"Unknown compression: {compression}")
+    seq = np.asarray(seq, dtype=np.float32)
+    if seq.ndim != 3 or seq.shape[-1] != 3:
+        raise ValueError(f"Expected landmarks of shape (frames, joints, 3), got {seq.shape}")
+
+    missing = np.isnan(seq)
+    origin = np.nanmean(seq.reshape(-1, 3), axis=0) if not missing.all() else np.zeros(3)
+    step = _torso_scale(seq) / STEPS_PER_UNIT
+    span = float(np.nanmax(np.abs(seq - origin))) if not missing.all() else 0.0
+    if span > step * _MAX_STEPS:
+        step = span / _MAX_STEPS
+    quantized = np.rint((seq - origin) / step)
+    quantized = np.clip(np.nan_to_num(quantized), MISSING + 1, np.iinfo(np.int16).max)
+    quantized = quantized.astype(np.int16)
+    quantized[missing] = MISSING
+
+    flags = _COMPRESSORS[compression] << _COMPRESSION_SHIFT
+    if delta:
+        flags |= FLAG_DELTA
+        # int16 arithmetic wraps, and the cumulative sum on decode wraps back
+        quantized[1:] = np.diff(quantized, axis=0)
+
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header["magic"] = MAGIC
+    header["version"] = VERSION
+    header["flags"] = flags
+    header["frames"] = seq.shape[0]
+    header["joints"] = seq.shape[1]
+    header["origin"] = origin
+    header["step"] = step
+
+    payload = quantized.astype("<i2", copy=False).tobytes()
+    if compression == "zlib":
+        payload = zlib.compress(payload, 6)
+    elif compression == "lzma":
+        payload = lzma.compress(payload)
+    return header.tobytes() + payload
+
+
+def _read_header(blob) -> np.void:
+    header = np.frombuffer(blob, dtype=HEADER_DTYPE, count=1)[0]
+    if header["magic"] != MAGIC or header["version"] != VERSION:
+        raise ValueError("Not an encoded landmark sequence")
+    return header
+
+
+def decode_quantized(blob) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Decode the int16 payload without converting to float
+
+    For uncompressed blobs without delta encoding the returned array is a
+    read-only view into `blob`; otherwise it is the only array allocated.
+
+    Args:
+        blob: Bytes, memoryview or any buffer holding an encoded sequence
+
+    Returns:
+        (quantized int16 array of shape (frames, joints, 3), origin, step)
+    """
+    header = _read_header(blob)
+    flags = int(header["flags"])
+    shape = (int(header["frames"]), int(header["joints"]), 3)
+
+    compression = flags >> _COMPRESSION_SHIFT
+    if compression:
+        payload = _DECOMPRESS[compression](memoryview(blob)[HEADER_DTYPE.itemsize:])
+        quantized = np.frombuffer(payload, dtype="<i2").reshape(shape)
+    else:
+        quantized = np.frombuffer(blob, dtype="<i2", offset=HEADER_DTYPE.itemsize,
+                                  count=int(np.prod(shape))).reshape(shape)
+
+    if flags & FLAG_DELTA:
+        quantized = np.cumsum(quantized, axis=0, dtype=np.int16)
+    return quantized, header["origin"].astype(np.float32), float(header["step"])
+
+
+def decode_sequence(blob) -> np.ndarray:
+    """
+    Decode an encoded landmark sequence
+
+    Args:
+        blob: Bytes, memoryview or any buffer holding an encoded sequence
+
+    Returns:
+        float32 array of shape (frames, joints, 3) with NaN for undetected
+        joints. Each coordinate is within half a quantization step
+        (`max_error`) of the original, up to float32 rounding.
+    """
+    quantized, origin, step = decode_quantized(blob)
+    seq = quantized.astype(np.float32) * np.float32(step) + origin
+    seq[quantized == MISSING] = np.nan
+    return seq
+
+
+def max_error(blob) -> float:
+    """Largest per-coordinate reconstruction error of an encoded sequence"""
+    return float(_read_header(blob)["step"]) / 2
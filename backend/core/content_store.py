@@ -0,0 +1,396 @@
+"""
+Curriculum content store
+
+The module catalogue, lesson templates, placement questions and learning
+paths in one SQLite file, indexed for the lookups the pages make:
+
+- modules by level, in catalogue order (index on level, position)
+- a module or its lessons by module id (primary keys)
+- lesson templates by lesson type, and lessons of a type across modules
+- questions by section
+
+Loading one level's page reads only that level's rows. Reads go through a
+small in-process LRU cache, so Streamlit reruns do not touch the database
+at all; the cache is per store and the store is opened once per process by
+`open_content_store`.
+
+The store is built from `backend/models/curriculum.py` (or any catalogue of
+the same shape) and rebuilt when the source changes. Processes that find
+the store stale take a lock next to it, so only the first one rebuilds.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import (Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple,
+                    TypedDict, Union)
+
+try:
+    import fcntl
+except ImportError:  # Windows: no lock, so processes may rebuild the store together
+    fcntl = None
+
+DEFAULT_CONTENT_PATH = Path(
+    os.environ.get(
+        "POSE2POSE_CONTENT_STORE",
+        Path(__file__).resolve().parents[2] / "data" / "content.sqlite",
+    )
+)
+# Lookups kept in the read cache
+READ_CACHE_SIZE = 512
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE modules (
+    id TEXT PRIMARY KEY,
+    level TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX modules_by_level ON modules (level, position);
+CREATE TABLE lessons (
+    module_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    duration TEXT NOT NULL,
+    PRIMARY KEY (module_id, position)
+) WITHOUT ROWID;
+CREATE INDEX lessons_by_type ON lessons (type);
+CREATE TABLE lesson_content (lesson_type TEXT PRIMARY KEY, body TEXT NOT NULL);
+CREATE TABLE questions (
+    id TEXT PRIMARY KEY,
+    section TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX questions_by_section ON questions (section, position);
+CREATE TABLE learning_paths (level TEXT PRIMARY KEY, body TEXT NOT NULL);
+"""
+
+
+class LessonRecord(TypedDict):
+    """A lesson entry of a module"""
+    title: str
+    duration: str
+    type: str
+
+
+class ModuleRecord(TypedDict):
+    """A module as shown on the Modules page"""
+    id: str
+    title: str
+    description: str
+    difficulty: str
+    duration: str
+    lessons_count: int
+    estimated_hours: int
+    skills: List[str]
+    lessons: List[LessonRecord]
+
+
+def content_fingerprint(modules: Mapping[str, Sequence[Mapping]], lesson_content: Mapping,
+                        questions: Mapping, learning_paths: Mapping) -> str:
+    """Digest of a catalogue, stored with the database to detect changes"""
+    digest = hashlib.blake2b(str(SCHEMA_VERSION).encode(), digest_size=16)
+    for part in (modules, lesson_content, questions, learning_paths):
+        digest.update(json.dumps(part, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def build_content_store(path: Union[str, Path], modules: Mapping[str, Sequence[Mapping]],
+                        lesson_content: Mapping[str, Mapping], questions: Mapping[str, Sequence[Mapping]],
+                        learning_paths: Mapping[str, Mapping]) -> Path:
+    """
+    Write a content store
+
+    The database is written to a temporary file of its own and moved into
+    place, so readers never see a half-built store and concurrent builds
+    don't write to the same file.
+
+    Args:
+        path: Destination file
+        modules: Level to list of module dicts (MODULES_DATABASE shape)
+        lesson_content: Lesson type to template dict (LESSON_CONTENT shape)
+        questions: Section to list of question dicts with "id" (QUIZ_QUESTIONS shape)
+        learning_paths: Level to learning path dict (LEARNING_PATHS shape)
+
+    Returns:
+        The path written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    os.close(fd)
+    tmp = Path(tmp_name)
+
+    connection = sqlite3.connect(tmp)
+    try:
+        connection.executescript(_SCHEMA)
+        with connection:
+            connection.executemany("INSERT INTO meta VALUES (?, ?)", [
+                ("schema_version", str(SCHEMA_VERSION)),
+                ("fingerprint", content_fingerprint(modules, lesson_content, questions,
+                                                    learning_paths)),
+            ])
+            connection.executemany("INSERT INTO modules VALUES (?, ?, ?, ?, ?)", [
+                (module["id"], level, position, module["title"],
+                 json.dumps({key: value for key, value in module.items() if key != "lessons"}))
+                for level, level_modules in modules.items()
+                for position, module in enumerate(level_modules)
+            ])
+            connection.executemany("INSERT INTO lessons VALUES (?, ?, ?, ?, ?)", [
+                (module["id"], position, lesson["type"], lesson["title"], lesson["duration"])
+                for level_modules in modules.values() for module in level_modules
+                for position, lesson in enumerate(module["lessons"])
+            ])
+            connection.executemany("INSERT INTO lesson_content VALUES (?, ?)", [
+                (lesson_type, json.dumps(content)) for lesson_type, content in lesson_content.items()
+            ])
+            connection.executemany("INSERT INTO questions VALUES (?, ?, ?, ?)", [
+                (question["id"], section, position, json.dumps(question))
+                for section, section_questions in questions.items()
+                for position, question in enumerate(section_questions)
+            ])
+            connection.executemany("INSERT INTO learning_paths VALUES (?, ?)", [
+                (level, json.dumps(path)) for level, path in learning_paths.items()
+            ])
+        connection.execute("ANALYZE")
+    except BaseException:
+        connection.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    connection.close()
+    os.replace(tmp, path)
+    return path
+
+
+class ContentStore:
+    """
+    Read-only access to a content store
+
+    Safe to share between threads. Returned records are shared with the
+    read cache, so callers must treat them as read-only.
+
+    Usage:
+        store = open_content_store()
+        for module in store.modules_by_level("Beginner"):
+            print(module["title"], len(module["lessons"]))
+    """
+
+    def __init__(self, path: Union[str, Path], cache_size: int = READ_CACHE_SIZE):
+        self.path = Path(path)
+        self._connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True,
+                                           check_same_thread=False)
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._cache_size = cache_size
+        meta = dict(self._query("SELECT key, value FROM meta"))
+        if int(meta.get("schema_version", 0)) != SCHEMA_VERSION:
+            self.close()
+            raise ValueError(f"{self.path} has schema {meta.get('schema_version')}, "
+                             f"expected {SCHEMA_VERSION}")
+        self.fingerprint = meta["fingerprint"]
+        self.hits = 0
+        self.misses = 0
+
+    def _query(self, sql: str, params: Sequence = ()) -> List[tuple]:
+        with self._lock:
+            return self._connection.execute(sql, params).fetchall()
+
+    def _cached(self, key: tuple, load: Callable[[], Any]) -> Any:
+        """Result of a lookup, loaded once"""
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+        value = load()
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = value
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return value
+
+    def _modules(self, where: str, params: Sequence) -> List[ModuleRecord]:
+        """Modules matching a WHERE clause on `modules`, with their lessons, in catalogue order"""
+        modules: Dict[str, ModuleRecord] = {
+            module_id: {**json.loads(body), "lessons": []}
+            for module_id, body in self._query(
+                f"SELECT id, body FROM modules WHERE {where} ORDER BY position", params
+            )
+        }
+        if modules:
+            for module_id, lesson_type, title, duration in self._query(
+                f"SELECT lessons.module_id, lessons.type, lessons.title, lessons.duration "
+                f"FROM modules JOIN lessons ON lessons.module_id = modules.id "
+                f"WHERE {where} ORDER BY lessons.module_id, lessons.position", params
+            ):
+                modules[module_id]["lessons"].append(
+                    {"title": title, "duration": duration, "type": lesson_type}
+                )
+        return list(modules.values())
+
+    def _body(self, sql: str, params: Sequence) -> Optional[Any]:
+        rows = self._query(sql, params)
+        return json.loads(rows[0][0]) if rows else None
+
+    def levels(self) -> List[str]:
+        """Levels that have modules, in catalogue order"""
+        return self._cached(("levels",), lambda: [
+            level for level, in self._query(
+                "SELECT level FROM modules GROUP BY level ORDER BY MIN(rowid)"
+            )
+        ])
+
+    def modules_by_level(self, level: str) -> List[ModuleRecord]:
+        """Modules of a level, in catalogue order"""
+        return self._cached(("modules", level),
+                            lambda: self._modules("modules.level = ?", (level,)))
+
+    def module(self, module_id: str) -> Optional[ModuleRecord]:
+        """A module by id, or None"""
+        modules = self._cached(("module", module_id),
+                               lambda: self._modules("modules.id = ?", (module_id,)))
+        return modules[0] if modules else None
+
+    def module_level(self, module_id: str) -> Optional[str]:
+        """Level a module belongs to, or None"""
+        def load() -> Optional[str]:
+            rows = self._query("SELECT level FROM modules WHERE id = ?", (module_id,))
+            return rows[0][0] if rows else None
+        return self._cached(("module_level", module_id), load)
+
+    def iter_modules(self) -> Iterator[Tuple[str, ModuleRecord]]:
+        """(level, module) for every module, level by level"""
+        for level in self.levels():
+            for module in self.modules_by_level(level):
+                yield level, module
+
+    def count_modules(self, level: Optional[str] = None) -> int:
+        """Number of modules, in one level or overall"""
+        sql, params = ("SELECT COUNT(*) FROM modules WHERE level = ?", (level,)) if level \
+            else ("SELECT COUNT(*) FROM modules", ())
+        return self._cached(("count", level), lambda: self._query(sql, params)[0][0])
+
+    def lesson(self, module_id: str, index: int) -> Optional[LessonRecord]:
+        """The index-th lesson (from 0) of a module, or None"""
+        def load() -> Optional[LessonRecord]:
+            rows = self._query(
+                "SELECT title, duration, type FROM lessons WHERE module_id = ? AND position = ?",
+                (module_id, index),
+            )
+            return {"title": rows[0][0], "duration": rows[0][1], "type": rows[0][2]} if rows else None
+        return self._cached(("lesson", module_id, index), load)
+
+    def lessons_of_type(self, lesson_type: str) -> List[Dict[str, Any]]:
+        """Every lesson of a type, with its module_id and lesson_index (from 0)"""
+        return self._cached(("lessons_of_type", lesson_type), lambda: [
+            {"module_id": module_id, "lesson_index": position, "title": title,
+             "duration": duration, "type": lesson_type}
+            for module_id, position, title, duration in self._query(
+                "SELECT module_id, position, title, duration FROM lessons WHERE type = ?",
+                (lesson_type,),
+            )
+        ])
+
+    def lesson_content(self, lesson_type: str) -> Optional[Dict[str, Any]]:
+        """Lesson template for a lesson type, or None"""
+        return self._cached(("lesson_content", lesson_type), lambda: self._body(
+            "SELECT body FROM lesson_content WHERE lesson_type = ?", (lesson_type,)
+        ))
+
+    def lesson_types(self) -> List[str]:
+        """Lesson types that have a template, in catalogue order"""
+        return self._cached(("lesson_types",), lambda: [
+            lesson_type for lesson_type, in self._query(
+                "SELECT lesson_type FROM lesson_content ORDER BY rowid"
+            )
+        ])
+
+    def questions(self, section: str) -> List[Dict[str, Any]]:
+        """Questions of an assessment section ("multiple_choice", "short_answer"), in order"""
+        return self._cached(("questions", section), lambda: [
+            json.loads(body) for body, in self._query(
+                "SELECT body FROM questions WHERE section = ? ORDER BY position", (section,)
+            )
+        ])
+
+    def learning_path(self, level: str) -> Optional[Dict[str, Any]]:
+        """Recommended learning path for a level, or None"""
+        return self._cached(("learning_path", level), lambda: self._body(
+            "SELECT body FROM learning_paths WHERE level = ?", (level,)
+        ))
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Read cache hits, misses and size"""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._cache)}
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._connection.close()
+
+
+def _curriculum() -> tuple:
+    from ..models.curriculum import LEARNING_PATHS, LESSON_CONTENT, MODULES_DATABASE, QUIZ_QUESTIONS
+    return MODULES_DATABASE, LESSON_CONTENT, QUIZ_QUESTIONS, LEARNING_PATHS
+
+
+@contextmanager
+def _build_lock(path: Path):
+    """Exclusive lock on `<path>.lock`, held while a process rebuilds the store"""
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _open_current(path: Path, fingerprint: str) -> Optional[ContentStore]:
+    """The store at path if it was built from the expected content"""
+    try:
+        store = ContentStore(path)
+    except (sqlite3.Error, ValueError, KeyError):
+        return None
+    if store.fingerprint == fingerprint:
+        return store
+    store.close()
+    return None
+
+
+@lru_cache(maxsize=None)
+def open_content_store(path: Union[str, Path, None] = None) -> ContentStore:
+    """
+    Open the curriculum store once per process
+
+    Builds the store from `backend/models/curriculum.py` when it is missing
+    or was built from different content.
+    """
+    path = Path(path or DEFAULT_CONTENT_PATH)
+    source = _curriculum()
+    expected = content_fingerprint(*source)
+    store = _open_current(path, expected)
+    if store is not None:
+        return store
+    with _build_lock(path):
+        # Another process may have rebuilt it while this one waited
+        store = _open_current(path, expected)
+        if store is None:
+            build_content_store(path, *source)
+            store = ContentStore(path)
+    return store
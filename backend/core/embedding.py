@@ -0,0 +1,85 @@
+"""
+Text embeddings
+
+`HashingEmbedder` maps text to a dense unit vector by hashing word
+unigrams, word bigrams and character trigrams into a fixed number of
+buckets. It needs no model download or training, is deterministic across
+processes, and an embedding depends only on its own text, so vectors can be
+cached by content.
+"""
+
+import hashlib
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from .text import tokenize
+
+DEFAULT_DIM = 512
+
+# Relative weight of each feature family
+_UNIGRAM_WEIGHT = 1.0
+_BIGRAM_WEIGHT = 0.5
+_TRIGRAM_WEIGHT = 0.3
+
+
+@lru_cache(maxsize=262144)
+def _bucket(feature: str, dim: int) -> Tuple[int, float]:
+    """Stable bucket and sign for a feature (Python's hash() is salted per process)"""
+    digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+    return digest % dim, 1.0 if digest >> 63 else -1.0
+
+
+def _features(tokens: List[str]) -> Iterable[Tuple[str, float]]:
+    for token in tokens:
+        yield "w:" + token, _UNIGRAM_WEIGHT
+        padded = f"<{token}>"
+        for start in range(len(padded) - 2):
+            yield "c:" + padded[start:start + 3], _TRIGRAM_WEIGHT
+    for first, second in zip(tokens, tokens[1:]):
+        yield f"b:{first} {second}", _BIGRAM_WEIGHT
+
+
+class HashingEmbedder:
+    """
+    Feature-hashing text embedder
+
+    Usage:
+        embedder = HashingEmbedder()
+        vectors = embedder.embed(["hand shape", "facial expressions"])
+    """
+
+    def __init__(self, dim: int = DEFAULT_DIM):
+        self.dim = dim
+
+    @property
+    def name(self) -> str:
+        """Identifies the embedding space; vectors with different names are not comparable"""
+        return f"hashing-{self.dim}-v1"
+
+    def embed_one(self, text: str) -> np.ndarray:
+        """Embed a single text as a float32 unit vector (zeros for empty text)"""
+        buckets, weights = [], []
+        for feature, weight in _features(tokenize(text)):
+            bucket, sign = _bucket(feature, self.dim)
+            buckets.append(bucket)
+            weights.append(sign * weight)
+        vector = np.bincount(np.asarray(buckets, dtype=np.intp), weights=np.asarray(weights),
+                             minlength=self.dim).astype(np.float32)
+        # Dampen repeated features so long texts are not dominated by frequent words
+        vector = np.sign(vector) * np.log1p(np.abs(vector))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def embed(self, texts: Iterable[str]) -> np.ndarray:
+        """
+        Embed many texts
+
+        Returns:
+            float32 array of shape (len(texts), dim) with unit rows
+        """
+        rows = [self.embed_one(text) for text in texts]
+        if not rows:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack(rows)
@@ -0,0 +1,280 @@
+"""
+Content-addressed embedding store and batch embedder
+
+Embedding is the slow part of building the retrieval index and the sign
+index. `EmbeddingStore` keeps every vector ever computed under a digest of
+its input (text or landmark array), so unchanged content is never embedded
+twice. Vectors live in a memory-mapped float32 file that only grows by
+appending; a parallel file holds the 16-byte keys.
+
+`BatchEmbedder` looks up a list of items, embeds only the missing ones in
+batches over a process pool, and stores the results.
+
+Layout of a store directory (one per embedding model):
+    keys.bin     16-byte blake2b digests, one per row
+    vectors.f32  float32 rows of `dim` values
+    meta.json    {"model": ..., "dim": ...}
+    lock         taken by writers
+
+Every Streamlit process opens the same store, so `add` takes an exclusive
+lock on the lock file and first indexes the rows other processes have
+committed, then appends after them. Lookups see the rows that existed
+when the store was opened or last added to.
+"""
+
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no lock, so only one process may add to a store
+    fcntl = None
+
+DEFAULT_STORE_PATH = Path(
+    os.environ.get(
+        "POSE2POSE_EMBEDDING_STORE",
+        Path(__file__).resolve().parents[2] / "data" / "embeddings",
+    )
+)
+DEFAULT_BATCH_SIZE = 256
+
+KEY_SIZE = 16
+_KEYS_FILE = "keys.bin"
+_VECTORS_FILE = "vectors.f32"
+_META_FILE = "meta.json"
+_LOCK_FILE = "lock"
+
+
+def content_key(item) -> bytes:
+    """
+    Digest identifying an embedding input
+
+    Args:
+        item: Text, bytes, or a numpy array (dtype and shape are part of the key)
+
+    Returns:
+        16-byte digest
+    """
+    digest = hashlib.blake2b(digest_size=KEY_SIZE)
+    if isinstance(item, str):
+        digest.update(b"s")
+        digest.update(item.encode())
+    elif isinstance(item, bytes):
+        digest.update(b"b")
+        digest.update(item)
+    else:
+        array = np.ascontiguousarray(item)
+        digest.update(f"a{array.dtype.str}{array.shape}".encode())
+        digest.update(array.tobytes())
+    return digest.digest()
+
+
+class EmbeddingStore:
+    """
+    Append-only map from content key to vector
+
+    Usage:
+        store = EmbeddingStore(DEFAULT_STORE_PATH / embedder.name, embedder.dim, embedder.name)
+        vectors, missing = store.lookup(keys)
+    """
+
+    def __init__(self, directory: Union[str, Path], dim: int, model: str):
+        self.directory = Path(directory)
+        self.dim = dim
+        self.model = model
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        meta_path = self.directory / _META_FILE
+        meta = {"model": model, "dim": dim}
+        if meta_path.exists():
+            stored = json.loads(meta_path.read_text(encoding="utf-8"))
+            if stored != meta:
+                raise ValueError(f"Embedding store {self.directory} holds {stored}, not {meta}")
+        else:
+            meta_path.write_text(json.dumps(meta), encoding="utf-8")
+
+        self._row_bytes = dim * np.dtype(np.float32).itemsize
+        self._rows = 0
+        self._index: Dict[bytes, int] = {}
+        self._vectors: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        self._catch_up()
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._index
+
+    def _catch_up(self) -> None:
+        """Index the rows committed since this store last looked"""
+        keys_path, vectors_path = self.directory / _KEYS_FILE, self.directory / _VECTORS_FILE
+        if not keys_path.exists() or not vectors_path.exists():
+            return
+        vector_rows = vectors_path.stat().st_size // self._row_bytes
+        with open(keys_path, "rb") as f:
+            f.seek(self._rows * KEY_SIZE)
+            keys = f.read()
+        # Rows are complete only once both files hold them (vectors are written first)
+        rows = min(self._rows + len(keys) // KEY_SIZE, vector_rows)
+        for row in range(self._rows, rows):
+            offset = (row - self._rows) * KEY_SIZE
+            self._index[keys[offset:offset + KEY_SIZE]] = row
+        self._rows = max(self._rows, rows)
+
+    @contextmanager
+    def _write_lock(self):
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.directory / _LOCK_FILE, "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _mapped(self) -> np.ndarray:
+        if self._vectors is None or len(self._vectors) != self._rows:
+            if self._rows == 0:
+                return np.zeros((0, self.dim), dtype=np.float32)
+            self._vectors = np.memmap(self.directory / _VECTORS_FILE, dtype=np.float32,
+                                      mode="r", shape=(self._rows, self.dim))
+        return self._vectors
+
+    def lookup(self, keys: Sequence[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fetch stored vectors
+
+        Returns:
+            (float32 array of shape (len(keys), dim) with zero rows for
+            missing keys, boolean mask of the missing keys)
+        """
+        rows = np.array([self._index.get(key, -1) for key in keys], dtype=np.int64)
+        missing = rows < 0
+        vectors = np.zeros((len(keys), self.dim), dtype=np.float32)
+        if (~missing).any():
+            with self._lock:
+                vectors[~missing] = self._mapped()[rows[~missing]]
+        return vectors, missing
+
+    def add(self, keys: Sequence[bytes], vectors: np.ndarray) -> None:
+        """Append vectors for keys that are not stored yet"""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(keys), self.dim)
+        with self._write_lock():
+            # Another process may have added rows, some of them these keys
+            self._catch_up()
+            new, seen = [], set()
+            for row, key in enumerate(keys):
+                if key not in self._index and key not in seen:
+                    seen.add(key)
+                    new.append(row)
+            if not new:
+                return
+            # Written at the row offsets rather than appended, so a partial
+            # row left by an interrupted write is overwritten, not kept
+            self._write_rows(_VECTORS_FILE, self._rows * self._row_bytes,
+                             vectors[new].tobytes())
+            self._write_rows(_KEYS_FILE, self._rows * KEY_SIZE,
+                             b"".join(keys[row] for row in new))
+            for row in new:
+                self._index[keys[row]] = self._rows
+                self._rows += 1
+
+    def _write_rows(self, name: str, offset: int, data: bytes) -> None:
+        """Write data at offset and drop anything after it"""
+        path = self.directory / name
+        with open(path, "r+b" if path.exists() else "wb") as f:
+            f.seek(offset)
+            f.write(data)
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _embed_batch(embed_fn: Callable[[List], np.ndarray], batch: List) -> np.ndarray:
+    return np.asarray(embed_fn(batch), dtype=np.float32)
+
+
+class BatchEmbedder:
+    """
+    Embed items through an EmbeddingStore, computing only what is missing
+
+    `embed_fn` maps a list of items to an array of shape (len(items), dim).
+    It runs in worker processes, so it must be picklable: a module-level
+    function or a method of a picklable object such as `HashingEmbedder`.
+
+    Usage:
+        with BatchEmbedder(embedder.embed, store, workers=4) as batch:
+            vectors = batch.embed(texts)
+    """
+
+    def __init__(self, embed_fn: Callable[[List], np.ndarray], store: EmbeddingStore,
+                 batch_size: int = DEFAULT_BATCH_SIZE, workers: Optional[int] = None):
+        self.embed_fn = embed_fn
+        self.store = store
+        self.batch_size = batch_size
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.computed = 0
+        self.reused = 0
+
+    def embed(self, items: Sequence, keys: Optional[Sequence[bytes]] = None) -> np.ndarray:
+        """
+        Embed items, reusing stored vectors
+
+        Args:
+            items: Texts or arrays accepted by `embed_fn`
+            keys: Precomputed content keys; computed with `content_key` if omitted
+
+        Returns:
+            float32 array of shape (len(items), dim)
+        """
+        keys = list(keys) if keys is not None else [content_key(item) for item in items]
+        vectors, missing = self.store.lookup(keys)
+        self.reused += int((~missing).sum())
+
+        # Embed each distinct missing input once
+        first: Dict[bytes, int] = {}
+        for row in np.flatnonzero(missing):
+            first.setdefault(keys[row], int(row))
+        todo = list(first.values())
+        if todo:
+            batches = [[items[row] for row in todo[start:start + self.batch_size]]
+                       for start in range(0, len(todo), self.batch_size)]
+            computed = np.concatenate(list(self._map(batches)))
+            self.store.add([keys[row] for row in todo], computed)
+            self.computed += len(todo)
+            by_key = {keys[row]: vector for row, vector in zip(todo, computed)}
+            for row in np.flatnonzero(missing):
+                vectors[row] = by_key[keys[row]]
+        return vectors
+
+    def _map(self, batches: List[List]):
+        if self.workers <= 1 or len(batches) == 1:
+            return (_embed_batch(self.embed_fn, batch) for batch in batches)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=mp.get_context("spawn"))
+        return self._executor.map(_embed_batch, [self.embed_fn] * len(batches), batches)
+
+    def close(self) -> None:
+        """Shut down the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "BatchEmbedder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
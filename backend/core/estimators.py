@@ -0,0 +1,98 @@
+"""
+Pose estimators
+
+Landmark extraction is pluggable: anything implementing `PoseEstimator`
+can run in the streaming pipeline or the worker pool. `StubEstimator` is a
+deterministic stand-in for tests; `MediaPipeEstimator` wraps MediaPipe
+Holistic when it is installed.
+"""
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from .landmarks import LEFT_SHOULDER, NUM_BODY_JOINTS, NUM_HAND_JOINTS, NUM_JOINTS, RIGHT_SHOULDER
+
+
+class PoseEstimator(ABC):
+    """Maps an RGB frame to landmarks of shape (NUM_JOINTS, 3)"""
+
+    @abstractmethod
+    def estimate(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Extract landmarks from one frame
+
+        Args:
+            frame: uint8 RGB image of shape (height, width, 3)
+
+        Returns:
+            float32 array of shape (NUM_JOINTS, 3); undetected joints are NaN
+        """
+
+    def close(self) -> None:
+        """Release model resources"""
+
+    def __call__(self, frame: np.ndarray) -> np.ndarray:
+        return self.estimate(frame)
+
+
+class StubEstimator(PoseEstimator):
+    """
+    Deterministic estimator for tests
+
+    Returns a fixed skeleton shifted by the frame's mean colour, so equal
+    frames always give equal landmarks and different frames usually differ.
+    """
+
+    def __init__(self, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self._base = rng.normal(0.5, 0.1, size=(NUM_JOINTS, 3)).astype(np.float32)
+        self._base[LEFT_SHOULDER] = [0.4, 0.4, 0.0]
+        self._base[RIGHT_SHOULDER] = [0.6, 0.4, 0.0]
+
+    def estimate(self, frame: np.ndarray) -> np.ndarray:
+        shift = frame.reshape(-1, frame.shape[-1]).mean(axis=0) / 2550.0
+        return self._base + shift.astype(np.float32)
+
+
+class MediaPipeEstimator(PoseEstimator):
+    """
+    MediaPipe Holistic pose and hand landmarks
+
+    Requires the `mediapipe` package.
+
+    Args:
+        model_complexity: 0, 1 or 2; higher is more accurate and slower
+        tracking: Track landmarks from frame to frame instead of detecting
+            them in each frame. Faster, but only correct when the estimator
+            sees the consecutive frames of a single stream; the worker pool
+            hands frames to workers round-robin, so its estimators must not
+            track.
+    """
+
+    def __init__(self, model_complexity: int = 1, tracking: bool = False):
+        try:
+            import mediapipe as mp
+        except ImportError as exc:
+            raise ImportError("MediaPipeEstimator requires mediapipe: uv add mediapipe") from exc
+        self._holistic = mp.solutions.holistic.Holistic(
+            static_image_mode=not tracking, model_complexity=model_complexity
+        )
+
+    @staticmethod
+    def _fill(out: np.ndarray, landmarks) -> None:
+        if landmarks is not None:
+            out[:] = [(p.x, p.y, p.z) for p in landmarks.landmark]
+
+    def estimate(self, frame: np.ndarray) -> np.ndarray:
+        results = self._holistic.process(frame)
+        landmarks = np.full((NUM_JOINTS, 3), np.nan, dtype=np.float32)
+        left_hand = NUM_BODY_JOINTS
+        right_hand = NUM_BODY_JOINTS + NUM_HAND_JOINTS
+        self._fill(landmarks[:left_hand], results.pose_landmarks)
+        self._fill(landmarks[left_hand:right_hand], results.left_hand_landmarks)
+        self._fill(landmarks[right_hand:], results.right_hand_landmarks)
+        return landmarks
+
+    def close(self) -> None:
+        self._holistic.close()
@@ -0,0 +1,615 @@
+"""
+Learning event log
+
+An append-only record of what learners do: lessons started, quiz answers,
+practice scores and completed modules. Events are JSON lines in numbered
+segment files; a new segment is started once the active one reaches
+`segment_bytes`.
+
+Appends go to the OS buffer and are fsynced in batches, every
+`sync_interval` seconds or as soon as `sync_batch` events are waiting, so
+recording an event never waits on the disk. A crash loses at most the
+events since the last sync; a torn last line is cut off by the next
+process to read the log.
+
+Events are numbered in log order by a `seq` field that compaction keeps,
+so a consumer such as the analytics export can resume after the last event
+it read (`iter_events(after_seq=...)`) whatever the events' timestamps.
+
+Every event also updates rollup tables kept in memory: per user and day,
+per user and module, and per user. The tables are checkpointed together
+with the log position they cover, so opening the log replays only the
+events written after the checkpoint. Dashboards read the rollups and never
+scan raw events.
+
+`compact` merges the sealed segments into one and drops events older than
+the retention period; their counts stay in the rollups.
+
+Several processes (e.g. Streamlit server workers) can share a log
+directory. Appends, rotation, checkpoints and compaction take an exclusive
+lock on the directory's lock file, and each process applies the events the
+others appended before it writes or reads, so every process's rollups and
+checkpoints cover the whole log up to their position.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: no lock, so only one process may use a log directory
+    fcntl = None
+
+DEFAULT_EVENT_LOG_PATH = Path(
+    os.environ.get(
+        "POSE2POSE_EVENT_LOG",
+        Path(__file__).resolve().parents[2] / "data" / "events",
+    )
+)
+DEFAULT_SEGMENT_BYTES = 8 * 1024 * 1024
+DEFAULT_SYNC_INTERVAL = 1.0
+DEFAULT_SYNC_BATCH = 256
+# Events between rollup checkpoints
+DEFAULT_CHECKPOINT_EVENTS = 5000
+DEFAULT_RETENTION_DAYS = 90
+
+LESSON_STARTED = "lesson_started"
+QUIZ_ANSWERED = "quiz_answered"
+PRACTICE_SCORED = "practice_scored"
+MODULE_COMPLETED = "module_completed"
+EVENT_TYPES = (LESSON_STARTED, QUIZ_ANSWERED, PRACTICE_SCORED, MODULE_COMPLETED)
+
+CHECKPOINT_NAME = "rollups.json"
+LOCK_NAME = "lock"
+CHECKPOINT_VERSION = 1
+_SEGMENT_SUFFIX = ".log"
+
+
+@dataclass
+class ActivityRollup:
+    """
+    Event counters for one user over a day, a module or all time
+
+    Updated in place by the log; the read methods return copies.
+    """
+    lessons_started: int = 0
+    quiz_answers: int = 0
+    quiz_correct: int = 0
+    practice_attempts: int = 0
+    practice_score_total: float = 0.0
+    best_practice_score: float = 0.0
+    modules_completed: int = 0
+
+    @property
+    def quiz_accuracy(self) -> float:
+        """Correct quiz answers as a fraction of answers given"""
+        return self.quiz_correct / self.quiz_answers if self.quiz_answers else 0.0
+
+    @property
+    def average_practice_score(self) -> float:
+        """Mean practice score (0-1)"""
+        return self.practice_score_total / self.practice_attempts if self.practice_attempts else 0.0
+
+    @property
+    def events(self) -> int:
+        """Number of events counted"""
+        return self.lessons_started + self.quiz_answers + self.practice_attempts + self.modules_completed
+
+    def __add__(self, other: "ActivityRollup") -> "ActivityRollup":
+        return ActivityRollup(
+            lessons_started=self.lessons_started + other.lessons_started,
+            quiz_answers=self.quiz_answers + other.quiz_answers,
+            quiz_correct=self.quiz_correct + other.quiz_correct,
+            practice_attempts=self.practice_attempts + other.practice_attempts,
+            practice_score_total=self.practice_score_total + other.practice_score_total,
+            best_practice_score=max(self.best_practice_score, other.best_practice_score),
+            modules_completed=self.modules_completed + other.modules_completed,
+        )
+
+    def apply(self, event: Dict[str, Any]) -> None:
+        """Count one more event"""
+        kind = event["type"]
+        if kind == LESSON_STARTED:
+            self.lessons_started += 1
+        elif kind == QUIZ_ANSWERED:
+            self.quiz_answers += 1
+            self.quiz_correct += bool(event.get("correct"))
+        elif kind == PRACTICE_SCORED:
+            score = float(event.get("score", 0.0))
+            self.practice_attempts += 1
+            self.practice_score_total += score
+            self.best_practice_score = max(self.best_practice_score, score)
+        elif kind == MODULE_COMPLETED:
+            self.modules_completed += 1
+
+
+def event_day(timestamp: float) -> str:
+    """UTC date of an event, as used for the daily rollups"""
+    return time.strftime("%Y-%m-%d", time.gmtime(timestamp))
+
+
+class EventLog:
+    """
+    Segmented append-only event log with incremental rollups
+
+    Safe to share between threads.
+
+    Usage:
+        log = open_event_log()
+        log.append(user_id, QUIZ_ANSWERED, module_id="mod1", lesson=2, correct=True)
+        week = log.recent(user_id, days=7)
+    """
+
+    def __init__(self, directory: Union[str, Path], segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+                 sync_interval: float = DEFAULT_SYNC_INTERVAL, sync_batch: int = DEFAULT_SYNC_BATCH,
+                 checkpoint_events: int = DEFAULT_CHECKPOINT_EVENTS,
+                 retention_days: int = DEFAULT_RETENTION_DAYS):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.sync_interval = sync_interval
+        self.sync_batch = sync_batch
+        self.checkpoint_events = checkpoint_events
+        self.retention_days = retention_days
+
+        self._daily: Dict[str, Dict[str, ActivityRollup]] = {}
+        self._modules: Dict[str, Dict[str, ActivityRollup]] = {}
+        self._users: Dict[str, ActivityRollup] = {}
+        self._lock = threading.RLock()
+        # Serializes fsync and compaction
+        self._sync_lock = threading.Lock()
+        # Lock shared with other processes; held while self._lock is
+        self._lock_file = open(self.directory / LOCK_NAME, "a")
+        self._lock_depth = 0
+        self._unsynced = 0
+        self._since_checkpoint = 0
+        self._sealed: List[BinaryIO] = []
+        # (inode, mtime) of the checkpoint file when this process last read or wrote it
+        self._checkpoint_seen: Optional[Tuple[int, int]] = None
+        self.appends = 0
+        self.syncs = 0
+        self.replayed = 0
+        # Sequence number of the last event in the log
+        self._seq = 0
+
+        with self._locked():
+            self._position = self._load_checkpoint()
+            for number in self._segments():
+                if number >= self._position[0]:
+                    self._read_to_end(number, self._position[1] if number == self._position[0] else 0)
+            if not self._position[0]:
+                self._position = (1, 0)
+            self._file = open(self._segment_path(self._position[0]), "ab")
+
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        """(segment, byte offset) up to which this process has applied the log"""
+        return self._position
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold this process's lock and the lock shared with other processes"""
+        with self._lock:
+            self._lock_depth += 1
+            try:
+                if self._lock_depth == 1 and fcntl is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0 and fcntl is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    # Segments
+
+    def _segment_path(self, number: int) -> Path:
+        return self.directory / f"{number:08d}{_SEGMENT_SUFFIX}"
+
+    def _segments(self) -> List[int]:
+        return sorted(int(path.stem) for path in self.directory.glob(f"*{_SEGMENT_SUFFIX}")
+                      if path.stem.isdigit())
+
+    def _read_segment(self, number: int, offset: int = 0,
+                      repair: bool = False) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """
+        Events of a segment from a byte offset, with the offset after each
+
+        A last line without a newline is incomplete and is skipped; with
+        `repair` (only with the shared lock held) it is also cut off the file.
+        """
+        path = self._segment_path(number)
+        with open(path, "rb") as handle:
+            handle.seek(offset)
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    if repair:
+                        # Torn write from a crashed process: appends must start on a clean line
+                        handle.close()
+                        os.truncate(path, offset)
+                    return
+                offset += len(line)
+                yield json.loads(line), offset
+
+    def _read_to_end(self, number: int, offset: int) -> None:
+        """Apply a segment's events from offset on and move the position to its end"""
+        for event, offset in self._read_segment(number, offset, repair=True):
+            self._apply(event)
+            self._seq = max(self._seq, event.get("seq", 0))
+            self.replayed += 1
+        self._position = (number, offset)
+
+    def _catch_up(self) -> None:
+        """
+        Apply the events other processes appended since this one last looked
+
+        Called with the shared lock held. Costs a few stats when nothing is new.
+        """
+        if self._file.closed:
+            return
+        self._reload_checkpoint()
+        while True:
+            segment, offset = self._position
+            if os.fstat(self._file.fileno()).st_size > offset:
+                self._read_to_end(segment, offset)
+            if not self._segment_path(segment + 1).exists():
+                return
+            # Another process rotated
+            self._seal()
+            self._position = (segment + 1, 0)
+            self._file = open(self._segment_path(segment + 1), "ab")
+
+    def _seal(self) -> None:
+        # The sealed segment is fsynced and closed by the next sync
+        self._file.flush()
+        self._sealed.append(self._file)
+
+    def _rotate(self) -> None:
+        self._seal()
+        self._position = (self._position[0] + 1, 0)
+        self._file = open(self._segment_path(self._position[0]), "ab")
+
+    # Rollups
+
+    def _apply(self, event: Dict[str, Any]) -> None:
+        user_id = event["user"]
+        day = event_day(event["ts"])
+        daily = self._daily.setdefault(user_id, {})
+        if day not in daily:
+            daily[day] = ActivityRollup()
+        daily[day].apply(event)
+        module_id = event.get("module")
+        if module_id is not None:
+            modules = self._modules.setdefault(user_id, {})
+            if module_id not in modules:
+                modules[module_id] = ActivityRollup()
+            modules[module_id].apply(event)
+        if user_id not in self._users:
+            self._users[user_id] = ActivityRollup()
+        self._users[user_id].apply(event)
+
+    def _checkpoint_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.directory / CHECKPOINT_NAME)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _read_checkpoint(self) -> Optional[Dict[str, Any]]:
+        self._checkpoint_seen = self._checkpoint_stat()
+        if self._checkpoint_seen is None:
+            return None
+        checkpoint = json.loads((self.directory / CHECKPOINT_NAME).read_text())
+        return checkpoint if checkpoint.get("version") == CHECKPOINT_VERSION else None
+
+    def _load_checkpoint(self, checkpoint: Optional[Dict[str, Any]] = None) -> Tuple[int, int]:
+        """Restore the rollups; returns the log position they cover"""
+        checkpoint = checkpoint or self._read_checkpoint()
+        if checkpoint is None:
+            return 0, 0
+        self._daily = {user: {day: ActivityRollup(**counts) for day, counts in days.items()}
+                       for user, days in checkpoint["daily"].items()}
+        self._modules = {user: {module: ActivityRollup(**counts) for module, counts in modules.items()}
+                         for user, modules in checkpoint["modules"].items()}
+        self._users = {user: ActivityRollup(**counts) for user, counts in checkpoint["users"].items()}
+        self._seq = checkpoint.get("seq", 0)
+        segment, offset = checkpoint["position"]
+        return segment, offset
+
+    def _reload_checkpoint(self) -> None:
+        """
+        Take over a checkpoint another process wrote past this one's position
+
+        Needed after another process compacts: the segments this process
+        would read next may have been merged away, but their events are
+        in the checkpoint written before the merge.
+        """
+        if self._checkpoint_stat() == self._checkpoint_seen:
+            return
+        checkpoint = self._read_checkpoint()
+        if checkpoint is None or tuple(checkpoint["position"]) <= self._position:
+            return
+        position = self._load_checkpoint(checkpoint)
+        if position[0] != self._position[0]:
+            self._seal()
+            self._file = open(self._segment_path(position[0]), "ab")
+        self._position = position
+
+    def _snapshot(self) -> Dict[str, Any]:
+        return {
+            "version": CHECKPOINT_VERSION,
+            "position": list(self._position),
+            "seq": self._seq,
+            "daily": {user: {day: asdict(rollup) for day, rollup in days.items()}
+                      for user, days in self._daily.items()},
+            "modules": {user: {module: asdict(rollup) for module, rollup in modules.items()}
+                        for user, modules in self._modules.items()},
+            "users": {user: asdict(rollup) for user, rollup in self._users.items()},
+        }
+
+    def _write_checkpoint(self) -> None:
+        """Checkpoint the rollups; with the shared lock held, so checkpoints only move forward"""
+        self._catch_up()
+        path = self.directory / CHECKPOINT_NAME
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as handle:
+            json.dump(self._snapshot(), handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, path)
+        self._checkpoint_seen = self._checkpoint_stat()
+        self._since_checkpoint = 0
+
+    # Writing
+
+    def append(self, user_id: str, event_type: str, module_id: Optional[str] = None,
+               **data: Any) -> None:
+        """
+        Record an event and update the rollups
+
+        Args:
+            user_id: Learner
+            event_type: One of EVENT_TYPES
+            module_id: Module the event belongs to, if any
+            **data: Event fields, e.g. lesson=2, correct=True or score=0.85
+        """
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Unknown event type: {event_type}")
+        event = {"ts": data.pop("ts", time.time()), "user": user_id, "type": event_type,
+                 "module": module_id, **data}
+        with self._locked():
+            if self._closed:
+                raise RuntimeError("EventLog is closed")
+            self._catch_up()
+            # Numbered after catching up, so numbers follow the order of the lines
+            self._seq += 1
+            event["seq"] = self._seq
+            line = (json.dumps(event, separators=(",", ":")) + "\n").encode()
+            segment, offset = self._position
+            if offset + len(line) > self.segment_bytes and offset > 0:
+                self._rotate()
+                segment, offset = self._position
+            # Flushed under the lock so lines from different processes never interleave
+            self._file.write(line)
+            self._file.flush()
+            self._position = (segment, offset + len(line))
+            self._apply(event)
+            self.appends += 1
+            self._unsynced += 1
+            self._since_checkpoint += 1
+            full = self._unsynced == self.sync_batch
+        if full:
+            self._wake.set()
+
+    def sync(self, checkpoint: bool = False) -> int:
+        """
+        Make every appended event durable
+
+        Args:
+            checkpoint: Also checkpoint the rollups now rather than every
+                `checkpoint_events` events
+
+        Returns:
+            Number of events synced
+        """
+        with self._sync_lock:
+            with self._lock:
+                synced, self._unsynced = self._unsynced, 0
+                checkpoint = checkpoint or self._since_checkpoint >= self.checkpoint_events
+                if not synced and not checkpoint:
+                    return 0
+                self._file.flush()
+                # A duplicate descriptor stays valid if an append rotates meanwhile
+                fd = os.dup(self._file.fileno())
+                sealed, self._sealed = self._sealed, []
+            for handle in sealed:
+                os.fsync(handle.fileno())
+                handle.close()
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            if checkpoint:
+                with self._locked():
+                    self._write_checkpoint()
+            self.syncs += 1
+            return synced
+
+    def compact(self, retention_days: Optional[int] = None) -> Dict[str, int]:
+        """
+        Merge sealed segments and drop events past retention
+
+        The rollups are checkpointed first, so dropped events stay counted.
+        A crash while compacting can leave some events twice in the raw
+        segments; the rollups are unaffected.
+
+        Returns:
+            Segments merged, and events kept and dropped
+        """
+        retention_days = self.retention_days if retention_days is None else retention_days
+        cutoff = time.time() - retention_days * 86400
+        with self._sync_lock, self._locked():
+            self._catch_up()
+            self._rotate()
+            self._write_checkpoint()
+            sealed = [number for number in self._segments() if number < self._position[0]]
+            kept = dropped = 0
+            if sealed:
+                target = self._segment_path(sealed[-1])
+                tmp = target.with_suffix(".tmp")
+                with open(tmp, "wb") as out:
+                    for number in sealed:
+                        for event, _ in self._read_segment(number):
+                            if event["ts"] < cutoff:
+                                dropped += 1
+                                continue
+                            out.write((json.dumps(event, separators=(",", ":")) + "\n").encode())
+                            kept += 1
+                    out.flush()
+                    os.fsync(out.fileno())
+                if kept:
+                    os.replace(tmp, target)
+                else:
+                    tmp.unlink()
+                    target.unlink()
+                for number in sealed[:-1]:
+                    self._segment_path(number).unlink()
+        return {"segments": len(sealed), "kept": kept, "dropped": dropped}
+
+    def close(self) -> None:
+        """Sync, checkpoint the rollups and stop the background syncer"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.sync(checkpoint=True)
+        self._file.close()
+        self._lock_file.close()
+
+    def __enter__(self) -> "EventLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        while not self._closed:
+            woken = self._wake.wait(self.sync_interval)
+            self._wake.clear()
+            if self._closed:
+                break
+            # A wake-up left over from appends the last sync already covered
+            if woken and self._unsynced < self.sync_batch:
+                continue
+            self.sync()
+
+    # Reading
+
+    def daily(self, user_id: str, since: Optional[str] = None) -> List[Tuple[str, ActivityRollup]]:
+        """
+        A user's counters per day, oldest first
+
+        Args:
+            since: First day to include ("YYYY-MM-DD")
+        """
+        with self._locked():
+            self._catch_up()
+            return [(day, replace(rollup)) for day, rollup in sorted(self._daily.get(user_id, {}).items())
+                    if since is None or day >= since]
+
+    def recent(self, user_id: str, days: int = 7) -> ActivityRollup:
+        """A user's counters summed over the last `days` days, today included"""
+        now = time.time()
+        wanted = [event_day(now - offset * 86400) for offset in range(days)]
+        total = ActivityRollup()
+        with self._locked():
+            self._catch_up()
+            daily = self._daily.get(user_id, {})
+            for day in wanted:
+                if day in daily:
+                    total += daily[day]
+        return total
+
+    def modules(self, user_id: str) -> Dict[str, ActivityRollup]:
+        """A user's counters per module"""
+        with self._locked():
+            self._catch_up()
+            return {module: replace(rollup) for module, rollup in self._modules.get(user_id, {}).items()}
+
+    def totals(self, user_id: str) -> ActivityRollup:
+        """A user's counters over all time"""
+        with self._locked():
+            self._catch_up()
+            return replace(self._users.get(user_id, ActivityRollup()))
+
+    def _first_seq(self, number: int) -> Optional[int]:
+        with open(self._segment_path(number), "rb") as handle:
+            line = handle.readline()
+        return json.loads(line).get("seq") if line.endswith(b"\n") else None
+
+    def iter_events(self, user_id: Optional[str] = None,
+                    after_seq: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Raw events still in the log, oldest first
+
+        Scans the segments; for exports and audits, not for dashboards.
+        Runs without the lock, so appends go on meanwhile. If another
+        process compacts the segments being read, the scan lists them again
+        and resumes after the last event it read.
+
+        Args:
+            user_id: Only this learner's events
+            after_seq: Only events after this sequence number; segments
+                that end before it are skipped without being read
+        """
+        with self._lock:
+            self._file.flush()
+        while True:
+            segments = self._segments()
+            try:
+                for idx, number in enumerate(segments):
+                    if after_seq is not None and idx + 1 < len(segments):
+                        following = self._first_seq(segments[idx + 1])
+                        if following is not None and following <= after_seq + 1:
+                            continue
+                    for event, _ in self._read_segment(number):
+                        seq = event.get("seq", 0)
+                        if after_seq is not None and seq <= after_seq:
+                            continue
+                        after_seq = seq
+                        if user_id is None or event["user"] == user_id:
+                            yield event
+                return
+            except FileNotFoundError:
+                # Merged away by a compaction; its events are in a later segment
+                continue
+
+    def stats(self) -> Dict[str, int]:
+        """Appends, syncs and replayed events so far, and the segments on disk"""
+        return {
+            "appends": self.appends,
+            "syncs": self.syncs,
+            "replayed": self.replayed,
+            "segments": len(self._segments()),
+        }
+
+
+@lru_cache(maxsize=None)
+def open_event_log(path: Union[str, Path, None] = None) -> EventLog:
+    """The process-wide event log; synced and checkpointed when the process exits"""
+    log = EventLog(path or DEFAULT_EVENT_LOG_PATH)
+    atexit.register(log.close)
+    return log
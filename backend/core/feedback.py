@@ -0,0 +1,96 @@
+"""
+Feedback tips from a score breakdown
+
+Turns the `ScoreBreakdown` returned by `analyze_attempt` into short,
+learner-facing tips. Everything is read from the breakdown, so producing
+feedback never rescores the attempt. Rules live in a table: each one looks
+at a single value of the breakdown and fires when it crosses a threshold.
+"""
+
+import math
+from typing import Callable, List, NamedTuple
+
+from .scoring import ScoreBreakdown
+
+# Mean joint distance (shoulder widths) above which a body part gets a tip
+PART_ERROR_THRESHOLD = 0.25
+# Fraction of undetected joints above which a body part gets a tip
+PART_MISSING_THRESHOLD = 0.5
+# Timing offset (fraction of the sign) above which timing gets a tip
+TIMING_THRESHOLD = 0.1
+
+MAX_TIPS = 3
+
+
+class FeedbackRule(NamedTuple):
+    """A tip shown when `measure(breakdown)` is above `threshold`"""
+    measure: Callable[[ScoreBreakdown], float]
+    threshold: float
+    message: str
+
+
+def _missing(part: str) -> Callable[[ScoreBreakdown], float]:
+    return lambda breakdown: breakdown.part_missing.get(part, 0.0)
+
+
+def _error(part: str) -> Callable[[ScoreBreakdown], float]:
+    def measure(breakdown: ScoreBreakdown) -> float:
+        error = breakdown.part_errors.get(part, 0.0)
+        return 0.0 if math.isnan(error) else error
+    return measure
+
+
+# Ordered by priority: a hand out of view makes every other tip unreliable
+FEEDBACK_RULES: List[FeedbackRule] = [
+    FeedbackRule(_missing("right_hand"), PART_MISSING_THRESHOLD,
+                 "Keep your right hand inside the camera frame"),
+    FeedbackRule(_missing("left_hand"), PART_MISSING_THRESHOLD,
+                 "Keep your left hand inside the camera frame"),
+    FeedbackRule(_error("right_hand"), PART_ERROR_THRESHOLD,
+                 "Check your right hand shape against the demo"),
+    FeedbackRule(_error("left_hand"), PART_ERROR_THRESHOLD,
+                 "Check your left hand shape against the demo"),
+    FeedbackRule(_error("right_arm"), PART_ERROR_THRESHOLD,
+                 "Adjust where your right arm moves: follow the demo's path"),
+    FeedbackRule(_error("left_arm"), PART_ERROR_THRESHOLD,
+                 "Adjust where your left arm moves: follow the demo's path"),
+    FeedbackRule(lambda b: b.timing_offset, TIMING_THRESHOLD,
+                 "You are a little behind the demo: start the movement sooner"),
+    FeedbackRule(lambda b: -b.timing_offset, TIMING_THRESHOLD,
+                 "You are ahead of the demo: slow down and hold each position"),
+    FeedbackRule(_error("face"), PART_ERROR_THRESHOLD,
+                 "Face the camera and keep your facial expression with the sign"),
+    FeedbackRule(_error("torso"), PART_ERROR_THRESHOLD,
+                 "Sit or stand upright with your shoulders square to the camera"),
+]
+
+
+def generate_feedback(breakdown: ScoreBreakdown, max_tips: int = MAX_TIPS) -> List[str]:
+    """
+    Select tips for an attempt
+
+    Args:
+        breakdown: Result of `analyze_attempt`
+        max_tips: Maximum number of tips to return
+
+    Returns:
+        Tips in priority order; empty when nothing stands out
+    """
+    tips = []
+    for rule in FEEDBACK_RULES:
+        if rule.measure(breakdown) > rule.threshold:
+            tips.append(rule.message)
+            if len(tips) == max_tips:
+                break
+    return tips
+
+
+def feedback_summary(breakdown: ScoreBreakdown) -> str:
+    """One-line verdict for an attempt based on its score"""
+    if breakdown.score >= 0.9:
+        return "Excellent! Your sign closely matches the demo."
+    if breakdown.score >= 0.75:
+        return "Good job! A few details to polish."
+    if breakdown.score >= 0.5:
+        return "Getting there. Focus on the tips below."
+    return "Keep practicing. Watch the demo again and try slowly."
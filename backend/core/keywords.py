@@ -0,0 +1,120 @@
+"""
+Multi-keyword matching for short-answer grading
+
+All keywords of a rubric are compiled into one case-insensitive regex,
+an alternation factored into a trie, so an answer is scanned once and the
+cost does not grow with the number of keywords. Keywords match whole words
+only and also match their inflected and derived forms: "communication"
+matches "communicate" and "communicating", "culture" matches "cultural",
+but "deaf" does not match inside "deafening" unless that suffix is listed
+below.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Set
+
+# Endings accepted after a keyword root, longest first within each family
+SUFFIXES = (
+    "abilities", "ability", "ibilities", "ibility", "ations", "ation", "atives", "ative",
+    "ating", "ated", "ates", "ate", "ions", "ion", "ities", "ity", "ives", "ive",
+    "ally", "al", "ness", "ings", "ing", "able", "ible", "ers", "er", "ies", "ied",
+    "es", "ed", "ly", "s", "d", "e", "y",
+)
+# Shortest root left after removing a suffix from a keyword
+MIN_ROOT = 4
+
+_SUFFIX_PATTERN = "|".join(sorted(SUFFIXES, key=len, reverse=True))
+# Suffixes accepted when matching but never removed from a keyword
+# ("understand" must not become "understan")
+_MATCH_ONLY = ("d",)
+_ROOT_SUFFIXES = sorted((s for s in SUFFIXES if s not in _MATCH_ONLY), key=len, reverse=True)
+
+
+def keyword_root(word: str) -> str:
+    """Remove the longest listed suffix that leaves a root of at least MIN_ROOT letters"""
+    word = word.lower()
+    for suffix in _ROOT_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_ROOT:
+            return word[:-len(suffix)]
+    return word
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Regex for a set of strings with shared prefixes factored out
+
+    A flat alternation makes the regex engine try every keyword at every
+    position; the trie form tries each distinct next character once, so
+    matching cost does not grow with the number of keywords.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: Dict) -> str:
+        optional = "" in node
+        branches = [(r"\s+" if char == " " else re.escape(char)) + emit(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if optional:
+            body = f"(?:{body})?" if len(branches) > 1 or len(body) > 1 else body + "?"
+        return body
+
+    return emit(trie)
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    """A keyword found in a text, with its character span"""
+    keyword: str
+    start: int
+    end: int
+    text: str
+
+
+class KeywordMatcher:
+    """
+    Compiled matcher for a fixed set of keywords or phrases
+
+    Usage:
+        matcher = KeywordMatcher(["communication", "deaf culture"])
+        matcher.find("Deaf cultures value communicating clearly")
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = list(dict.fromkeys(keyword.lower().strip() for keyword in keywords))
+        self._by_root: Dict[str, str] = {}
+        for keyword in self.keywords:
+            words = keyword.split()
+            # Only the last word of a phrase is inflected
+            root = " ".join(words[:-1] + [keyword_root(words[-1])])
+            self._by_root.setdefault(root, keyword)
+
+        self._pattern = re.compile(
+            rf"\b({_trie_pattern(self._by_root)})(?:{_SUFFIX_PATTERN})?\b", re.IGNORECASE
+        ) if self._by_root else None
+
+    def find(self, text: str) -> List[KeywordMatch]:
+        """
+        Every keyword occurrence in a text, in order
+
+        Returns:
+            Matches with spans into the original text
+        """
+        if self._pattern is None:
+            return []
+        return [
+            KeywordMatch(self._by_root[" ".join(match.group(1).lower().split())],
+                         match.start(), match.end(), match.group(0))
+            for match in self._pattern.finditer(text)
+        ]
+
+    def matched_keywords(self, text: str) -> Set[str]:
+        """Distinct keywords that occur in a text"""
+        return {match.keyword for match in self.find(text)}
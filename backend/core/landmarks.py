@@ -0,0 +1,80 @@
+"""
+Landmark layout shared by the pose processing modules
+
+Sequences are arrays of shape (frames, joints, 3) in the MediaPipe Holistic
+ordering: 33 body landmarks followed by 21 left-hand and 21 right-hand
+landmarks. Landmarks that were not detected in a frame are NaN.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+NUM_BODY_JOINTS = 33
+NUM_HAND_JOINTS = 21
+NUM_JOINTS = NUM_BODY_JOINTS + 2 * NUM_HAND_JOINTS
+
+LEFT_SHOULDER = 11
+RIGHT_SHOULDER = 12
+LEFT_HIP = 23
+RIGHT_HIP = 24
+
+# Joint indices for each body part, used for weighting and feedback
+BODY_PARTS: Dict[str, np.ndarray] = {
+    "face": np.arange(0, 11),
+    "torso": np.array([LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP]),
+    "left_arm": np.array([13, 15, 17, 19, 21]),
+    "right_arm": np.array([14, 16, 18, 20, 22]),
+    "left_hand": np.arange(NUM_BODY_JOINTS, NUM_BODY_JOINTS + NUM_HAND_JOINTS),
+    "right_hand": np.arange(NUM_BODY_JOINTS + NUM_HAND_JOINTS, NUM_JOINTS),
+    "legs": np.arange(25, NUM_BODY_JOINTS),
+}
+
+# How much each body part contributes to a score. Hands carry most of the
+# meaning of a sign; legs are usually out of frame and are ignored.
+PART_WEIGHTS: Dict[str, float] = {
+    "face": 0.5,
+    "torso": 0.5,
+    "left_arm": 1.0,
+    "right_arm": 1.0,
+    "left_hand": 2.0,
+    "right_hand": 2.0,
+    "legs": 0.0,
+}
+
+
+def _build_joint_weights() -> np.ndarray:
+    weights = np.zeros(NUM_JOINTS, dtype=np.float32)
+    for part, joints in BODY_PARTS.items():
+        weights[joints] = PART_WEIGHTS[part]
+    return weights
+
+
+JOINT_WEIGHTS = _build_joint_weights()
+JOINT_WEIGHTS.setflags(write=False)
+
+
+def as_sequence(landmarks) -> np.ndarray:
+    """
+    Validate a landmark sequence and return it as a float32 array
+
+    Args:
+        landmarks: Array-like of shape (frames, joints, 3), or (joints, 3)
+            for a single frame
+
+    Returns:
+        C-contiguous float32 array of shape (frames, NUM_JOINTS, 3)
+
+    Raises:
+        ValueError: If the shape does not match the landmark layout
+    """
+    seq = np.asarray(landmarks, dtype=np.float32)
+    if seq.ndim == 2:
+        seq = seq[np.newaxis]
+    if seq.ndim != 3 or seq.shape[1:] != (NUM_JOINTS, 3):
+        raise ValueError(
+            f"Expected landmarks of shape (frames, {NUM_JOINTS}, 3), got {seq.shape}"
+        )
+    if seq.shape[0] == 0:
+        raise ValueError("Landmark sequence has no frames")
+    return np.ascontiguousarray(seq)
@@ -0,0 +1,173 @@
+"""
+Pose normalization
+
+Removes differences that have nothing to do with how well a sign was
+performed: where the learner stands, how far they are from the camera and
+how they are turned. `normalize_sequence` centres and scales every frame on
+the shoulders; `procrustes_align` then fits a per-frame similarity transform
+(rotation, scale, translation) of the attempt onto the reference. All
+frames are solved together with one batched SVD.
+
+Reference sequences never change, so their normalized form is cached.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+import numpy as np
+
+from .landmarks import BODY_PARTS, LEFT_SHOULDER, RIGHT_SHOULDER, as_sequence
+
+# Joints used to fit the similarity transform. Hands are left out on purpose:
+# they carry the sign, so their errors must not be absorbed by the fit.
+ANCHOR_JOINTS = np.concatenate([
+    BODY_PARTS["face"], BODY_PARTS["torso"], BODY_PARTS["left_arm"], BODY_PARTS["right_arm"],
+])
+
+REFERENCE_CACHE_SIZE = 256
+
+_MIN_SCALE = 1e-6
+
+
+def normalize_sequence(seq: np.ndarray) -> np.ndarray:
+    """
+    Remove translation and scale differences from a landmark sequence
+
+    Each frame is centred on the midpoint between the shoulders and divided
+    by the shoulder width. Frames where the shoulders were not detected use
+    the average centre and scale of the sequence. Works on any number of
+    leading batch dimensions; NaN padding frames stay NaN.
+
+    Args:
+        seq: Array of shape (..., frames, joints, 3)
+
+    Returns:
+        Normalized float32 array of the same shape
+    """
+    left = seq[..., LEFT_SHOULDER, :]
+    right = seq[..., RIGHT_SHOULDER, :]
+    center = (left + right) * 0.5
+    scale = np.linalg.norm(left - right, axis=-1)
+
+    valid = np.isfinite(scale) & (scale > _MIN_SCALE)
+    count = valid.sum(axis=-1, keepdims=True)
+    safe_count = np.maximum(count, 1)
+    fallback_center = np.where(valid[..., None], center, 0.0).sum(axis=-2, keepdims=True)
+    fallback_center = fallback_center / safe_count[..., None]
+    fallback_scale = np.where(valid, scale, 0.0).sum(axis=-1, keepdims=True) / safe_count
+    fallback_scale = np.where(count > 0, fallback_scale, 1.0)
+
+    center = np.where(valid[..., None], center, fallback_center)
+    scale = np.where(valid, scale, fallback_scale)
+
+    return ((seq - center[..., None, :]) / scale[..., None, None]).astype(np.float32)
+
+
+def similarity_transforms(source: np.ndarray, target: np.ndarray,
+                          joints: np.ndarray = ANCHOR_JOINTS
+                          ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fit per-frame similarity transforms mapping source poses onto target poses
+
+    Solves the Umeyama least-squares problem for every frame at once. Joints
+    missing from either pose are ignored; frames without enough joints get
+    the identity transform.
+
+    Args:
+        source: Array of shape (..., joints, 3)
+        target: Array broadcastable to the source's shape
+        joints: Joint indices used for the fit
+
+    Returns:
+        (scale (...,), rotation (..., 3, 3), translation (..., 3)) such that
+        scale * rotation @ x + translation maps source onto target
+    """
+    src = source[..., joints, :]
+    dst = np.broadcast_to(target, source.shape)[..., joints, :]
+    weights = (np.isfinite(src).all(axis=-1) & np.isfinite(dst).all(axis=-1)).astype(np.float32)
+    src = np.where(weights[..., None] > 0, src, 0.0)
+    dst = np.where(weights[..., None] > 0, dst, 0.0)
+
+    total = weights.sum(axis=-1)
+    safe_total = np.maximum(total, 1.0)[..., None]
+    src_mean = (weights[..., None] * src).sum(axis=-2) / safe_total
+    dst_mean = (weights[..., None] * dst).sum(axis=-2) / safe_total
+    src_c = (src - src_mean[..., None, :]) * weights[..., None]
+    dst_c = (dst - dst_mean[..., None, :]) * weights[..., None]
+
+    covariance = np.einsum("...ji,...jk->...ik", dst_c, src_c) / safe_total[..., None]
+    u, singular, vt = np.linalg.svd(covariance)
+    # Flip the last axis where needed so the result is a rotation, not a reflection
+    sign = np.sign(np.linalg.det(u) * np.linalg.det(vt))
+    sign = np.where(sign == 0, 1.0, sign)
+    u[..., :, 2] *= sign[..., None]
+    singular[..., 2] *= sign
+    rotation = u @ vt
+
+    variance = np.square(src_c).sum(axis=(-2, -1)) / safe_total[..., 0]
+    valid = (total >= 3) & (variance > _MIN_SCALE)
+    scale = np.where(valid, singular.sum(axis=-1) / np.where(valid, variance, 1.0), 1.0)
+    rotation = np.where(valid[..., None, None], rotation, np.eye(3, dtype=rotation.dtype))
+    translation = dst_mean - scale[..., None] * np.einsum("...ij,...j->...i", rotation, src_mean)
+    translation = np.where(valid[..., None], translation, 0.0)
+    return scale, rotation, translation
+
+
+def procrustes_align(source: np.ndarray, target: np.ndarray,
+                     joints: np.ndarray = ANCHOR_JOINTS) -> np.ndarray:
+    """
+    Align every frame of a sequence onto the matching frame of another
+
+    Args:
+        source: Array of shape (..., frames, joints, 3)
+        target: Array of the same shape, e.g. a reference sign
+        joints: Joint indices used to fit the transforms
+
+    Returns:
+        Aligned copy of source as float32
+    """
+    scale, rotation, translation = similarity_transforms(source, target, joints)
+    aligned = np.einsum("...ij,...kj->...ki", rotation, source)
+    return (scale[..., None, None] * aligned + translation[..., None, :]).astype(np.float32)
+
+
+_reference_cache: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+_reference_lock = threading.Lock()
+
+
+def prepare_reference(reference, key: Optional[Hashable] = None) -> np.ndarray:
+    """
+    Normalize a reference sequence, reusing earlier results
+
+    Args:
+        reference: Landmarks of shape (frames, joints, 3)
+        key: Optional cache key such as the sign name; defaults to a digest
+            of the landmark data
+
+    Returns:
+        Read-only normalized float32 array
+    """
+    seq = as_sequence(reference)
+    if key is None:
+        key = (seq.shape, hashlib.blake2b(seq.tobytes(), digest_size=16).digest())
+    with _reference_lock:
+        cached = _reference_cache.get(key)
+        if cached is not None:
+            _reference_cache.move_to_end(key)
+            return cached
+
+    normalized = normalize_sequence(seq)
+    normalized.setflags(write=False)
+    with _reference_lock:
+        _reference_cache[key] = normalized
+        while len(_reference_cache) > REFERENCE_CACHE_SIZE:
+            _reference_cache.popitem(last=False)
+    return normalized
+
+
+def clear_reference_cache() -> None:
+    """Forget all cached reference sequences"""
+    with _reference_lock:
+        _reference_cache.clear()
@@ -0,0 +1,194 @@
+"""
+Learning progress aggregates
+
+Per-user, per-level counters of completed modules, completed lessons and
+learning hours, updated as completion events arrive. The Modules page
+overview reads one counter record instead of recounting the learner's
+history against the catalogue, so the read is O(1) however large either
+grows.
+
+Events are idempotent: completing a module or lesson twice counts once.
+With a `SessionStore`, each completed module and lesson is persisted
+(write-behind) as its own key, so processes serving the same user add
+completions side by side instead of overwriting each other's, and the
+counters are rebuilt from them the first time the user is seen by a
+process.
+"""
+
+import threading
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Dict, Optional, Set, Tuple
+
+from .content_store import ContentStore, open_content_store
+from .session_store import SessionStore, open_session_store
+
+# Session store keys marking one completed module or lesson; a reset stores False
+MODULE_KEY = "progress/module/{module_id}"
+LESSON_KEY = "progress/lesson/{module_id}/{lesson_index}"
+_KEY_PREFIX = "progress/"
+
+
+@dataclass(frozen=True)
+class LevelProgress:
+    """Counters for one user in one level (or across all levels)"""
+    completed_modules: int = 0
+    completed_lessons: int = 0
+    hours: float = 0.0
+    total_modules: int = 0
+
+    @property
+    def percent_complete(self) -> float:
+        """Completed modules as a percentage of the modules available"""
+        if self.total_modules <= 0:
+            return 0.0
+        return min(self.completed_modules / self.total_modules * 100, 100.0)
+
+
+class ProgressAggregates:
+    """
+    Incrementally maintained progress counters
+
+    Safe to share between threads (e.g. Streamlit sessions).
+
+    Usage:
+        progress = progress_aggregates()
+        progress.complete_lesson(user_id, "mod1", 1)
+        progress.complete_module(user_id, "mod1")
+        overview = progress.level(user_id, "Beginner")
+    """
+
+    def __init__(self, store: Optional[ContentStore] = None,
+                 session_store: Optional[SessionStore] = None):
+        self.store = store or open_content_store()
+        self.session_store = session_store
+        self._levels: Dict[Tuple[str, str], LevelProgress] = {}
+        self._totals: Dict[str, LevelProgress] = {}
+        # Seen events, so repeated completions are ignored
+        self._modules: Dict[str, Set[str]] = {}
+        self._lessons: Dict[str, Set[Tuple[str, int]]] = {}
+        self._lock = threading.RLock()
+
+    def _user(self, user_id: str) -> Tuple[Set[str], Set[Tuple[str, int]]]:
+        """A user's completed modules and lessons, loaded from the session store once"""
+        with self._lock:
+            if user_id not in self._modules:
+                self._modules[user_id], self._lessons[user_id] = set(), set()
+                for key in self._saved_keys(user_id, completed=True):
+                    kind, module_id, *lesson = key[len(_KEY_PREFIX):].split("/")
+                    if kind == "module":
+                        self._record_module(user_id, module_id)
+                    elif kind == "lesson" and lesson and lesson[0].isdigit():
+                        self._record_lesson(user_id, module_id, int(lesson[0]))
+            return self._modules[user_id], self._lessons[user_id]
+
+    def _saved_keys(self, user_id: str, completed: bool) -> Set[str]:
+        """A user's progress keys in the session store, optionally only completed ones"""
+        if self.session_store is None:
+            return set()
+        return {key for key, value in self.session_store.load(user_id).items()
+                if key.startswith(_KEY_PREFIX) and (value or not completed)}
+
+    def _save(self, user_id: str, key: str, completed: bool = True) -> None:
+        if self.session_store is not None:
+            self.session_store.put(user_id, key, completed)
+
+    def _add(self, user_id: str, level: str, modules: int = 0, lessons: int = 0,
+             hours: float = 0.0) -> None:
+        for table, key in ((self._levels, (user_id, level)), (self._totals, user_id)):
+            current = table.get(key, LevelProgress())
+            table[key] = replace(
+                current,
+                completed_modules=current.completed_modules + modules,
+                completed_lessons=current.completed_lessons + lessons,
+                hours=current.hours + hours,
+            )
+
+    def complete_module(self, user_id: str, module_id: str) -> bool:
+        """
+        Record a completed module
+
+        Returns:
+            False if the module was already completed or is not in the catalogue
+        """
+        with self._lock:
+            self._user(user_id)
+            if not self._record_module(user_id, module_id):
+                return False
+            self._save(user_id, MODULE_KEY.format(module_id=module_id))
+        return True
+
+    def _record_module(self, user_id: str, module_id: str) -> bool:
+        module = self.store.module(module_id)
+        level = self.store.module_level(module_id)
+        seen = self._modules[user_id]
+        if module is None or level is None or module_id in seen:
+            return False
+        seen.add(module_id)
+        self._add(user_id, level, modules=1, hours=module["estimated_hours"])
+        return True
+
+    def complete_lesson(self, user_id: str, module_id: str, lesson_index: int) -> bool:
+        """
+        Record a completed lesson
+
+        Args:
+            user_id: Learner
+            module_id: Module the lesson belongs to
+            lesson_index: Lesson number within the module, from 1 as shown on the page
+
+        Returns:
+            False if the lesson was already completed or is not in the catalogue
+        """
+        with self._lock:
+            self._user(user_id)
+            if not self._record_lesson(user_id, module_id, lesson_index):
+                return False
+            self._save(user_id, LESSON_KEY.format(module_id=module_id, lesson_index=lesson_index))
+        return True
+
+    def _record_lesson(self, user_id: str, module_id: str, lesson_index: int) -> bool:
+        level = self.store.module_level(module_id)
+        seen = self._lessons[user_id]
+        if (level is None or (module_id, lesson_index) in seen
+                or self.store.lesson(module_id, lesson_index - 1) is None):
+            return False
+        seen.add((module_id, lesson_index))
+        self._add(user_id, level, lessons=1)
+        return True
+
+    def is_module_completed(self, user_id: str, module_id: str) -> bool:
+        """Whether the user has completed a module"""
+        return module_id in self._user(user_id)[0]
+
+    def is_lesson_completed(self, user_id: str, module_id: str, lesson_index: int) -> bool:
+        """Whether the user has completed a lesson (numbered from 1)"""
+        return (module_id, lesson_index) in self._user(user_id)[1]
+
+    def level(self, user_id: str, level: str) -> LevelProgress:
+        """Counters for one level"""
+        self._user(user_id)
+        progress = self._levels.get((user_id, level), LevelProgress())
+        return replace(progress, total_modules=self.store.count_modules(level))
+
+    def totals(self, user_id: str) -> LevelProgress:
+        """Counters across all levels"""
+        self._user(user_id)
+        progress = self._totals.get(user_id, LevelProgress())
+        return replace(progress, total_modules=self.store.count_modules())
+
+    def reset(self, user_id: str) -> None:
+        """Forget a user's progress"""
+        with self._lock:
+            self._levels = {key: value for key, value in self._levels.items() if key[0] != user_id}
+            self._totals.pop(user_id, None)
+            self._modules[user_id], self._lessons[user_id] = set(), set()
+            # Includes completions another process stored since this one loaded the user
+            for key in self._saved_keys(user_id, completed=False):
+                self._save(user_id, key, completed=False)
+
+
+@lru_cache(maxsize=None)
+def progress_aggregates() -> ProgressAggregates:
+    """The process-wide progress aggregates, persisted in the session store"""
+    return ProgressAggregates(open_content_store(), open_session_store())
@@ -0,0 +1,198 @@
+"""
+Nearest-neighbour sign recognition
+
+A landmark window is embedded into a fixed-size unit vector (normalized,
+resampled to a fixed number of frames, weighted by body part), so cosine
+similarity between embeddings compares whole movements. `SignIndex` holds
+the embeddings of every reference sign and answers top-k queries either
+exactly with one matrix product or approximately with an inverted-file
+(IVF) index that only scans the clusters closest to the query.
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .landmarks import JOINT_WEIGHTS, as_sequence
+from .normalization import normalize_sequence
+from .scoring import resample_sequence
+
+if TYPE_CHECKING:
+    from .embedding_store import BatchEmbedder
+
+EMBEDDING_FRAMES = 8
+DEFAULT_NPROBE = 4
+
+# Joints that carry weight in scoring also define the embedding
+_EMBEDDING_JOINTS = np.flatnonzero(JOINT_WEIGHTS > 0)
+_EMBEDDING_SCALE = np.sqrt(JOINT_WEIGHTS[_EMBEDDING_JOINTS])[None, :, None]
+
+EMBEDDING_DIM = EMBEDDING_FRAMES * len(_EMBEDDING_JOINTS) * 3
+# Names the embedding space, e.g. for an EmbeddingStore
+EMBEDDING_MODEL = f"sign-window-{EMBEDDING_FRAMES}-v1"
+
+
+def embed_window(window, num_frames: int = EMBEDDING_FRAMES) -> np.ndarray:
+    """
+    Embed a landmark window into a fixed-size unit vector
+
+    Args:
+        window: Landmarks of shape (frames, joints, 3), any number of frames
+        num_frames: Frames the window is resampled to
+
+    Returns:
+        float32 vector of length num_frames * joints * 3 with unit norm
+    """
+    seq = normalize_sequence(as_sequence(window))
+    seq = resample_sequence(seq, num_frames)[:, _EMBEDDING_JOINTS]
+    seq = np.nan_to_num(seq, nan=0.0)
+    # Remove the average pose so the embedding describes the movement shape
+    seq = (seq - seq.mean(axis=0, keepdims=True)) * _EMBEDDING_SCALE
+    vector = seq.reshape(-1).astype(np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+def embed_windows(windows: Sequence) -> np.ndarray:
+    """Embed several windows; usable as a `BatchEmbedder` function"""
+    if not len(windows):
+        return np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+    return np.stack([embed_window(window) for window in windows])
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores along the last axis, best first"""
+    k = min(k, scores.shape[-1])
+    part = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=-1), axis=-1)
+    return np.take_along_axis(part, order, axis=-1)
+
+
+class SignIndex:
+    """
+    Top-k index over reference sign embeddings
+
+    Usage:
+        index = SignIndex.from_library(open_sign_library())
+        index.build_ivf()
+        matches = index.search(window, k=5, exact=False)
+    """
+
+    def __init__(self, names: Sequence[str], vectors: np.ndarray):
+        if len(names) != len(vectors):
+            raise ValueError("Expected one vector per sign name")
+        self.names = list(names)
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.centroids: Optional[np.ndarray] = None
+        self.list_offsets: Optional[np.ndarray] = None
+        self.list_members: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_library(cls, library: Mapping[str, np.ndarray],
+                     batch_embedder: Optional["BatchEmbedder"] = None) -> "SignIndex":
+        """
+        Embed every sign of a reference library
+
+        Args:
+            library: Sign name to landmark sequence
+            batch_embedder: Optional `BatchEmbedder` over `embed_windows`, so
+                signs embedded before are read from its store
+        """
+        names = list(library)
+        windows = [library[name] for name in names]
+        if batch_embedder is not None:
+            return cls(names, batch_embedder.embed(windows))
+        return cls(names, embed_windows(windows))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def build_ivf(self, nlist: Optional[int] = None, iterations: int = 10, seed: int = 0) -> None:
+        """
+        Cluster the embeddings for approximate search
+
+        Uses spherical k-means; each sign is stored in the inverted list of
+        its closest centroid.
+
+        Args:
+            nlist: Number of clusters; defaults to sqrt(number of signs)
+            iterations: k-means iterations
+            seed: Random seed for the initial centroids
+        """
+        count = len(self.vectors)
+        if count == 0:
+            raise ValueError("Cannot build an IVF index without signs")
+        nlist = min(nlist or max(1, int(np.sqrt(count))), count)
+        rng = np.random.default_rng(seed)
+        centroids = self.vectors[rng.choice(count, nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignment = np.argmax(self.vectors @ centroids.T, axis=1)
+            members = np.zeros((nlist, count), dtype=np.float32)
+            members[assignment, np.arange(count)] = 1.0
+            sums = members @ self.vectors
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Keep the old centroid for clusters that lost all their members
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+
+        assignment = np.argmax(self.vectors @ centroids.T, axis=1)
+        self.centroids = centroids.astype(np.float32)
+        self.list_members = np.argsort(assignment, kind="stable").astype(np.intp)
+        self.list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=nlist))])
+
+    def search(self, query, k: int = 5, exact: bool = True,
+               nprobe: int = DEFAULT_NPROBE) -> List[Tuple[str, float]]:
+        """
+        Find the reference signs most similar to a landmark window
+
+        Args:
+            query: Landmark window of shape (frames, joints, 3) or an embedding
+            k: Number of matches to return
+            exact: Scan every sign; otherwise only the nprobe closest clusters
+            nprobe: Clusters to scan in approximate mode
+
+        Returns:
+            List of (sign name, cosine similarity), best match first
+        """
+        vector = np.asarray(query, dtype=np.float32)
+        if vector.ndim != 1:
+            vector = embed_window(vector)
+        if len(self) == 0:
+            return []
+
+        if exact or self.centroids is None:
+            scores = self.vectors @ vector
+            best = _top_k(scores, k)
+            return [(self.names[i], float(scores[i])) for i in best]
+
+        probes = _top_k(self.centroids @ vector, nprobe)
+        candidates = np.concatenate([
+            self.list_members[self.list_offsets[c]:self.list_offsets[c + 1]] for c in probes
+        ])
+        if len(candidates) == 0:
+            return []
+        scores = self.vectors[candidates] @ vector
+        best = _top_k(scores, k)
+        return [(self.names[candidates[i]], float(scores[i])) for i in best]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Persist the index, including the IVF lists if built"""
+        arrays = {"names": np.array(self.names, dtype=str), "vectors": self.vectors}
+        if self.centroids is not None:
+            arrays.update(centroids=self.centroids, list_offsets=self.list_offsets,
+                          list_members=self.list_members)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "SignIndex":
+        """Load an index written by `save`"""
+        with np.load(path) as data:
+            index = cls(data["names"].tolist(), data["vectors"])
+            if "centroids" in data:
+                index.centroids = data["centroids"]
+                index.list_offsets = data["list_offsets"]
+                index.list_members = data["list_members"]
+        return index
@@ -0,0 +1,309 @@
+"""
+Hybrid retrieval over the curriculum
+
+Indexes the lesson content and module catalogue for the chat assistant.
+Two retrievers run on every query:
+
+- BM25 over an inverted index stored in CSR form: one array of document ids
+  and one of precomputed BM25 term weights, sliced per term, so a query is a
+  few slices and one `np.bincount`.
+- Dense search: one matrix product against `HashingEmbedder` vectors.
+
+The two rankings are fused with reciprocal rank fusion. The index is built
+once, saved to `data/retrieval/` and reloaded as long as the content has
+not changed.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .embedding import HashingEmbedder
+from .embedding_store import DEFAULT_STORE_PATH, BatchEmbedder, EmbeddingStore
+from .text import tokenize
+
+DEFAULT_INDEX_PATH = Path(
+    os.environ.get(
+        "POSE2POSE_RETRIEVAL_INDEX",
+        Path(__file__).resolve().parents[2] / "data" / "retrieval",
+    )
+)
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Reciprocal rank fusion constant
+RRF_K = 60
+# Candidates taken from each retriever before fusion
+CANDIDATES = 20
+
+_ARRAYS_FILE = "index.npz"
+_DOCUMENTS_FILE = "documents.json"
+
+
+@dataclass(frozen=True)
+class Document:
+    """A searchable piece of content"""
+    doc_id: str
+    title: str
+    text: str
+    source: str
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    """A document with its fused score and rank in each retriever (None if absent)"""
+    document: Document
+    score: float
+    bm25_rank: Optional[int]
+    dense_rank: Optional[int]
+
+
+def curriculum_documents() -> List[Document]:
+    """
+    Split the curriculum into documents
+
+    Covers lesson transcripts, key points, feedback tips and quiz
+    explanations, plus each module's description and skills.
+    """
+    from .content_store import open_content_store
+
+    store = open_content_store()
+    documents = []
+    for lesson_type in store.lesson_types():
+        content = store.lesson_content(lesson_type)
+        source = f"{lesson_type} lesson"
+        if "transcript" in content:
+            documents.append(Document(f"{lesson_type}:transcript", f"{lesson_type} lesson transcript",
+                                      " ".join(content["transcript"].split()), source))
+        for idx, point in enumerate(content.get("key_points", [])):
+            documents.append(Document(f"{lesson_type}:key_point:{idx}", "Key point", point, source))
+        for idx, tip in enumerate(content.get("feedback_tips", [])):
+            documents.append(Document(f"{lesson_type}:tip:{idx}",
+                                      f"Tip for signing {content.get('sign_name', '')}".strip(),
+                                      tip, source))
+        for idx, question in enumerate(content.get("questions", [])):
+            answer = question["options"][question["correct"]]
+            documents.append(Document(
+                f"{lesson_type}:quiz:{idx}", question["question"],
+                f"Answer: {answer}. {question['explanation']}", source,
+            ))
+
+    for level, module in store.iter_modules():
+        lessons = ", ".join(lesson["title"] for lesson in module["lessons"])
+        documents.append(Document(
+            f"module:{module['id']}", module["title"],
+            f"{module['description']} Skills: {', '.join(module['skills'])}. "
+            f"Lessons: {lessons}.",
+            f"{level} module",
+        ))
+    return documents
+
+
+def _fingerprint(documents: Sequence[Document], embedder: HashingEmbedder) -> str:
+    digest = hashlib.blake2b(embedder.name.encode(), digest_size=16)
+    for document in documents:
+        digest.update(json.dumps(asdict(document), sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class BM25Index:
+    """
+    Inverted index with precomputed BM25 weights
+
+    Postings for term t are doc_ids[indptr[t]:indptr[t + 1]] with weights
+    in the same slice of `weights`.
+    """
+
+    def __init__(self, vocabulary: Dict[str, int], indptr: np.ndarray,
+                 doc_ids: np.ndarray, weights: np.ndarray, num_docs: int):
+        self.vocabulary = vocabulary
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.num_docs = num_docs
+
+    @classmethod
+    def build(cls, token_lists: Sequence[List[str]], k1: float = BM25_K1,
+              b: float = BM25_B) -> "BM25Index":
+        """Build the index from the tokens of each document"""
+        vocabulary: Dict[str, int] = {}
+        rows, terms, counts = [], [], []
+        for doc, tokens in enumerate(token_lists):
+            term_counts: Dict[int, int] = {}
+            for token in tokens:
+                term = vocabulary.setdefault(token, len(vocabulary))
+                term_counts[term] = term_counts.get(term, 0) + 1
+            rows.extend([doc] * len(term_counts))
+            terms.extend(term_counts)
+            counts.extend(term_counts.values())
+
+        num_docs = len(token_lists)
+        rows = np.asarray(rows, dtype=np.int32)
+        terms = np.asarray(terms, dtype=np.int32)
+        tf = np.asarray(counts, dtype=np.float32)
+
+        lengths = np.array([len(tokens) for tokens in token_lists], dtype=np.float32)
+        avg_length = lengths.mean() if num_docs else 1.0
+        doc_freq = np.bincount(terms, minlength=len(vocabulary)).astype(np.float32)
+        idf = np.log1p((num_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+        norm = k1 * (1.0 - b + b * lengths[rows] / max(avg_length, 1e-6))
+        weights = idf[terms] * tf * (k1 + 1.0) / (tf + norm)
+
+        order = np.argsort(terms, kind="stable")
+        indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(doc_freq.astype(np.int64), out=indptr[1:])
+        return cls(vocabulary, indptr, rows[order], weights[order].astype(np.float32), num_docs)
+
+    def scores(self, tokens: Sequence[str]) -> np.ndarray:
+        """BM25 score of every document for the query tokens"""
+        terms = [self.vocabulary[token] for token in set(tokens) if token in self.vocabulary]
+        if not terms:
+            return np.zeros(self.num_docs, dtype=np.float32)
+        slices = [slice(self.indptr[term], self.indptr[term + 1]) for term in terms]
+        doc_ids = np.concatenate([self.doc_ids[s] for s in slices])
+        weights = np.concatenate([self.weights[s] for s in slices])
+        return np.bincount(doc_ids, weights=weights, minlength=self.num_docs).astype(np.float32)
+
+
+def _ranked(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k best positive scores, best first"""
+    k = min(k, len(scores))
+    if k == 0:
+        return np.zeros(0, dtype=np.intp)
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return top[scores[top] > 0]
+
+
+class RetrievalIndex:
+    """
+    BM25 + dense hybrid index over a fixed set of documents
+
+    Usage:
+        index = load_retrieval_index()
+        for result in index.search("why do facial expressions matter"):
+            print(result.document.title, result.score)
+    """
+
+    def __init__(self, documents: List[Document], bm25: BM25Index, vectors: np.ndarray,
+                 embedder: Optional[HashingEmbedder] = None, fingerprint: str = ""):
+        self.documents = documents
+        self.bm25 = bm25
+        self.vectors = vectors
+        self.embedder = embedder or HashingEmbedder(vectors.shape[1])
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, documents: Sequence[Document],
+              embedder: Optional[HashingEmbedder] = None,
+              batch_embedder: Optional[BatchEmbedder] = None) -> "RetrievalIndex":
+        """
+        Tokenize and embed the documents
+
+        Args:
+            documents: Documents to index
+            embedder: Text embedder; defaults to HashingEmbedder()
+            batch_embedder: Optional `BatchEmbedder` over the embedder, so
+                unchanged documents are read from its store
+        """
+        documents = list(documents)
+        embedder = embedder or HashingEmbedder()
+        texts = [f"{document.title}. {document.text}" for document in documents]
+        bm25 = BM25Index.build([tokenize(text) for text in texts])
+        vectors = batch_embedder.embed(texts) if batch_embedder else embedder.embed(texts)
+        return cls(documents, bm25, vectors, embedder, _fingerprint(documents, embedder))
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def search(self, query: str, k: int = 5, candidates: int = CANDIDATES) -> List[SearchResult]:
+        """
+        Find the documents most relevant to a query
+
+        Args:
+            query: Free text question
+            k: Number of results
+            candidates: Results taken from each retriever before fusion
+
+        Returns:
+            Up to k results, best first
+        """
+        bm25_top = _ranked(self.bm25.scores(tokenize(query)), candidates)
+        dense_top = _ranked(self.vectors @ self.embedder.embed_one(query), candidates)
+
+        bm25_rank = {int(doc): rank for rank, doc in enumerate(bm25_top)}
+        dense_rank = {int(doc): rank for rank, doc in enumerate(dense_top)}
+        fused = {
+            doc: sum(1.0 / (RRF_K + 1 + ranks[doc]) for ranks in (bm25_rank, dense_rank)
+                     if doc in ranks)
+            for doc in bm25_rank.keys() | dense_rank.keys()
+        }
+        best = sorted(fused, key=lambda doc: (-fused[doc], doc))[:k]
+        return [
+            SearchResult(self.documents[doc], fused[doc], bm25_rank.get(doc), dense_rank.get(doc))
+            for doc in best
+        ]
+
+    def save(self, directory: Union[str, Path]) -> None:
+        """Persist the index as an .npz of arrays plus a JSON document list"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        terms = sorted(self.bm25.vocabulary, key=self.bm25.vocabulary.get)
+        with open(directory / _ARRAYS_FILE, "wb") as f:
+            np.savez(f, terms=np.array(terms, dtype=str), indptr=self.bm25.indptr,
+                     doc_ids=self.bm25.doc_ids, weights=self.bm25.weights, vectors=self.vectors)
+        meta = {
+            "fingerprint": self.fingerprint,
+            "embedder_dim": self.embedder.dim,
+            "documents": [asdict(document) for document in self.documents],
+        }
+        tmp = directory / (_DOCUMENTS_FILE + ".tmp")
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, directory / _DOCUMENTS_FILE)
+
+    @classmethod
+    def load(cls, directory: Union[str, Path]) -> "RetrievalIndex":
+        """Load an index written by `save`"""
+        directory = Path(directory)
+        meta = json.loads((directory / _DOCUMENTS_FILE).read_text(encoding="utf-8"))
+        documents = [Document(**document) for document in meta["documents"]]
+        with np.load(directory / _ARRAYS_FILE) as data:
+            vocabulary = {term: idx for idx, term in enumerate(data["terms"].tolist())}
+            bm25 = BM25Index(vocabulary, data["indptr"], data["doc_ids"], data["weights"],
+                             len(documents))
+            vectors = data["vectors"]
+        return cls(documents, bm25, vectors, HashingEmbedder(meta["embedder_dim"]),
+                   meta["fingerprint"])
+
+
+@lru_cache(maxsize=None)
+def load_retrieval_index(path: Union[str, Path, None] = None) -> RetrievalIndex:
+    """
+    Load the curriculum index once per process
+
+    Rebuilds and saves the index when it is missing or the curriculum has
+    changed since it was written; only new or edited documents are
+    embedded again.
+    """
+    directory = Path(path or DEFAULT_INDEX_PATH)
+    documents = curriculum_documents()
+    expected = _fingerprint(documents, HashingEmbedder())
+    try:
+        index = RetrievalIndex.load(directory)
+        if index.fingerprint == expected:
+            return index
+    except (OSError, ValueError, KeyError):
+        pass
+    embedder = HashingEmbedder()
+    store = EmbeddingStore(DEFAULT_STORE_PATH / embedder.name, embedder.dim, embedder.name)
+    with BatchEmbedder(embedder.embed, store) as batch_embedder:
+        index = RetrievalIndex.build(documents, embedder, batch_embedder)
+    index.save(directory)
+    return index
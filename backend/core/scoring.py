@@ -0,0 +1,349 @@
+"""
+Pose similarity scoring
+
+Scores a learner's attempt against a reference sign. Both sequences are
+normalized to a body-centred frame, the attempt is resampled onto the
+reference timeline and aligned to it frame by frame with a similarity
+transform, and every joint of every frame is compared in a single
+vectorized pass. Many attempts can be scored at once with `score_batch`.
+
+`analyze_attempt` returns the score together with a `ScoreBreakdown`
+(per-body-part error, timing offset, worst frames) taken from the same
+pass, which `feedback.py` turns into tips.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .landmarks import BODY_PARTS, JOINT_WEIGHTS, PART_WEIGHTS, as_sequence
+from .normalization import normalize_sequence, prepare_reference, procrustes_align
+
+# Joint distance (in shoulder widths) at which a joint's similarity drops to ~0.6
+DEFAULT_TOLERANCE = 0.2
+
+# Number of lowest-scoring frames reported in a breakdown
+WORST_FRAMES = 3
+
+# Body parts reported in a breakdown and their joint membership matrix
+FEEDBACK_PARTS = tuple(part for part, weight in PART_WEIGHTS.items() if weight > 0)
+_PART_MATRIX = np.zeros((JOINT_WEIGHTS.shape[0], len(FEEDBACK_PARTS)), dtype=np.float32)
+for _column, _part in enumerate(FEEDBACK_PARTS):
+    _PART_MATRIX[BODY_PARTS[_part], _column] = 1.0
+_HAND_PARTS = np.stack([BODY_PARTS["left_hand"], BODY_PARTS["right_hand"]])
+
+
+def resample_sequence(seq: np.ndarray, num_frames: int) -> np.ndarray:
+    """
+    Linearly resample a sequence to a given number of frames
+
+    Args:
+        seq: Array of shape (frames, joints, 3)
+        num_frames: Target number of frames
+
+    Returns:
+        Array of shape (num_frames, joints, 3)
+    """
+    length = seq.shape[0]
+    if length == num_frames:
+        return seq
+    positions = np.linspace(0.0, length - 1, num_frames, dtype=np.float32)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, length - 1)
+    frac = (positions - lower)[:, None, None]
+    return seq[lower] * (1.0 - frac) + seq[upper] * frac
+
+
+def similarity(attempt: np.ndarray, reference: np.ndarray,
+               tolerance: float = DEFAULT_TOLERANCE) -> np.ndarray:
+    """
+    Per-joint similarity between two aligned, normalized sequences
+
+    Works on any number of leading batch dimensions.
+
+    Args:
+        attempt: Array of shape (..., frames, joints, 3)
+        reference: Array broadcastable to the attempt's shape
+        tolerance: Distance at which similarity drops to ~0.6
+
+    Returns:
+        Array of shape (..., frames, joints) with values in [0, 1]. Joints
+        missing from the attempt score 0; joints missing from the reference
+        are NaN so callers can exclude them.
+    """
+    dist = np.linalg.norm(attempt - reference, axis=-1)
+    return _distance_similarity(dist, np.isnan(reference).any(axis=-1), tolerance)
+
+
+def _distance_similarity(dist: np.ndarray, reference_missing: np.ndarray,
+                         tolerance: float) -> np.ndarray:
+    sim = np.exp(-0.5 * np.square(dist / tolerance))
+    sim = np.where(np.isfinite(sim), sim, 0.0)
+    return np.where(reference_missing, np.nan, sim).astype(np.float32)
+
+
+def weighted_score(sim: np.ndarray, frame_mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Reduce per-joint similarity to one score per sequence
+
+    Args:
+        sim: Array of shape (..., frames, joints) from `similarity`
+        frame_mask: Optional boolean array of shape (..., frames) marking the
+            frames that take part in the score
+
+    Returns:
+        Array of shape (...) with scores in [0, 1]
+    """
+    weights = np.where(np.isnan(sim), 0.0, JOINT_WEIGHTS)
+    if frame_mask is not None:
+        weights = weights * frame_mask[..., None]
+    total = weights.sum(axis=(-2, -1))
+    hits = (np.nan_to_num(sim) * weights).sum(axis=(-2, -1))
+    return np.divide(hits, total, out=np.zeros_like(total), where=total > 0)
+
+
+@dataclass(frozen=True)
+class PaddedSequences:
+    """Normalized sequences padded with NaN frames to a common length"""
+    data: np.ndarray
+    lengths: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+
+@dataclass(frozen=True)
+class ScoreBreakdown:
+    """
+    Where an attempt differed from its reference
+
+    Attributes:
+        score: Overall score between 0.0 and 1.0
+        part_errors: Mean joint distance per body part, in shoulder widths,
+            over the joints detected in both sequences (NaN if none were)
+        part_missing: Fraction of each body part's joints that the reference
+            shows but were not detected in the attempt
+        timing_offset: How far the attempt's hand movement lags the
+            reference, as a fraction of the sign's duration; negative when
+            the attempt is early
+        worst_frames: Reference frame indices with the lowest scores
+    """
+    score: float
+    part_errors: Dict[str, float]
+    part_missing: Dict[str, float]
+    timing_offset: float
+    worst_frames: Tuple[int, ...]
+
+
+def pad_sequences(sequences: Sequence, normalized: bool = False) -> PaddedSequences:
+    """
+    Validate, normalize and pad sequences of different lengths
+
+    Args:
+        sequences: Landmark arrays of shape (frames, joints, 3)
+        normalized: The sequences are already normalized
+
+    Returns:
+        PaddedSequences with data of shape (count, max_frames, joints, 3)
+    """
+    seqs = [as_sequence(seq) for seq in sequences]
+    if not seqs:
+        raise ValueError("No sequences to pad")
+    lengths = np.array([seq.shape[0] for seq in seqs], dtype=np.intp)
+    data = np.full((len(seqs), lengths.max()) + seqs[0].shape[1:], np.nan, dtype=np.float32)
+    for row, seq in zip(data, seqs):
+        row[:seq.shape[0]] = seq
+    return PaddedSequences(data if normalized else normalize_sequence(data), lengths)
+
+
+def _hand_centres(seq: np.ndarray) -> np.ndarray:
+    """Path of each hand's centre with its mean removed, shape (pairs, frames, 2, 3)"""
+    hands = seq[..., _HAND_PARTS, :]
+    detected = np.isfinite(hands).all(axis=-1, keepdims=True)
+    count = detected.sum(axis=-2)
+    centre = np.where(detected, hands, 0.0).sum(axis=-2) / np.maximum(count, 1)
+    seen = count > 0
+    frames = np.maximum(seen.sum(axis=1, keepdims=True), 1)
+    mean = np.where(seen, centre, 0.0).sum(axis=1, keepdims=True) / frames
+    return np.where(seen, centre - mean, np.nan)
+
+
+def _timing_offsets(attempt: np.ndarray, reference: np.ndarray,
+                    lengths: np.ndarray) -> np.ndarray:
+    """Frame lag that best lines up the hands, as a fraction of each length"""
+    # Compare the shape of the hand paths, not where the hands are held
+    attempt_hands, reference_hands = _hand_centres(attempt), _hand_centres(reference)
+    num_frames = attempt.shape[1]
+    max_lag = max(1, num_frames // 4)
+
+    # Window k pairs attempt frame t + k - max_lag with reference frame t
+    padded = np.pad(attempt_hands, ((0, 0), (max_lag, max_lag), (0, 0), (0, 0)),
+                    constant_values=np.nan)
+    shifted = np.moveaxis(sliding_window_view(padded, num_frames, axis=1), -1, 2)
+    error = np.square(shifted - reference_hands[:, None]).sum(axis=-1)
+    valid = np.isfinite(error)
+    count = valid.sum(axis=(2, 3))
+    costs = np.where(valid, error, 0.0).sum(axis=(2, 3)) / np.maximum(count, 1)
+    # Require the shifted sequences to still overlap for most of the sign
+    costs = np.where(count * 2 >= lengths[:, None] * len(_HAND_PARTS), costs, np.inf)
+
+    best = costs.argmin(axis=1)
+    rows = np.arange(len(lengths))
+    # Only report a lag when it fits clearly better than no lag
+    best = np.where(costs[rows, best] < costs[:, max_lag] * 0.8, best - max_lag, 0)
+    return best / np.maximum(lengths - 1, 1)
+
+
+def _breakdowns(scores: np.ndarray, dist: np.ndarray, sim: np.ndarray,
+                reference_missing: np.ndarray, frame_mask: np.ndarray,
+                attempt: np.ndarray, reference: np.ndarray,
+                lengths: np.ndarray) -> list:
+    """Build a ScoreBreakdown per pair from arrays of the scoring pass"""
+    in_frame = frame_mask[..., None]
+    detected = np.isfinite(dist) & in_frame
+    shown = ~reference_missing & in_frame
+    error_sum = np.where(detected, dist, 0.0).sum(axis=1) @ _PART_MATRIX
+    error_count = detected.sum(axis=1, dtype=np.float32) @ _PART_MATRIX
+    shown_count = shown.sum(axis=1, dtype=np.float32) @ _PART_MATRIX
+    missing_count = shown_count - error_count
+    part_errors = np.where(error_count > 0, error_sum / np.maximum(error_count, 1), np.nan)
+    part_missing = np.where(shown_count > 0, missing_count / np.maximum(shown_count, 1), 0.0)
+
+    weights = np.where(np.isnan(sim), 0.0, JOINT_WEIGHTS)
+    frame_total = weights.sum(axis=-1)
+    frame_scores = (np.nan_to_num(sim) * weights).sum(axis=-1) / np.maximum(frame_total, 1e-12)
+    frame_scores = np.where(frame_mask & (frame_total > 0), frame_scores, np.inf)
+    worst = np.argsort(frame_scores, axis=1, kind="stable")[:, :WORST_FRAMES]
+
+    offsets = _timing_offsets(attempt, reference, lengths)
+    return [
+        ScoreBreakdown(
+            score=float(scores[pair]),
+            part_errors=dict(zip(FEEDBACK_PARTS, part_errors[pair].tolist())),
+            part_missing=dict(zip(FEEDBACK_PARTS, part_missing[pair].tolist())),
+            timing_offset=float(offsets[pair]),
+            worst_frames=tuple(sorted(int(frame) for frame in worst[pair]
+                                      if np.isfinite(frame_scores[pair, frame]))),
+        )
+        for pair in range(len(scores))
+    ]
+
+
+def _score_pairs(attempts: PaddedSequences, references: PaddedSequences,
+                 attempt_idx: np.ndarray, reference_idx: np.ndarray,
+                 tolerance: float, details: bool = False):
+    """
+    Score attempt/reference index pairs in one vectorized pass
+
+    Returns the scores, or (scores, breakdowns) when details is set.
+    """
+    attempt_len = attempts.lengths[attempt_idx]
+    reference_len = references.lengths[reference_idx]
+    num_frames = references.data.shape[1]
+
+    # Resample each attempt onto the timeline of its reference
+    frame = np.arange(num_frames, dtype=np.float32)
+    step = (attempt_len - 1) / np.maximum(reference_len - 1, 1)
+    positions = np.minimum(frame * step[:, None].astype(np.float32), (attempt_len - 1)[:, None])
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, (attempt_len - 1)[:, None])
+    frac = (positions - lower)[..., None, None]
+    rows = attempt_idx[:, None]
+    resampled = attempts.data[rows, lower] * (1.0 - frac) + attempts.data[rows, upper] * frac
+
+    target = references.data[reference_idx]
+    resampled = procrustes_align(resampled, target)
+
+    frame_mask = frame[None, :] < reference_len[:, None]
+    dist = np.linalg.norm(resampled - target, axis=-1)
+    reference_missing = np.isnan(target).any(axis=-1)
+    sim = _distance_similarity(dist, reference_missing, tolerance)
+    scores = weighted_score(sim, frame_mask)
+    if not details:
+        return scores
+    return scores, _breakdowns(scores, dist, sim, reference_missing, frame_mask,
+                               resampled, target, reference_len)
+
+
+def score_batch(attempts: Sequence, references, targets: Optional[Sequence[int]] = None,
+                tolerance: float = DEFAULT_TOLERANCE) -> np.ndarray:
+    """
+    Score many attempts of different lengths in a single pass
+
+    Args:
+        attempts: N landmark arrays of shape (frames, joints, 3)
+        references: M landmark arrays, or a PaddedSequences from `pad_sequences`
+            so that a fixed reference set is only normalized once
+        targets: Optional reference index for each attempt. When omitted every
+            attempt is scored against every reference.
+
+    Returns:
+        Array of shape (N,) when targets are given, otherwise (N, M)
+    """
+    if not isinstance(references, PaddedSequences):
+        references = pad_sequences([prepare_reference(r) for r in references], normalized=True)
+    padded = pad_sequences(attempts)
+
+    if targets is not None:
+        reference_idx = np.asarray(targets, dtype=np.intp)
+        if reference_idx.shape != (len(padded),):
+            raise ValueError("Expected one target per attempt")
+        attempt_idx = np.arange(len(padded))
+        return _score_pairs(padded, references, attempt_idx, reference_idx, tolerance)
+
+    attempt_idx, reference_idx = np.divmod(np.arange(len(padded) * len(references)), len(references))
+    scores = _score_pairs(padded, references, attempt_idx, reference_idx, tolerance)
+    return scores.reshape(len(padded), len(references))
+
+
+def score_attempt(attempt, reference, tolerance: float = DEFAULT_TOLERANCE,
+                  warp: bool = False) -> float:
+    """
+    Score a learner's attempt against a reference sign
+
+    Args:
+        attempt: Landmarks of shape (frames, joints, 3)
+        reference: Landmarks of shape (frames, joints, 3); lengths may differ
+        tolerance: Distance in shoulder widths at which a joint's
+            similarity drops to ~0.6
+        warp: Align the attempt with DTW instead of resampling it linearly,
+            so signing faster or slower in parts is not penalized
+
+    Returns:
+        Score between 0.0 and 1.0
+    """
+    if warp:
+        from .alignment import warp_to_reference
+        attempt = warp_to_reference(attempt, reference)
+    return float(score_batch([attempt], [reference], targets=[0], tolerance=tolerance)[0])
+
+
+def analyze_attempt(attempt, reference, tolerance: float = DEFAULT_TOLERANCE,
+                    warp: bool = False) -> ScoreBreakdown:
+    """
+    Score an attempt and report where it differed from the reference
+
+    Same cost as `score_attempt` apart from a few reductions over arrays the
+    scoring pass already holds.
+
+    Args:
+        attempt: Landmarks of shape (frames, joints, 3)
+        reference: Landmarks of shape (frames, joints, 3); lengths may differ
+        tolerance: Distance in shoulder widths at which a joint's
+            similarity drops to ~0.6
+        warp: Align the attempt with DTW first; the timing offset is then
+            measured after warping and is usually close to 0
+
+    Returns:
+        ScoreBreakdown whose score equals `score_attempt` for the same input
+    """
+    if warp:
+        from .alignment import warp_to_reference
+        attempt = warp_to_reference(attempt, reference)
+    references = pad_sequences([prepare_reference(reference)], normalized=True)
+    _, breakdowns = _score_pairs(pad_sequences([attempt]), references,
+                                 np.zeros(1, dtype=np.intp), np.zeros(1, dtype=np.intp),
+                                 tolerance, details=True)
+    return breakdowns[0]
@@ -0,0 +1,219 @@
+"""
+Persistent learner state
+
+Key-value state per user (profile, lesson progress, assessment results)
+in a SQLite database in WAL mode, so several server processes can read
+and write the same users concurrently and state survives restarts.
+
+Writes are write-behind: `put` only records the value in memory, and a
+background thread writes everything pending in one transaction every
+`flush_interval` seconds (or sooner once `max_pending` values are queued).
+A page rerun therefore never waits on the disk. Repeated writes to the
+same key between flushes are coalesced.
+
+Every value carries the time it was put; a flush never replaces a newer
+value written by another process with an older one.
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+DEFAULT_SESSION_PATH = Path(
+    os.environ.get(
+        "POSE2POSE_SESSION_STORE",
+        Path(__file__).resolve().parents[2] / "data" / "sessions.sqlite",
+    )
+)
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_MAX_PENDING = 512
+# How long a writer waits for another process's transaction
+BUSY_TIMEOUT_MS = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_state (
+    user_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (user_id, key)
+) WITHOUT ROWID
+"""
+_UPSERT = """
+INSERT INTO user_state (user_id, key, value, updated) VALUES (?, ?, ?, ?)
+ON CONFLICT (user_id, key) DO UPDATE SET value = excluded.value, updated = excluded.updated
+WHERE excluded.updated >= user_state.updated
+"""
+
+
+class SessionStore:
+    """
+    Write-behind user state store
+
+    Values must be JSON-serializable. Safe to share between threads.
+
+    Usage:
+        store = open_session_store()
+        store.put(user_id, "user_profile", profile)
+        state = store.load(user_id)
+    """
+
+    def __init__(self, path: Union[str, Path], flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 max_pending: int = DEFAULT_MAX_PENDING):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._connection = sqlite3.connect(self.path, check_same_thread=False,
+                                           timeout=BUSY_TIMEOUT_MS / 1000)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL skips the fsync per commit: a commit survives a
+        # crash of the process and can only be lost on power failure
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(_SCHEMA)
+        self._connection.commit()
+        self._db_lock = threading.Lock()
+
+        self._pending: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        # Values taken by a flush that is still writing them
+        self._flushing: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self.puts = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self._thread = threading.Thread(target=self._run, name="session-store", daemon=True)
+        self._thread.start()
+
+    def put(self, user_id: str, key: str, value: Any) -> None:
+        """Queue a value to be written; returns without touching the disk"""
+        if self._closed:
+            raise RuntimeError("SessionStore is closed")
+        encoded = json.dumps(value)
+        with self._pending_lock:
+            self._pending[(user_id, key)] = (encoded, time.time())
+            self.puts += 1
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wake.set()
+
+    def get(self, user_id: str, key: str, default: Any = None) -> Any:
+        """Latest value of one key, including values not flushed yet"""
+        with self._pending_lock:
+            pending = self._pending.get((user_id, key)) or self._flushing.get((user_id, key))
+        if pending is not None:
+            return json.loads(pending[0])
+        with self._db_lock:
+            row = self._connection.execute(
+                "SELECT value FROM user_state WHERE user_id = ? AND key = ?", (user_id, key)
+            ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def load(self, user_id: str) -> Dict[str, Any]:
+        """Every stored key of a user, including values not flushed yet"""
+        with self._db_lock:
+            rows = self._connection.execute(
+                "SELECT key, value FROM user_state WHERE user_id = ?", (user_id,)
+            ).fetchall()
+        state = {key: value for key, value in rows}
+        with self._pending_lock:
+            for unwritten in (self._flushing, self._pending):
+                state.update({key: value for (user, key), (value, _) in unwritten.items()
+                              if user == user_id})
+        return {key: json.loads(value) for key, value in state.items()}
+
+    def delete(self, user_id: str) -> None:
+        """Remove a user's state, including pending writes"""
+        # Waits for a flush in progress, which could otherwise write the
+        # user's values back after the delete
+        with self._flush_lock:
+            with self._pending_lock:
+                self._pending = {key: value for key, value in self._pending.items()
+                                 if key[0] != user_id}
+                self._flushing = {key: value for key, value in self._flushing.items()
+                                  if key[0] != user_id}
+            with self._db_lock, self._connection:
+                self._connection.execute("DELETE FROM user_state WHERE user_id = ?", (user_id,))
+
+    def flush(self) -> int:
+        """
+        Write every pending value now
+
+        Returns:
+            Number of values written
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+                self._flushing = pending
+            if not pending:
+                return 0
+            rows = [(user_id, key, value, updated)
+                    for (user_id, key), (value, updated) in pending.items()]
+            try:
+                with self._db_lock, self._connection:
+                    self._connection.executemany(_UPSERT, rows)
+            except sqlite3.Error:
+                # Keep the values for the next flush unless they were put again meanwhile
+                with self._pending_lock:
+                    for key, value in pending.items():
+                        self._pending.setdefault(key, value)
+                raise
+            finally:
+                with self._pending_lock:
+                    self._flushing = {}
+            self.flushes += 1
+            self.rows_written += len(rows)
+            return len(rows)
+
+    def stats(self) -> Dict[str, int]:
+        """Puts, flushes and rows written so far, and values pending"""
+        return {
+            "puts": self.puts,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "pending": len(self._pending),
+        }
+
+    def close(self) -> None:
+        """Flush pending values and stop the background writer"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+        self._connection.close()
+
+    def __enter__(self) -> "SessionStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # Database busy or unavailable: retry on the next tick
+                pass
+
+
+@lru_cache(maxsize=None)
+def open_session_store(path: Union[str, Path, None] = None) -> SessionStore:
+    """The process-wide session store; flushed when the process exits"""
+    store = SessionStore(path or DEFAULT_SESSION_PATH)
+    atexit.register(store.close)
+    return store
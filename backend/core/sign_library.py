@@ -0,0 +1,171 @@
+"""
+Memory-mapped reference sign library
+
+All reference trajectories live in one file: a fixed header, an index with
+one (name, offset, length) record per sign, and a single contiguous float32
+block of landmarks. Readers map the file with `numpy.memmap`, so opening it
+parses nothing and every server process shares the same physical pages
+through the OS page cache.
+
+File layout (little endian):
+    0         header      HEADER_DTYPE
+    64        index       INDEX_DTYPE x num_signs
+    aligned   landmarks   float32 x (total_frames, num_joints, 3)
+"""
+
+import os
+from collections.abc import Mapping
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, Mapping as MappingType, Optional, Union
+
+import numpy as np
+
+from .landmarks import NUM_JOINTS, as_sequence
+
+MAGIC = b"P2PSIGN1"
+VERSION = 1
+MAX_NAME_BYTES = 64
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("num_signs", "<u4"),
+    ("num_joints", "<u4"),
+    ("reserved", "<u4"),
+    ("total_frames", "<u8"),
+    ("data_offset", "<u8"),
+])
+INDEX_DTYPE = np.dtype([
+    ("name", f"S{MAX_NAME_BYTES}"),
+    ("offset", "<u8"),
+    ("length", "<u8"),
+])
+
+_INDEX_OFFSET = 64
+_ALIGNMENT = 64
+
+DEFAULT_LIBRARY_PATH = Path(
+    os.environ.get(
+        "POSE2POSE_SIGN_LIBRARY",
+        Path(__file__).resolve().parents[2] / "data" / "sign_library.bin",
+    )
+)
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def write_sign_library(path: Union[str, Path], signs: MappingType[str, np.ndarray]) -> Path:
+    """
+    Write reference trajectories to a library file
+
+    The file is written next to the destination and renamed into place, so
+    processes that already mapped the old file keep a consistent view.
+
+    Args:
+        path: Destination file
+        signs: Mapping of sign name to landmarks of shape (frames, joints, 3)
+
+    Returns:
+        Path of the written library
+    """
+    path = Path(path)
+    sequences = {name: as_sequence(seq) for name, seq in signs.items()}
+
+    index = np.zeros(len(sequences), dtype=INDEX_DTYPE)
+    offset = 0
+    for row, (name, seq) in zip(index, sequences.items()):
+        encoded = name.encode("utf-8")
+        if len(encoded) > MAX_NAME_BYTES:
+            raise ValueError(f"Sign name longer than {MAX_NAME_BYTES} bytes: {name}")
+        row["name"] = encoded
+        row["offset"] = offset
+        row["length"] = seq.shape[0]
+        offset += seq.shape[0]
+
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header["magic"] = MAGIC
+    header["version"] = VERSION
+    header["num_signs"] = len(sequences)
+    header["num_joints"] = NUM_JOINTS
+    header["total_frames"] = offset
+    header["data_offset"] = _aligned(_INDEX_OFFSET + index.nbytes)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header.tobytes().ljust(_INDEX_OFFSET, b"\0"))
+        f.write(index.tobytes())
+        f.seek(int(header["data_offset"][0]))
+        for seq in sequences.values():
+            f.write(seq.astype("<f4", copy=False).tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return path
+
+
+class SignLibrary(Mapping):
+    """
+    Read-only, memory-mapped view of a sign library file
+
+    Behaves like a mapping of sign name to a read-only landmark array of
+    shape (frames, joints, 3). The arrays are views into the mapped file;
+    nothing is copied until a caller modifies or pads them.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        raw = np.memmap(self.path, dtype=np.uint8, mode="r")
+        header = raw[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)[0]
+        if header["magic"] != MAGIC or header["version"] != VERSION:
+            raise ValueError(f"Not a sign library file: {self.path}")
+
+        num_signs = int(header["num_signs"])
+        self.num_joints = int(header["num_joints"])
+        self.total_frames = int(header["total_frames"])
+        self.index = raw[_INDEX_OFFSET:_INDEX_OFFSET + num_signs * INDEX_DTYPE.itemsize].view(INDEX_DTYPE)
+
+        data_offset = int(header["data_offset"])
+        data_bytes = self.total_frames * self.num_joints * 3 * 4
+        self.landmarks = raw[data_offset:data_offset + data_bytes].view("<f4").reshape(
+            self.total_frames, self.num_joints, 3
+        )
+        self._positions: Optional[Dict[str, int]] = None
+
+    def _lookup(self) -> Dict[str, int]:
+        if self._positions is None:
+            self._positions = {
+                name.decode("utf-8"): idx for idx, name in enumerate(self.index["name"])
+            }
+        return self._positions
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        entry = self.index[self._lookup()[name]]
+        start = int(entry["offset"])
+        return self.landmarks[start:start + int(entry["length"])]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._lookup())
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, name) -> bool:
+        return name in self._lookup()
+
+
+@lru_cache(maxsize=None)
+def open_sign_library(path: Union[str, Path, None] = None) -> SignLibrary:
+    """
+    Open a sign library once per process
+
+    Args:
+        path: Library file; defaults to POSE2POSE_SIGN_LIBRARY or data/sign_library.bin
+
+    Returns:
+        Shared SignLibrary instance for the path
+    """
+    return SignLibrary(path or DEFAULT_LIBRARY_PATH)
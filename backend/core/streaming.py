@@ -0,0 +1,289 @@
+"""
+Streaming frame pipeline for live practice
+
+Frames flow through decode -> landmark extraction -> normalization ->
+scoring. Every stage runs in its own thread and stages are connected by
+bounded ring buffers that drop the oldest item when full, so a slow stage
+skips stale frames instead of letting latency pile up. Sources are plain
+iterators: a local video file, or synthetic frames for tests and demos.
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .landmarks import as_sequence
+from .normalization import normalize_sequence, prepare_reference
+from .scoring import DEFAULT_TOLERANCE, pad_sequences, score_batch
+
+DEFAULT_BUFFER_SIZE = 4
+
+
+@dataclass
+class FrameItem:
+    """A frame and whatever the stages derived from it so far"""
+    index: int
+    timestamp: float
+    payload: Any
+    created: float = field(default_factory=time.monotonic)
+
+
+class RingBuffer:
+    """
+    Bounded thread-safe FIFO that drops the oldest item when full
+
+    Tracks its current depth and how many items were dropped.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_BUFFER_SIZE):
+        if capacity < 1:
+            raise ValueError("RingBuffer capacity must be at least 1")
+        self._items: Deque = deque(maxlen=capacity)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.capacity = capacity
+        self.dropped = 0
+
+    def put(self, item) -> None:
+        """Append an item, evicting the oldest one if the buffer is full"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("RingBuffer is closed")
+            if len(self._items) == self.capacity:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None):
+        """
+        Remove and return the oldest item
+
+        Returns:
+            The item, or None once the buffer is closed and empty
+
+        Raises:
+            TimeoutError: If no item arrived within the timeout
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self._closed, timeout):
+                raise TimeoutError("No item available")
+            return self._items.popleft() if self._items else None
+
+    def close(self) -> None:
+        """Stop accepting items; readers drain what is left"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class FramePipeline:
+    """
+    Run frames from a source through a chain of stages
+
+    Each stage is a (name, function) pair; the function maps one payload to
+    the next. Returning None drops the frame at that stage.
+
+    Usage:
+        pipeline = FramePipeline(synthetic_frames(300), [("extract", estimator), ...])
+        for item in pipeline:
+            show(item.payload)
+        print(pipeline.stats())
+    """
+
+    def __init__(self, source: Iterable[Tuple[float, Any]],
+                 stages: List[Tuple[str, Callable[[Any], Any]]],
+                 buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self._source = source
+        self._stages = stages
+        self._names = ["decode"] + [name for name, _ in stages]
+        self._buffers = [RingBuffer(buffer_size) for _ in self._names]
+        self._processed = [0] * len(self._names)
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._errors: List[BaseException] = []
+
+    def start(self) -> "FramePipeline":
+        """Start the source and stage threads"""
+        if self._threads:
+            return self
+        self._threads.append(threading.Thread(target=self._read_source, daemon=True,
+                                              name="pipeline-decode"))
+        for position, (name, func) in enumerate(self._stages):
+            self._threads.append(threading.Thread(
+                target=self._run_stage, args=(position, func), daemon=True,
+                name=f"pipeline-{name}",
+            ))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop reading the source and wait for the stages to finish"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+
+    def __iter__(self) -> Iterator[FrameItem]:
+        self.start()
+        output = self._buffers[-1]
+        try:
+            while True:
+                item = output.get()
+                if item is None:
+                    break
+                yield item
+        finally:
+            self.stop()
+        if self._errors:
+            raise self._errors[0]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Queue depth, dropped and processed frame counts for each stage"""
+        return {
+            name: {"depth": len(buffer), "dropped": buffer.dropped, "processed": processed}
+            for name, buffer, processed in zip(self._names, self._buffers, self._processed)
+        }
+
+    def _read_source(self) -> None:
+        output = self._buffers[0]
+        try:
+            for index, (timestamp, frame) in enumerate(self._source):
+                if self._stop.is_set():
+                    break
+                output.put(FrameItem(index, timestamp, frame))
+                self._processed[0] += 1
+        except BaseException as exc:
+            self._errors.append(exc)
+        finally:
+            output.close()
+
+    def _run_stage(self, position: int, func: Callable[[Any], Any]) -> None:
+        source, output = self._buffers[position], self._buffers[position + 1]
+        try:
+            while not self._stop.is_set():
+                item = source.get()
+                if item is None:
+                    break
+                payload = func(item.payload)
+                if payload is not None:
+                    item.payload = payload
+                    output.put(item)
+                self._processed[position + 1] += 1
+        except BaseException as exc:
+            self._errors.append(exc)
+            self._stop.set()
+        finally:
+            output.close()
+
+
+def synthetic_frames(count: int, height: int = 240, width: int = 320,
+                     fps: float = 0.0, seed: int = 0) -> Iterator[Tuple[float, np.ndarray]]:
+    """
+    Generate synthetic RGB frames
+
+    Args:
+        count: Number of frames
+        height: Frame height in pixels
+        width: Frame width in pixels
+        fps: Pace the frames like a camera; 0 yields as fast as possible
+        seed: Random seed
+
+    Yields:
+        (timestamp in seconds, uint8 frame of shape (height, width, 3))
+    """
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    start = time.monotonic()
+    for index in range(count):
+        timestamp = index / fps if fps else time.monotonic() - start
+        if fps:
+            delay = start + timestamp - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        yield timestamp, np.roll(base, index, axis=1)
+
+
+def video_file_frames(path: str) -> Iterator[Tuple[float, np.ndarray]]:
+    """
+    Decode frames from a local video file
+
+    Requires OpenCV (`opencv-python-headless`).
+
+    Yields:
+        (timestamp in seconds, uint8 RGB frame)
+    """
+    try:
+        import cv2
+    except ImportError as exc:
+        raise ImportError(
+            "Reading video files requires OpenCV: uv add opencv-python-headless"
+        ) from exc
+
+    capture = cv2.VideoCapture(str(path))
+    if not capture.isOpened():
+        raise FileNotFoundError(f"Cannot open video: {path}")
+    try:
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            timestamp = capture.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            yield timestamp, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    finally:
+        capture.release()
+
+
+class RollingScorer:
+    """
+    Scoring stage that compares the most recent frames with a reference
+
+    Keeps a sliding window of normalized landmark frames and returns the
+    current score for each new frame. The reference is normalized and
+    padded once, not on every frame.
+    """
+
+    def __init__(self, reference: np.ndarray, window: Optional[int] = None,
+                 tolerance: float = DEFAULT_TOLERANCE):
+        self._reference = pad_sequences([prepare_reference(reference)], normalized=True)
+        self._frames: Deque[np.ndarray] = deque(maxlen=window or int(self._reference.lengths[0]))
+        self._tolerance = tolerance
+
+    def __call__(self, frame: np.ndarray) -> float:
+        self._frames.append(frame)
+        attempt = np.stack(self._frames)
+        return float(score_batch([attempt], self._reference, [0], self._tolerance)[0])
+
+
+def normalize_frame(landmarks: np.ndarray) -> np.ndarray:
+    """Normalization stage: body-centre and scale a single landmark frame"""
+    return normalize_sequence(as_sequence(landmarks))[0]
+
+
+def practice_pipeline(source: Iterable[Tuple[float, Any]],
+                      extract: Callable[[np.ndarray], np.ndarray],
+                      reference: np.ndarray,
+                      buffer_size: int = DEFAULT_BUFFER_SIZE) -> FramePipeline:
+    """
+    Build the decode -> extract -> normalize -> score pipeline
+
+    Args:
+        source: Iterator of (timestamp, frame), e.g. `video_file_frames(path)`
+        extract: Landmark estimator mapping a frame to (joints, 3) landmarks
+        reference: Reference sign to score against
+        buffer_size: Capacity of each ring buffer
+
+    Returns:
+        FramePipeline whose items carry the running score as payload
+    """
+    return FramePipeline(source, [
+        ("extract", extract),
+        ("normalize", normalize_frame),
+        ("score", RollingScorer(reference)),
+    ], buffer_size)
@@ -0,0 +1,57 @@
+"""
+Text normalization shared by search and keyword matching
+
+Lowercases, splits on anything that is not a letter or digit, drops common
+English stop words (and contraction endings like the "s" of "what's") and
+strips a few inflection suffixes so that "signs", "signing" and "signed"
+all match "sign".
+"""
+
+import re
+from functools import lru_cache
+from typing import List
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset("""
+a an and are as at be but by can do does for from has have how i if in into is it
+its me my not of on or our so that the their them then there these they this to
+was we what when where which who why will with you your
+s t d ll re ve m
+""".split())
+
+# Longest suffixes first; a stem keeps at least three characters
+_SUFFIXES = ("ations", "ation", "ings", "ing", "ies", "ied", "es", "ed", "ly", "s")
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Strip a common inflection suffix from a lowercase word"""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == "s" and word.endswith("ss"):
+                break
+            word = word[:-len(suffix)]
+            if suffix in ("ies", "ied"):
+                word += "y"
+            elif suffix == "es" and not word.endswith(("s", "x", "z", "ch", "sh")):
+                word += "e"
+            return word
+    return word
+
+
+def tokenize(text: str, keep_stop_words: bool = False) -> List[str]:
+    """
+    Split text into stemmed lowercase tokens
+
+    Args:
+        text: Any text
+        keep_stop_words: Keep words such as "the" and "how"
+
+    Returns:
+        Tokens in order of appearance
+    """
+    words = _TOKEN_RE.findall(text.lower())
+    if not keep_stop_words:
+        words = [word for word in words if word not in STOP_WORDS]
+    return [stem(word) for word in words]
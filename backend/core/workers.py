@@ -0,0 +1,268 @@
+"""
+Process pool for landmark extraction
+
+Pose estimation is CPU-bound and holds the GIL, so it runs in separate
+processes instead of the Streamlit script thread. Frames are handed over
+through a ring of `multiprocessing.shared_memory` slots: the caller copies a
+frame into a free slot, only the slot number crosses the process boundary,
+and the worker writes landmarks into the matching output slot.
+
+Failures come back as futures that raise: an estimator error fails its
+frame, and a worker that cannot build its estimator or dies fails the
+frames it had taken. Once no worker is left the pool refuses new frames.
+"""
+
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .estimators import PoseEstimator
+from .landmarks import NUM_JOINTS
+
+_LANDMARK_SHAPE = (NUM_JOINTS, 3)
+# How often the result thread checks that the workers are still running,
+# and how long submit() waits for a slot between checks of the pool
+_POLL_INTERVAL = 0.2
+
+
+def _worker_main(index: int, estimator_factory: Callable[[], PoseEstimator],
+                 frames_name: str, landmarks_name: str,
+                 frame_shape: Tuple[int, ...], slots: int, owners,
+                 tasks: mp.Queue, results: mp.Queue) -> None:
+    try:
+        estimator = estimator_factory()
+    except Exception as exc:
+        # A slot of None reports a failure of the whole worker
+        results.put((None, f"could not create the estimator: {exc!r}"))
+        return
+    frames_shm = SharedMemory(name=frames_name)
+    landmarks_shm = SharedMemory(name=landmarks_name)
+    frames = np.ndarray((slots,) + frame_shape, dtype=np.uint8, buffer=frames_shm.buf)
+    landmarks = np.ndarray((slots,) + _LANDMARK_SHAPE, dtype=np.float32, buffer=landmarks_shm.buf)
+    try:
+        while True:
+            slot = tasks.get()
+            if slot is None:
+                break
+            # Lets the pool fail this frame if the worker dies on it
+            owners[slot] = index
+            try:
+                landmarks[slot] = estimator.estimate(frames[slot])
+                results.put((slot, None))
+            except Exception as exc:
+                results.put((slot, repr(exc)))
+    finally:
+        estimator.close()
+        del frames, landmarks
+        frames_shm.close()
+        landmarks_shm.close()
+
+
+class LandmarkWorkerPool:
+    """
+    Pool of estimator processes fed through shared memory
+
+    Usage:
+        with LandmarkWorkerPool(StubEstimator, frame_shape=(480, 640, 3)) as pool:
+            landmarks = pool.estimate(frame)
+            futures = [pool.submit(f) for f in frames]
+    """
+
+    def __init__(self, estimator_factory: Callable[[], PoseEstimator],
+                 frame_shape: Tuple[int, ...],
+                 workers: Optional[int] = None,
+                 slots: Optional[int] = None):
+        self.frame_shape = tuple(frame_shape)
+        self.workers = workers or os.cpu_count() or 1
+        self.slots = slots or 2 * self.workers
+
+        frame_bytes = int(np.prod(self.frame_shape))
+        self._frames_shm = SharedMemory(create=True, size=self.slots * frame_bytes)
+        self._landmarks_shm = SharedMemory(
+            create=True, size=self.slots * NUM_JOINTS * 3 * np.dtype(np.float32).itemsize
+        )
+        self._frames = np.ndarray((self.slots,) + self.frame_shape, dtype=np.uint8,
+                                  buffer=self._frames_shm.buf)
+        self._landmarks = np.ndarray((self.slots,) + _LANDMARK_SHAPE, dtype=np.float32,
+                                     buffer=self._landmarks_shm.buf)
+
+        # spawn keeps workers independent of the threads running in this process
+        ctx = mp.get_context("spawn")
+        self._tasks = ctx.Queue()
+        self._results = ctx.Queue()
+        self._free: "queue.Queue[int]" = queue.Queue()
+        for slot in range(self.slots):
+            self._free.put(slot)
+        self._pending: Dict[int, Future] = {}
+        self._closed = False
+        # Index of the worker holding each slot, -1 until one takes it
+        self._owners = ctx.RawArray("i", self.slots)
+        self._worker_error: Optional[str] = None
+        self._broken: Optional[str] = None
+
+        self._processes: List[mp.Process] = [
+            ctx.Process(
+                target=_worker_main,
+                args=(index, estimator_factory, self._frames_shm.name, self._landmarks_shm.name,
+                      self.frame_shape, self.slots, self._owners, self._tasks, self._results),
+                daemon=True,
+            )
+            for index in range(self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+        self._running = set(range(self.workers))
+        self._collector = threading.Thread(target=self._collect, daemon=True,
+                                           name="landmark-results")
+        self._collector.start()
+
+    def submit(self, frame: np.ndarray, timeout: Optional[float] = None) -> Future:
+        """
+        Queue a frame for landmark extraction
+
+        Blocks while every shared-memory slot is in use.
+
+        Args:
+            frame: uint8 RGB image matching the pool's frame_shape
+            timeout: Seconds to wait for a free slot, or None to wait as
+                long as the pool has workers
+
+        Returns:
+            Future resolving to landmarks of shape (NUM_JOINTS, 3)
+
+        Raises:
+            ValueError: If the frame has the wrong shape or dtype
+            RuntimeError: If the pool is closed or has no workers left
+            TimeoutError: If no slot came free within the timeout
+        """
+        if self._closed:
+            raise RuntimeError("LandmarkWorkerPool is closed")
+        if not isinstance(frame, np.ndarray) or frame.dtype != np.uint8:
+            raise ValueError(f"Expected a uint8 frame, got {getattr(frame, 'dtype', type(frame))}")
+        if frame.shape != self.frame_shape:
+            raise ValueError(f"Expected frame of shape {self.frame_shape}, got {frame.shape}")
+        slot = self._acquire_slot(timeout)
+        self._frames[slot] = frame
+        self._owners[slot] = -1
+        future: Future = Future()
+        self._pending[slot] = future
+        self._tasks.put(slot)
+        return future
+
+    def _acquire_slot(self, timeout: Optional[float]) -> int:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._broken is not None:
+                raise RuntimeError(f"LandmarkWorkerPool has no workers left: {self._broken}")
+            wait = _POLL_INTERVAL
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    raise TimeoutError(f"No free frame slot within {timeout} s")
+            try:
+                slot = self._free.get(timeout=wait)
+            except queue.Empty:
+                continue
+            if self._broken is not None:
+                self._free.put(slot)
+                continue
+            return slot
+
+    def estimate(self, frame: np.ndarray, timeout: Optional[float] = None) -> np.ndarray:
+        """Extract landmarks from one frame and wait for the result"""
+        return self.submit(frame, timeout).result(timeout)
+
+    def map(self, frames: Iterable[np.ndarray]) -> Iterable[np.ndarray]:
+        """Extract landmarks from many frames, keeping their order"""
+        window: Deque[Future] = deque()
+        for frame in frames:
+            if len(window) >= self.slots:
+                yield window.popleft().result()
+            window.append(self.submit(frame))
+        while window:
+            yield window.popleft().result()
+
+    def _collect(self) -> None:
+        while True:
+            try:
+                message = self._results.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                if not self._closed:
+                    self._reap_workers()
+                continue
+            if message is None:
+                break
+            self._handle(message)
+
+    def _handle(self, message: Tuple[Optional[int], Optional[str]]) -> None:
+        slot, error = message
+        if slot is None:
+            self._worker_error = error
+            return
+        future = self._pending.pop(slot)
+        if error is None:
+            future.set_result(self._landmarks[slot].copy())
+        else:
+            future.set_exception(RuntimeError(f"Landmark extraction failed: {error}"))
+        self._free.put(slot)
+
+    def _reap_workers(self) -> None:
+        """Fail the frames held by workers that have exited"""
+        exited = {index for index in self._running if not self._processes[index].is_alive()}
+        if not exited:
+            return
+        self._running -= exited
+        # Results a worker sent before exiting are already in the queue
+        while True:
+            try:
+                message = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if message is None:
+                # close() started meanwhile; leave its sentinel for _collect
+                self._results.put(None)
+                return
+            self._handle(message)
+
+        reason = self._worker_error or "worker exited with code " + ", ".join(
+            str(self._processes[index].exitcode) for index in sorted(exited)
+        )
+        if not self._running:
+            self._broken = reason
+        for slot, future in list(self._pending.items()):
+            # With workers left, frames nobody has taken yet still get run
+            if self._running and self._owners[slot] not in exited:
+                continue
+            del self._pending[slot]
+            future.set_exception(RuntimeError(f"Landmark extraction failed: {reason}"))
+            self._free.put(slot)
+
+    def close(self) -> None:
+        """Stop the workers and release the shared memory"""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join()
+        self._results.put(None)
+        self._collector.join()
+        del self._frames, self._landmarks
+        for shm in (self._frames_shm, self._landmarks_shm):
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self) -> "LandmarkWorkerPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,172 @@
+"""
+Bulk assessment grading
+
+Grades placement assessments exported from classes, outside Streamlit.
+Reads a JSONL file with one answer set per line, either
+`{"id": ..., "answers": {...}}` or the answers object on its own, and
+writes one JSON result per line in the same order. Answer sets marked
+`"mode": "adaptive"`, like the Assessment page's downloaded report, are
+adaptive test transcripts, scored with `adaptive_transcript_score` exactly
+as the page scores them; others are graded on the fixed placement form
+with `calculate_assessment_score`.
+
+Lines are read lazily and graded in chunks over a process pool with a
+bounded number of chunks in flight, so memory stays constant however large
+the input is.
+
+Usage:
+    pose2pose-grade answers.jsonl -o results.jsonl
+    python -m backend.grading - < answers.jsonl > results.jsonl
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+if __package__ in (None, ""):
+    # Make the `backend` package importable when run as a script
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.core.assessment import (  # noqa: E402
+    ADAPTIVE_MODE, adaptive_transcript_score, calculate_assessment_score
+)
+
+DEFAULT_CHUNK_SIZE = 500
+# Chunks queued per worker; bounds memory while keeping workers busy
+_IN_FLIGHT_PER_WORKER = 2
+
+
+def grade_line(line: str, line_number: int) -> Dict[str, Any]:
+    """
+    Grade one JSONL line
+
+    Returns:
+        The score dict plus "id" (the line's id, or its line number), or
+        {"id", "error"} if the line is not a valid answer set
+    """
+    try:
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise ValueError("expected a JSON object")
+        answers = record["answers"] if "answers" in record else record
+        if not isinstance(answers, dict):
+            raise ValueError("answers must be a JSON object")
+        record_id = record.get("id", line_number) if "answers" in record else line_number
+        if record.get("mode") == ADAPTIVE_MODE:
+            return {"id": record_id, **adaptive_transcript_score(answers)}
+        return {"id": record_id, **calculate_assessment_score(answers)}
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        return {"id": line_number, "error": str(e)}
+
+
+def grade_chunk(lines: Sequence[str], line_numbers: Sequence[int]) -> Tuple[List[str], int]:
+    """
+    Grade a chunk of lines in a worker
+
+    Returns:
+        (serialized results, number of error results)
+    """
+    results = [grade_line(line, number) for number, line in zip(line_numbers, lines)]
+    return [json.dumps(result) for result in results], sum("error" in result for result in results)
+
+
+def _numbered_chunks(lines: Iterable[str], chunk_size: int) -> Iterator[Tuple[List[int], List[str]]]:
+    """(line numbers, lines) chunks of the non-blank lines; line numbers start at 1"""
+    numbered = ((number, line) for number, line in enumerate(lines, 1) if line.strip())
+    while True:
+        chunk = list(islice(numbered, chunk_size))
+        if not chunk:
+            return
+        yield [number for number, _ in chunk], [line for _, line in chunk]
+
+
+def grade_stream(lines: Iterable[str], output: IO[str], workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, float]:
+    """
+    Grade a stream of JSONL lines into an output stream
+
+    Args:
+        lines: Input lines, e.g. an open file
+        output: Text stream receiving one JSON result per line, in input order
+        workers: Worker processes; defaults to the CPU count, 1 grades inline
+        chunk_size: Lines sent to a worker at a time
+
+    Returns:
+        {"graded", "errors", "seconds", "per_second"}
+    """
+    workers = workers if workers is not None else os.cpu_count() or 1
+    graded = errors = 0
+    start = time.perf_counter()
+
+    def write(chunk_results: Tuple[List[str], int]) -> None:
+        nonlocal graded, errors
+        results, chunk_errors = chunk_results
+        output.writelines(result + "\n" for result in results)
+        graded += len(results)
+        errors += chunk_errors
+
+    chunks = _numbered_chunks(lines, chunk_size)
+    if workers <= 1:
+        for numbers, chunk in chunks:
+            write(grade_chunk(chunk, numbers))
+    else:
+        with ProcessPoolExecutor(workers, mp_context=mp.get_context("spawn")) as executor:
+            pending: Deque[Future] = deque()
+            for numbers, chunk in chunks:
+                pending.append(executor.submit(grade_chunk, chunk, numbers))
+                if len(pending) >= workers * _IN_FLIGHT_PER_WORKER:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+    output.flush()
+
+    seconds = time.perf_counter() - start
+    return {
+        "graded": graded,
+        "errors": errors,
+        "seconds": seconds,
+        "per_second": graded / seconds if seconds > 0 else 0.0,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point (`pose2pose-grade`)"""
+    parser = argparse.ArgumentParser(
+        prog="pose2pose-grade",
+        description="Grade placement assessments from a JSONL file of answer sets.",
+    )
+    parser.add_argument("input", help="JSONL file of answer sets, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="Results file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Answer sets per worker task (default: {DEFAULT_CHUNK_SIZE})")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        stats = grade_stream(source, sink, args.workers, args.chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    print(f"Graded {stats['graded']} assessments ({stats['errors']} errors) in "
+          f"{stats['seconds']:.2f} s: {stats['per_second']:.0f} assessments/s", file=sys.stderr)
+    return 1 if stats["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
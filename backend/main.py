@@ -0,0 +1,865 @@
+"""
+Backend smoke checks
+
+Run with `make test` (or `cd backend && python main.py`) to exercise the
+backend functions on synthetic data.
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Make the `backend` package importable when run from inside backend/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.core.assessment import (  # noqa: E402
+    ADAPTIVE_MODE, adaptive_assessment_score, calculate_assessment_score, clear_score_cache,
+    generate_ai_recommendations,
+)
+from backend.core.keywords import KeywordMatcher  # noqa: E402
+from backend.core.landmarks import NUM_JOINTS  # noqa: E402
+from backend.core.answer_cache import AnswerCache  # noqa: E402
+from backend.core.analytics import ColumnarEvents, export_event_log, write_columnar  # noqa: E402
+from backend.core.adaptive import AdaptiveSession, ItemBank, placement_item_bank  # noqa: E402
+from backend.core.alignment import align_sequences, nearest_sequence  # noqa: E402
+from backend.core.batching import ScoringBatcher  # noqa: E402
+from backend.core.chat import ChatAssistant, LocalChatModel, chat_metrics  # noqa: E402
+from backend.core.codec import decode_sequence, encode_sequence, max_error  # noqa: E402
+from backend.core.content_store import ContentStore, build_content_store, open_content_store  # noqa: E402
+from backend.core.embedding import HashingEmbedder  # noqa: E402
+from backend.core.embedding_store import BatchEmbedder, EmbeddingStore, content_key  # noqa: E402
+from backend.core.estimators import StubEstimator  # noqa: E402
+from backend.core.event_log import (  # noqa: E402
+    LESSON_STARTED, MODULE_COMPLETED, PRACTICE_SCORED, QUIZ_ANSWERED, EventLog, event_day,
+)
+from backend.core.progress import ProgressAggregates  # noqa: E402
+from backend.core.session_store import SessionStore  # noqa: E402
+from backend.grading import grade_line, grade_stream  # noqa: E402
+from backend.core.feedback import generate_feedback  # noqa: E402
+from backend.core.normalization import prepare_reference, procrustes_align  # noqa: E402
+from backend.core.recognition import EMBEDDING_DIM, EMBEDDING_MODEL, SignIndex, embed_windows  # noqa: E402
+from backend.core.retrieval import Document, RetrievalIndex, curriculum_documents  # noqa: E402
+from backend.core.scoring import analyze_attempt, score_attempt, score_batch  # noqa: E402
+from backend.core.sign_library import SignLibrary, write_sign_library  # noqa: E402
+from backend.core.streaming import practice_pipeline, synthetic_frames  # noqa: E402
+from backend.core.workers import LandmarkWorkerPool  # noqa: E402
+
+
+def synthetic_sign(seed: int, frames: int = 60) -> np.ndarray:
+    """Generate a smooth synthetic landmark sequence"""
+    rng = np.random.default_rng(seed)
+    base = rng.normal(0.0, 0.3, size=(NUM_JOINTS, 3)).astype(np.float32)
+    base[11] = [-0.2, 0.0, 0.0]
+    base[12] = [0.2, 0.0, 0.0]
+    t = np.linspace(0.0, 2.0 * np.pi, frames, dtype=np.float32)[:, None, None]
+    phase = rng.uniform(0.0, 2.0 * np.pi, size=(1, NUM_JOINTS, 3)).astype(np.float32)
+    motion = 0.1 * np.sin(t + phase)
+    motion[:, [11, 12]] = 0.0
+    return base + motion
+
+
+def check_scoring() -> None:
+    reference = synthetic_sign(1)
+    attempt = synthetic_sign(1, frames=45)
+    other = synthetic_sign(2)
+
+    same = score_attempt(attempt, reference)
+    different = score_attempt(other, reference)
+    assert same > 0.95, same
+    assert different < same, (different, same)
+
+    start = time.perf_counter()
+    for _ in range(100):
+        score_attempt(attempt, reference)
+    elapsed_ms = (time.perf_counter() - start) * 10
+    print(f"scoring: same={same:.3f} different={different:.3f} ({elapsed_ms:.2f} ms/attempt)")
+
+
+def check_batch_scoring() -> None:
+    references = [synthetic_sign(seed) for seed in range(5)]
+    attempts = [synthetic_sign(seed % 5, frames=30 + seed) for seed in range(40)]
+
+    matrix = score_batch(attempts, references)
+    assert matrix.shape == (40, 5)
+    assert (matrix.argmax(axis=1) == np.arange(40) % 5).all()
+
+    targets = np.arange(40) % 5
+    single = np.array([score_attempt(a, references[t]) for a, t in zip(attempts, targets)])
+    batched = score_batch(attempts, references, targets)
+    assert np.allclose(single, batched, atol=1e-6)
+
+    names = {f"sign{idx}": ref for idx, ref in enumerate(references)}
+    with ScoringBatcher(names) as batcher:
+        start = time.perf_counter()
+        futures = [batcher.submit(a, f"sign{t}") for a, t in zip(attempts, targets)]
+        scores = np.array([f.result() for f in futures])
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    assert np.allclose(scores, batched, atol=1e-6)
+
+    # Submissions racing close() are either scored or refused, never left pending
+    racing = ScoringBatcher(names)
+    accepted: list = []
+
+    def submit_until_closed() -> None:
+        for attempt, target in zip(attempts, targets):
+            try:
+                accepted.append(racing.submit(attempt, f"sign{target}"))
+            except RuntimeError:
+                return
+
+    threads = [threading.Thread(target=submit_until_closed) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    racing.close()
+    for thread in threads:
+        thread.join()
+    assert all(future.done() for future in accepted)
+    print(f"batch scoring: {len(attempts)} attempts in {batcher.batches_scored} batches "
+          f"({elapsed_ms:.1f} ms total)")
+
+
+def check_feedback() -> None:
+    reference = synthetic_sign(7)
+    attempt = reference.copy()
+    attempt[:, 54:] += np.float32([0.0, 0.15, 0.0])  # right hand too low
+    attempt[20:35, 33:54] = np.nan  # left hand out of frame
+    # Start the movement late: hold the first pose, then play the sign
+    attempt = np.concatenate([np.repeat(attempt[:1], 9, axis=0), attempt[:-9]])
+
+    breakdown = analyze_attempt(attempt, reference)
+    assert np.isclose(breakdown.score, score_attempt(attempt, reference), atol=1e-6)
+    assert breakdown.part_errors["right_hand"] > breakdown.part_errors["torso"]
+    assert breakdown.part_missing["left_hand"] > 0.2
+    assert breakdown.timing_offset > 0.05, breakdown.timing_offset
+    tips = generate_feedback(breakdown, max_tips=5)
+    assert any("right hand" in tip for tip in tips), tips
+    assert any("behind" in tip for tip in tips), tips
+
+    start = time.perf_counter()
+    for _ in range(100):
+        score_attempt(attempt, reference)
+    plain_ms = (time.perf_counter() - start) * 10
+    start = time.perf_counter()
+    for _ in range(100):
+        generate_feedback(analyze_attempt(attempt, reference))
+    feedback_ms = (time.perf_counter() - start) * 10
+    print(f"feedback: {len(tips)} tips, timing offset {breakdown.timing_offset:+.2f} "
+          f"({plain_ms:.2f} ms score only, {feedback_ms:.2f} ms with feedback)")
+
+
+def check_normalization() -> None:
+    reference = synthetic_sign(6)
+    # Same sign, turned 25 degrees towards the camera and standing further back
+    angle = np.deg2rad(25.0)
+    rotation = np.array([[np.cos(angle), 0.0, np.sin(angle)],
+                         [0.0, 1.0, 0.0],
+                         [-np.sin(angle), 0.0, np.cos(angle)]], dtype=np.float32)
+    turned = 0.7 * reference @ rotation.T + np.float32([0.3, -0.1, 0.5])
+
+    score = score_attempt(turned, reference)
+    assert score > 0.99, score
+    assert prepare_reference(reference) is prepare_reference(reference.copy())
+
+    frames = np.repeat(reference, 50, axis=0)
+    start = time.perf_counter()
+    aligned = procrustes_align(frames @ rotation.T, frames)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert np.allclose(aligned, frames, atol=1e-4)
+    print(f"normalization: turned attempt scores {score:.3f} "
+          f"({len(frames)} frames aligned in {elapsed_ms:.1f} ms)")
+
+
+def check_alignment() -> None:
+    reference = synthetic_sign(3, frames=60)
+    # Same sign performed at a non-uniform speed: slow start, fast finish
+    warped_time = np.linspace(0.0, 1.0, 90) ** 2 * 59
+    slow = synthetic_sign(3, frames=60)[np.rint(warped_time).astype(int)]
+
+    plain = score_attempt(slow, reference)
+    aligned = score_attempt(slow, reference, warp=True)
+    assert aligned > plain, (aligned, plain)
+
+    candidates = [synthetic_sign(seed, frames=50 + seed) for seed in range(50)]
+    idx, _ = nearest_sequence(synthetic_sign(17, frames=40), candidates)
+    assert idx == 17, idx
+
+    drill_a, drill_b = synthetic_sign(5, frames=1800), synthetic_sign(5, frames=1500)
+    start = time.perf_counter()
+    result = align_sequences(drill_a, drill_b, window=40)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert result.path[-1].tolist() == [1799, 1499]
+    print(f"alignment: linear={plain:.3f} dtw={aligned:.3f} "
+          f"(1800x1500 frames aligned in {elapsed_ms:.0f} ms)")
+
+
+def check_sign_library() -> None:
+    signs = {name: synthetic_sign(seed, frames=40 + seed)
+             for seed, name in enumerate(["Hello", "Thank You", "Please", "Sorry", "Help"])}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_sign_library(Path(tmp) / "signs.bin", signs)
+        library = SignLibrary(path)
+        assert list(library) == list(signs)
+        for name, seq in signs.items():
+            assert np.array_equal(library[name], seq)
+        assert not library["Help"].flags.writeable
+        assert score_attempt(signs["Please"], library["Please"]) > 0.99
+        print(f"sign library: {len(library)} signs, {library.total_frames} frames, "
+              f"{path.stat().st_size / 1024:.0f} KiB mapped")
+        del library
+
+
+def check_recognition() -> None:
+    library = {f"sign{seed}": synthetic_sign(seed, frames=30 + seed % 20) for seed in range(2000)}
+    index = SignIndex.from_library(library)
+    index.build_ivf()
+    window = synthetic_sign(1234, frames=24)
+
+    timings = {}
+    for exact in (True, False):
+        assert index.search(window, k=5, exact=exact)[0][0] == "sign1234"
+        start = time.perf_counter()
+        for _ in range(50):
+            index.search(window, k=5, exact=exact)
+        timings[exact] = (time.perf_counter() - start) * 1000 / 50
+    print(f"recognition: {len(index)} signs, exact {timings[True]:.2f} ms, "
+          f"ivf {timings[False]:.2f} ms per query")
+
+
+def check_retrieval() -> None:
+    documents = curriculum_documents()
+    with tempfile.TemporaryDirectory() as tmp:
+        RetrievalIndex.build(documents).save(tmp)
+        index = RetrievalIndex.load(tmp)
+    assert len(index) == len(documents)
+
+    queries = {
+        "Are facial expressions optional?": "Quiz:quiz:1",
+        "hand position at chest level": "Interactive:tip:0",
+        "medical and legal vocabulary": "module:mod9",
+    }
+    for query, expected in queries.items():
+        assert index.search(query, k=3)[0].document.doc_id == expected, query
+
+    start = time.perf_counter()
+    for _ in range(100):
+        index.search("how do I practice fingerspelling", k=5)
+    elapsed_ms = (time.perf_counter() - start) * 10
+    print(f"retrieval: {len(index)} documents, {elapsed_ms:.2f} ms per hybrid query")
+
+
+def check_embedding_store() -> None:
+    embedder = HashingEmbedder()
+    rng = np.random.default_rng(0)
+    words = [doc.text for doc in curriculum_documents()]
+    texts = [" ".join(rng.choice(words, size=3)) + f" #{idx}" for idx in range(4000)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EmbeddingStore(Path(tmp) / embedder.name, embedder.dim, embedder.name)
+        with BatchEmbedder(embedder.embed, store, batch_size=500, workers=2) as batch:
+            start = time.perf_counter()
+            vectors = batch.embed(texts)
+            full_ms = (time.perf_counter() - start) * 1000
+            assert batch.computed == len(texts)
+
+            # A small edit only embeds the changed texts
+            texts[::1000] = [text + " (edited)" for text in texts[::1000]]
+            start = time.perf_counter()
+            edited = batch.embed(texts)
+            edit_ms = (time.perf_counter() - start) * 1000
+            assert batch.computed == len(texts) + 4
+        assert np.allclose(edited[1:1000], vectors[1:1000])
+        assert np.allclose(edited[::1000], embedder.embed(texts[::1000]), atol=1e-6)
+
+        reopened = EmbeddingStore(Path(tmp) / embedder.name, embedder.dim, embedder.name)
+        assert len(reopened) == len(texts) + 4
+
+        # A write interrupted after the vectors leaves an orphan row, which
+        # the next add overwrites instead of appending after
+        with open(Path(tmp) / embedder.name / "vectors.f32", "ab") as f:
+            f.write(np.full(embedder.dim, 7, dtype=np.float32).tobytes())
+        torn = EmbeddingStore(Path(tmp) / embedder.name, embedder.dim, embedder.name)
+        key = content_key("after a torn write")
+        torn.add([key], np.full((1, embedder.dim), 2, dtype=np.float32))
+        found, missing = EmbeddingStore(Path(tmp) / embedder.name, embedder.dim,
+                                        embedder.name).lookup([key])
+        assert not missing[0] and (found == 2).all()
+
+        # Two processes adding to the same store don't overwrite each
+        # other's rows, and each skips keys the other already stored
+        first = EmbeddingStore(Path(tmp) / embedder.name, embedder.dim, embedder.name)
+        second = EmbeddingStore(Path(tmp) / embedder.name, embedder.dim, embedder.name)
+        shared, mine, theirs = (content_key(f"writer {name}") for name in ("both", "one", "two"))
+        first.add([shared, mine], np.full((2, embedder.dim), 3, dtype=np.float32))
+        second.add([shared, theirs], np.full((2, embedder.dim), 4, dtype=np.float32))
+        assert len(second) == len(first) + 1
+        found, missing = EmbeddingStore(Path(tmp) / embedder.name, embedder.dim,
+                                        embedder.name).lookup([shared, mine, theirs])
+        assert not missing.any() and (found[:2] == 3).all() and (found[2] == 4).all()
+
+        signs = {f"sign{seed}": synthetic_sign(seed, frames=30) for seed in range(200)}
+        sign_store = EmbeddingStore(Path(tmp) / EMBEDDING_MODEL, EMBEDDING_DIM, EMBEDDING_MODEL)
+        with BatchEmbedder(embed_windows, sign_store, workers=1) as batch:
+            SignIndex.from_library(signs, batch)
+            index = SignIndex.from_library(signs, batch)
+            assert batch.computed == len(signs) and batch.reused == len(signs)
+        assert index.search(signs["sign7"], k=1)[0][0] == "sign7"
+    print(f"embedding store: {len(texts)} texts embedded in {full_ms:.0f} ms, "
+          f"re-indexed after editing 4 in {edit_ms:.0f} ms")
+
+
+def check_chat() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        RetrievalIndex.build(curriculum_documents()).save(tmp)
+        index = RetrievalIndex.load(tmp)
+    assistant = ChatAssistant(index, LocalChatModel(token_delay=0.001))
+
+    stream = assistant.ask("Are facial expressions optional?")
+    answer = "".join(stream.iter_sync())
+    assert answer == stream.text and "grammatical markers" in answer
+    assert not stream.metrics.cancelled and stream.metrics.tokens > 10
+
+    cancelled = assistant.ask("How do I fingerspell?")
+    tokens = cancelled.iter_sync()
+    next(tokens)
+    tokens.close()
+    assert cancelled.metrics.cancelled and cancelled.metrics.tokens == 1
+
+    metrics = chat_metrics()
+    assert metrics["cancelled"] >= 1
+    print(f"chat: {stream.metrics.tokens} tokens, first token in "
+          f"{stream.metrics.time_to_first_token * 1000:.1f} ms, "
+          f"{stream.metrics.tokens_per_second:.0f} tokens/s")
+
+
+def check_answer_cache() -> None:
+    documents = curriculum_documents()
+    index = RetrievalIndex.build(documents)
+    cache = AnswerCache(max_bytes=64 * 1024)
+    assistant = ChatAssistant(index, LocalChatModel(token_delay=0.001), cache=cache)
+
+    def ask(question: str):
+        stream = assistant.ask(question)
+        return "".join(stream.iter_sync()), stream.cached
+
+    answer, cached = ask("What is fingerspelling?")
+    assert cached is None
+    assert ask("what is FINGERSPELLING") == (answer, "exact")
+    assert ask("What's fingerspelling?") == (answer, "exact")
+    assert ask("What is fingerspelling in ASL?") == (answer, "near")
+    assert ask("Are facial expressions optional?")[1] is None
+
+    # Editing a cited document invalidates the answers that quoted it
+    cited = index.search("What is fingerspelling?", k=3)[0].document
+    edited = [Document(d.doc_id, d.title, d.text + " Updated.", d.source) if d == cited else d
+              for d in documents]
+    assert cache.sync(edited) >= 1
+    assert cache.get("What is fingerspelling?", [cited]) is None
+
+    small = AnswerCache(max_bytes=4096)
+    for idx in range(50):
+        small.put(f"question {idx}", documents[:1], "answer " * 50)
+    assert small.size_bytes <= 4096 and small.evictions > 0
+
+    stats = cache.stats()
+    print(f"answer cache: hit rate {stats['hit_rate']:.0%} "
+          f"({stats['exact_hits']} exact, {stats['near_hits']} near), "
+          f"{stats['seconds_saved'] * 1000:.0f} ms saved, {stats['bytes']} B")
+
+
+def check_keywords() -> None:
+    matcher = KeywordMatcher(["communication", "deaf culture", "hearing", "understand"])
+    answer = "Deaf cultures value communicating clearly; hearing people understand more."
+    matches = matcher.find(answer)
+    assert [m.keyword for m in matches] == ["deaf culture", "communication", "hearing", "understand"]
+    assert answer[matches[1].start:matches[1].end] == "communicating"
+    assert not matcher.find("A deafening, overheard misunderstanding")
+
+    rubric = KeywordMatcher([f"term{idx}" for idx in range(2000)] + ["communication"])
+    text = "Signing is communication. " * 400
+    start = time.perf_counter()
+    found = rubric.find(text)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert len(found) == 400
+    print(f"keywords: {len(rubric.keywords)}-keyword rubric scanned {len(text)} chars "
+          f"in {elapsed_ms:.1f} ms")
+
+
+def check_grading() -> None:
+    import io
+
+    from backend.models.curriculum import QUIZ_QUESTIONS
+
+    rng = np.random.default_rng(5)
+    words = ["deaf", "community", "culture", "signing", "barriers", "we", "learn", "inclusive"]
+    answer_sets = []
+    for idx in range(3000):
+        answers = {q["id"]: int(rng.integers(len(q["options"])))
+                   for q in QUIZ_QUESTIONS["multiple_choice"]}
+        answers.update({q["id"]: " ".join(rng.choice(words, int(rng.integers(0, 20))))
+                        for q in QUIZ_QUESTIONS["short_answer"]})
+        answer_sets.append(answers)
+    lines = [json.dumps({"id": f"s{idx}", "answers": answers})
+             for idx, answers in enumerate(answer_sets)]
+    lines.insert(10, "not json")
+
+    output = io.StringIO()
+    stats = grade_stream(iter(lines), output, workers=2, chunk_size=250)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert stats["graded"] == len(lines) and stats["errors"] == 1
+    assert "error" in results.pop(10)
+    # Null or non-text short answers score as empty instead of failing
+    blank = {**answer_sets[0], **{q["id"]: None for q in QUIZ_QUESTIONS["short_answer"]}}
+    assert calculate_assessment_score(blank)["sa_score"] == 0
+    assert "error" not in grade_line(json.dumps({"id": "n", "answers": {**blank, "sa1": 42}}), 1)
+    for answers, result in zip(answer_sets, results):
+        expected = calculate_assessment_score(answers)
+        assert result["final_score"] == expected["final_score"]
+        assert result["level"] == expected["level"]
+
+    # Rerunning the results step regrades the same answers from the cache
+    clear_score_cache()
+    start = time.perf_counter()
+    first = calculate_assessment_score(answer_sets[0])
+    cold_us = (time.perf_counter() - start) * 1e6
+    start = time.perf_counter()
+    again = calculate_assessment_score(dict(answer_sets[0]))
+    warm_us = (time.perf_counter() - start) * 1e6
+    assert {k: v for k, v in first.items() if k != "timestamp"} == \
+        {k: v for k, v in again.items() if k != "timestamp"}
+    path = generate_ai_recommendations(first)
+    path["modules"] = []
+    assert generate_ai_recommendations(first)["modules"]
+    print(f"grading: {stats['graded']} assessments at {stats['per_second']:.0f} assessments/s, "
+          f"rescoring {cold_us:.0f} -> {warm_us:.0f} us")
+
+
+def check_adaptive() -> None:
+    rng = np.random.default_rng(6)
+    n = 500
+    items = [{"id": f"item{idx}", "options": ["a", "b", "c", "d"], "correct": 0} for idx in range(n)]
+    bank = ItemBank(items, rng.uniform(0.8, 2.2, n), rng.normal(0, 1.2, n), np.full(n, 0.2))
+
+    asked, errors, select_us = [], [], []
+    for ability in rng.normal(size=200):
+        session = AdaptiveSession(bank, max_items=30)
+        while True:
+            start = time.perf_counter()
+            item = session.next_item()
+            select_us.append((time.perf_counter() - start) * 1e6)
+            if item is None:
+                break
+            session.record(item, rng.random() < bank.p_correct[item, bank.grid_index(ability)])
+        asked.append(len(session.administered))
+        errors.append(session.theta - ability)
+    rmse = float(np.sqrt(np.mean(np.square(errors))))
+    assert np.median(select_us) < 1000, np.median(select_us)
+    assert rmse < 0.7, rmse
+
+    placement = AdaptiveSession(placement_item_bank())
+    while (item := placement.next_item()) is not None:
+        placement.record(item, True)
+    assert placement.theta > 0 and len(placement.administered) <= placement.max_items
+    bank = placement_item_bank()
+    questions = [item["question"].lower() for item in bank.items]
+    assert len(set(questions)) == len(questions)
+
+    # An exported transcript, or a learner resuming mid-test, gets back the
+    # page's session; the bulk grader scores it as the page does
+    session = AdaptiveSession(bank)
+    answers = {"sa1": "Deaf culture and community matter", "sa2": "Sign language is a language"}
+    while (item := session.next_item()) is not None:
+        answers[bank.ids[item]] = len(answers) % 2
+        session.record(item, answers[bank.ids[item]] == bank.items[item]["correct"])
+    resumed = AdaptiveSession.from_answers(bank, json.loads(json.dumps(answers)))
+    assert resumed.administered == session.administered and resumed.theta == session.theta
+    live = adaptive_assessment_score(session, answers)
+    graded = grade_line(json.dumps({"id": "ana", "mode": ADAPTIVE_MODE, "answers": answers}), 1)
+    assert all(graded[key] == live[key] for key in live if key != "timestamp")
+    print(f"adaptive: {np.mean(asked):.1f} of {n} items asked, ability RMSE {rmse:.2f}, "
+          f"item selection {np.median(select_us):.0f} us")
+
+
+def check_content_store() -> None:
+    from backend.models.curriculum import LEARNING_PATHS, LESSON_CONTENT, MODULES_DATABASE, QUIZ_QUESTIONS
+
+    store = open_content_store()
+    for level, modules in MODULES_DATABASE.items():
+        assert store.modules_by_level(level) == modules
+    assert store.lesson_content("Quiz") == LESSON_CONTENT["Quiz"]
+    assert store.questions("short_answer") == QUIZ_QUESTIONS["short_answer"]
+
+    # A catalogue of thousands of modules
+    template = MODULES_DATABASE["Beginner"][0]
+    levels = ["Beginner", "Intermediate", "Advanced"]
+    catalogue = {
+        level: [{**template, "id": f"{level[:3].lower()}{idx}", "title": f"{level} module {idx}"}
+                for idx in range(1500)]
+        for level in levels
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = build_content_store(Path(tmp) / "content.sqlite", catalogue, LESSON_CONTENT,
+                                   QUIZ_QUESTIONS, LEARNING_PATHS)
+        large = ContentStore(path)
+        start = time.perf_counter()
+        modules = large.modules_by_level("Intermediate")
+        cold_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        large.modules_by_level("Intermediate")
+        warm_ms = (time.perf_counter() - start) * 1000
+        assert len(modules) == 1500 and modules[0]["title"] == "Intermediate module 0"
+        assert large.module("adv42")["lessons"] == template["lessons"]
+        assert large.count_modules() == 4500 and large.cache_stats()["hits"] == 1
+        large.close()
+
+        # Processes opening a missing store at once each end up with a
+        # complete store, and no temporary files are left behind
+        opened = []
+        racers = [threading.Thread(target=lambda: opened.append(
+            open_content_store.__wrapped__(Path(tmp) / "shared.sqlite"))) for _ in range(4)]
+        for racer in racers:
+            racer.start()
+        for racer in racers:
+            racer.join()
+        assert len(opened) == 4 and len({store.fingerprint for store in opened}) == 1
+        assert opened[0].questions("short_answer") == QUIZ_QUESTIONS["short_answer"]
+        assert not list(Path(tmp).glob("*.tmp"))
+        for store in opened:
+            store.close()
+    print(f"content store: one level of 4500 modules in {cold_ms:.1f} ms, "
+          f"{warm_ms:.3f} ms from the read cache")
+
+
+def check_progress() -> None:
+    progress = ProgressAggregates(open_content_store())
+    assert progress.complete_lesson("ana", "mod1", 1)
+    assert not progress.complete_lesson("ana", "mod1", 1)
+    assert not progress.complete_lesson("ana", "mod1", 99)
+    assert progress.complete_module("ana", "mod1")
+    assert not progress.complete_module("ana", "mod1")
+    assert progress.complete_module("ana", "mod5")
+    progress.complete_module("ben", "mod2")
+
+    beginner = progress.level("ana", "Beginner")
+    assert (beginner.completed_modules, beginner.completed_lessons, beginner.hours) == (1, 1, 12)
+    assert beginner.percent_complete == 50.0
+    assert progress.level("ana", "Intermediate").completed_modules == 1
+    assert progress.totals("ana").hours == 32
+    assert progress.level("ben", "Beginner").completed_modules == 1
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        progress.level("ana", "Beginner")
+    read_us = (time.perf_counter() - start) * 1000
+    print(f"progress: level overview read in {read_us:.1f} us")
+
+
+def check_session_store() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "sessions.sqlite"
+        # A long interval so only explicit flushes write
+        store = SessionStore(path, flush_interval=60)
+        start = time.perf_counter()
+        for step in range(1000):
+            store.put("ana", "lesson_state", {"step": step})
+        put_us = (time.perf_counter() - start) * 1e6 / 1000
+        assert store.stats()["rows_written"] == 0
+        assert store.get("ana", "lesson_state") == {"step": 999}
+        assert store.flush() == 1  # 1000 puts coalesced into one row
+
+        progress = ProgressAggregates(open_content_store(), store)
+        progress.complete_module("ana", "mod1")
+        progress.complete_lesson("ana", "mod1", 2)
+        store.close()
+
+        # A restarted process sees the state, and an older write from
+        # another process cannot overwrite a newer one
+        with SessionStore(path) as first, SessionStore(path) as second:
+            second.put("ana", "user_profile", {"name": "new"})
+            second.flush()
+            first._pending[("ana", "user_profile")] = (json.dumps({"name": "old"}), 0.0)
+            first.flush()
+            assert first.get("ana", "user_profile") == {"name": "new"}
+            reloaded = ProgressAggregates(open_content_store(), first)
+            assert reloaded.is_module_completed("ana", "mod1")
+            assert reloaded.is_lesson_completed("ana", "mod1", 2)
+            assert reloaded.level("ana", "Beginner").hours == 12
+            assert first.load("ana")["lesson_state"] == {"step": 999}
+
+            # Two processes completing different modules for one user keep both
+            ProgressAggregates(open_content_store(), first).complete_module("ben", "mod1")
+            ProgressAggregates(open_content_store(), second).complete_module("ben", "mod2")
+            first.flush()
+            second.flush()
+            assert ProgressAggregates(open_content_store(), first).totals("ben").completed_modules == 2
+            reloaded.reset("ben")
+            assert ProgressAggregates(open_content_store(), first).totals("ben").completed_modules == 0
+
+            first.delete("ben")
+            assert first.load("ben") == {}
+    print(f"session store: {put_us:.1f} us per put, 1000 puts written as 1 row")
+
+
+def check_event_log() -> None:
+    rng = np.random.default_rng(0)
+    now = time.time()
+    with tempfile.TemporaryDirectory() as tmp:
+        # Small segments so the check rotates and compacts
+        log = EventLog(tmp, segment_bytes=64 * 1024, sync_interval=60, checkpoint_events=10_000)
+        start = time.perf_counter()
+        for step in range(20_000):
+            user = f"user{step % 50}"
+            module = f"mod{step % 4 + 1}"
+            # Spread over the last 120 days
+            ts = now - (20_000 - step) * 120 * 86400 / 20_000
+            kind = step % 4
+            if kind == 0:
+                log.append(user, LESSON_STARTED, module, lesson=1, ts=ts)
+            elif kind == 1:
+                log.append(user, QUIZ_ANSWERED, module, lesson=1, correct=bool(step % 3), ts=ts)
+            elif kind == 2:
+                log.append(user, PRACTICE_SCORED, module, lesson=1, score=float(rng.random()), ts=ts)
+            else:
+                log.append(user, MODULE_COMPLETED, module, ts=ts)
+        append_us = (time.perf_counter() - start) * 1e6 / 20_000
+        log.sync()
+        assert log.stats()["segments"] > 1
+        # Syncs are batched rather than one per event
+        assert log.stats()["syncs"] <= 20_000 // log.sync_batch + 2
+
+        totals = log.totals("user1")
+        assert totals.events == 400
+        assert totals == sum((rollup for _, rollup in log.daily("user1")), type(totals)())
+        assert log.modules("user1")["mod2"].lessons_started == 0
+        assert log.modules("user1")["mod2"].quiz_answers == 200
+        assert log.modules("user1")["mod4"].modules_completed == 200
+        recent = log.recent("user1", days=7)
+        assert 0 < recent.events < totals.events
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            log.recent("user1", days=7)
+        read_us = (time.perf_counter() - start) * 1000
+
+        compacted = log.compact(retention_days=30)
+        assert compacted["dropped"] > 0
+        assert log.stats()["segments"] <= 2
+        log.append("user1", LESSON_STARTED, "mod1", lesson=2)
+        log.close()
+
+        # A crash after one more synced event, mid-way through writing the next
+        segment = sorted(Path(tmp).glob("*.log"))[-1]
+        with open(segment, "ab") as handle:
+            handle.write(json.dumps({"ts": time.time(), "user": "user1", "type": LESSON_STARTED,
+                                     "module": "mod1", "lesson": 3}).encode() + b"\n")
+            handle.write(b'{"ts": 1')
+
+        # Reopening restores the checkpoint, replays only the events after
+        # it and cuts off the torn line
+        with EventLog(tmp) as reopened:
+            assert reopened.stats()["replayed"] == 1
+            assert segment.read_bytes().endswith(b"\n")
+            assert reopened.totals("user1").events == totals.events + 2
+            assert reopened.daily("user1")[-1][0] == event_day(time.time())
+            assert min(event["ts"] for event in reopened.iter_events()) >= now - 31 * 86400
+
+            # A second process appending to the same directory: each sees
+            # the other's events, including across a rotation and compaction
+            with EventLog(tmp, segment_bytes=4096) as other:
+                for step in range(200):
+                    (reopened if step % 2 else other).append("shared", LESSON_STARTED, "mod1")
+                other.compact()
+                reopened.append("shared", LESSON_STARTED, "mod1")
+                assert other.totals("shared").lessons_started == 201
+                assert reopened.totals("shared").lessons_started == 201
+
+                # A compaction in one process while the other scans the
+                # segments it merges: the scan neither fails nor repeats events
+                for _ in range(200):
+                    other.append("shared", LESSON_STARTED, "mod2")
+                scan = reopened.iter_events("shared")
+                seqs = [next(scan)["seq"]]
+                other.compact()
+                seqs += [event["seq"] for event in scan]
+                assert len(seqs) == 401 and seqs == sorted(set(seqs)), len(seqs)
+        with EventLog(tmp) as reopened:
+            assert reopened.totals("shared").lessons_started == 401
+    print(f"event log: {append_us:.1f} us per append, weekly rollup read in {read_us:.1f} us, "
+          f"compaction dropped {compacted['dropped']} old events")
+
+
+def check_analytics() -> None:
+    rng = np.random.default_rng(1)
+    signs = ["Hello", "Thanks", "Yes", "No"]
+    n = 200_000
+    kinds = rng.integers(0, 3, n)
+    users = rng.integers(0, 500, n)
+    lessons = rng.integers(1, 4, n)
+    scores = rng.random(n)
+    events = []
+    for i in range(n):
+        event = {"ts": 1.7e9 + i, "user": f"user{users[i]}", "module": "mod1", "lesson": int(lessons[i])}
+        if kinds[i] == 0:
+            event["type"] = LESSON_STARTED
+        elif kinds[i] == 1:
+            event.update(type=QUIZ_ANSWERED, question=int(lessons[i]), correct=bool(scores[i] < 0.6))
+        else:
+            event.update(type=PRACTICE_SCORED, sign=signs[i % 4], score=float(scores[i]))
+        events.append(event)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        assert write_columnar(events, tmp, chunk_rows=8192) == n
+        columnar = ColumnarEvents(tmp)
+        assert len(columnar) == n
+
+        practice = kinds == 2
+        start = time.perf_counter()
+        by_sign = {row["sign"]: row for row in columnar.practice_accuracy_by_sign()}
+        query_ms = (time.perf_counter() - start) * 1000
+        scan = columnar.last_scan
+        assert scan["skipped"] > scan["read"]
+        for position, sign in enumerate(signs):
+            selected = practice & (np.arange(n) % 4 == position)
+            assert by_sign[sign]["attempts"] == selected.sum()
+            assert np.isclose(by_sign[sign]["accuracy"], scores[selected].mean())
+            assert by_sign[sign]["learners"] == len(np.unique(users[selected]))
+
+        dropoff = columnar.lesson_dropoff("mod1")
+        assert [row["lesson"] for row in dropoff] == [1, 2, 3] and dropoff[0]["dropoff"] is None
+        quiz = columnar.quiz_item_difficulty()
+        assert all(abs(row["difficulty"] - 0.4) < 0.02 for row in quiz)
+        window = columnar.query(where={"ts": (1.7e9 + 1000, 1.7e9 + 1999)}, agg={"rows": ("*", "count")})
+        assert window == [{"rows": 1000}]
+        assert columnar.query(where={"sign": "Goodbye"}) == []
+
+        # Incremental export from the event log
+        now = time.time()
+        with EventLog(Path(tmp) / "events", segment_bytes=1024) as log:
+            log.append("ana", PRACTICE_SCORED, "mod1", lesson=1, sign="Hello", score=0.5, ts=now)
+            assert export_event_log(log, Path(tmp) / "export") == 1
+            # Same timestamp, and an older one as from another process's
+            # late write: both follow the exported event in the log
+            log.append("ana", LESSON_STARTED, "mod1", lesson=2, ts=now)
+            log.append("ben", LESSON_STARTED, "mod1", lesson=1, ts=now - 5)
+            assert export_event_log(log, Path(tmp) / "export") == 2
+            for step in range(40):
+                log.append("ana", QUIZ_ANSWERED, "mod1", lesson=3, correct=True, ts=now)
+            log.compact()
+            log.append("ana", MODULE_COMPLETED, "mod1", ts=now)
+            assert export_event_log(log, Path(tmp) / "export") == 41
+            assert export_event_log(log, Path(tmp) / "export") == 0
+        assert len(ColumnarEvents(Path(tmp) / "export")) == 44
+    print(f"analytics: accuracy per sign over {n} events in {query_ms:.1f} ms, "
+          f"{scan['skipped']} of {len(columnar.chunks)} chunks skipped")
+
+
+def check_streaming() -> None:
+    reference = synthetic_sign(4, frames=30)
+
+    def slow_extract(frame: np.ndarray) -> np.ndarray:
+        time.sleep(0.004)  # slower than the 1 ms frame interval below
+        return reference[int(frame[0, 0, 0]) % len(reference)]
+
+    pipeline = practice_pipeline(synthetic_frames(200, fps=1000), slow_extract, reference)
+    scores = [item.payload for item in pipeline]
+    stats = pipeline.stats()
+    assert stats["decode"]["processed"] == 200
+    assert stats["decode"]["dropped"] > 0
+    assert len(scores) == stats["score"]["processed"] < 200
+    print(f"streaming: {len(scores)}/200 frames scored, "
+          f"{stats['decode']['dropped']} dropped at the extractor")
+
+
+def _broken_estimator() -> StubEstimator:
+    raise OSError("no camera")
+
+
+def check_worker_pool() -> None:
+    frames = [frame for _, frame in synthetic_frames(64)]
+    expected = StubEstimator()
+    with LandmarkWorkerPool(StubEstimator, frames[0].shape, workers=2) as pool:
+        start = time.perf_counter()
+        landmarks = list(pool.map(frames))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    for frame, result in zip(frames, landmarks):
+        assert np.allclose(result, expected.estimate(frame))
+    print(f"worker pool: {len(frames)} frames through {pool.workers} workers in {elapsed_ms:.0f} ms")
+
+    # Frames that don't match the pool are refused before touching shared memory
+    with LandmarkWorkerPool(StubEstimator, frames[0].shape, workers=1) as pool:
+        for bad in (frames[0].astype(np.float32), frames[0][:-1]):
+            try:
+                pool.submit(bad)
+                raise AssertionError("mismatched frame accepted")
+            except ValueError:
+                pass
+
+    # Workers that cannot build an estimator fail the frames instead of hanging
+    with LandmarkWorkerPool(_broken_estimator, frames[0].shape, workers=2) as pool:
+        future = pool.submit(frames[0])
+        try:
+            future.result(timeout=30)
+            raise AssertionError("frame ran without an estimator")
+        except RuntimeError as exc:
+            assert "no camera" in str(exc), exc
+        try:
+            pool.submit(frames[1], timeout=30)
+            raise AssertionError("pool without workers accepted a frame")
+        except RuntimeError:
+            pass
+
+
+def check_codec() -> None:
+    # Webcam-style coordinates with a hand missing for a few frames
+    seq = synthetic_sign(8, frames=90) * 0.2 + 0.5
+    seq[10:20, 33:54] = np.nan
+    as_json = json.dumps(np.where(np.isnan(seq), None, seq).tolist()).encode()
+
+    blob = encode_sequence(seq)
+    decoded = decode_sequence(blob)
+    error = float(np.nanmax(np.abs(decoded - seq)))
+    assert np.array_equal(np.isnan(decoded), np.isnan(seq))
+    assert error <= max_error(blob) * 1.001, (error, max_error(blob))
+    ratio = len(as_json) / len(blob)
+    assert ratio >= 10, ratio
+
+    # A joint far outside int16 range at the default step (shoulders are
+    # ~0.1 apart here): the step coarsens rather than clipping, and
+    # max_error reports it
+    far = seq.copy()
+    far[50, 0] += 100.0
+    far_blob = encode_sequence(far)
+    assert max_error(far_blob) > max_error(blob)
+    assert float(np.nanmax(np.abs(decode_sequence(far_blob) - far))) <= max_error(far_blob) * 1.001
+    print(f"codec: {len(as_json)} B as JSON -> {len(blob)} B ({ratio:.1f}x), "
+          f"max error {error:.1e}")
+
+
+if __name__ == "__main__":
+    check_scoring()
+    check_batch_scoring()
+    check_normalization()
+    check_feedback()
+    check_alignment()
+    check_codec()
+    check_sign_library()
+    check_recognition()
+    check_retrieval()
+    check_embedding_store()
+    check_chat()
+    check_answer_cache()
+    check_keywords()
+    check_grading()
+    check_content_store()
+    check_progress()
+    check_session_store()
+    check_event_log()
+    check_analytics()
+    check_adaptive()
+    check_streaming()
+    check_worker_pool()
+    print("✅ Backend checks passed")
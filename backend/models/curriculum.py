@@ -0,0 +1,318 @@
+"""
+Curriculum content
+
+Module catalogue, lesson templates, placement assessment questions and
+learning paths. This is the source of the content store
+(`backend/core/content_store.py`), which the pages and the search index
+read; scoring reads the question and learning path tables directly.
+"""
+
+# Module database - abbreviated for space
+MODULES_DATABASE = {
+    "Beginner": [
+        {
+            "id": "mod1",
+            "title": "ASL Alphabet & Fingerspelling Fundamentals",
+            "description": "Master the foundation of American Sign Language by learning the manual alphabet and fingerspelling techniques.",
+            "difficulty": "Beginner",
+            "duration": "2 weeks",
+            "lessons_count": 8,
+            "estimated_hours": 12,
+            "skills": ["Hand shapes", "Letter formation", "Spelling fluency", "Recognition speed"],
+            "lessons": [
+                {"title": "Introduction to Manual Alphabet", "duration": "45 min", "type": "Video"},
+                {"title": "Letters A-M Practice", "duration": "90 min", "type": "Interactive"},
+                {"title": "Letters N-Z Practice", "duration": "90 min", "type": "Interactive"},
+                {"title": "Common Words", "duration": "60 min", "type": "Practice"},
+                {"title": "Speed Drills", "duration": "45 min", "type": "Practice"},
+                {"title": "Reading Practice", "duration": "60 min", "type": "Interactive"},
+                {"title": "Names and Places", "duration": "45 min", "type": "Practice"},
+                {"title": "Assessment", "duration": "30 min", "type": "Quiz"}
+            ]
+        },
+        {
+            "id": "mod2",
+            "title": "Basic Greetings and Introductions",
+            "description": "Learn essential signs for everyday greetings, introductions, and simple conversations.",
+            "difficulty": "Beginner",
+            "duration": "2 weeks",
+            "lessons_count": 10,
+            "estimated_hours": 15,
+            "skills": ["Basic vocabulary", "Social phrases", "Question formation", "Polite expressions"],
+            "lessons": [
+                {"title": "Common Greetings", "duration": "60 min", "type": "Video"},
+                {"title": "Introducing Yourself", "duration": "75 min", "type": "Interactive"},
+                {"title": "Asking Questions", "duration": "90 min", "type": "Interactive"},
+                {"title": "Polite Phrases", "duration": "45 min", "type": "Practice"},
+                {"title": "Family Signs", "duration": "60 min", "type": "Interactive"},
+                {"title": "Feelings", "duration": "60 min", "type": "Practice"},
+                {"title": "Yes/No Questions", "duration": "45 min", "type": "Interactive"},
+                {"title": "Practice Conversations", "duration": "90 min", "type": "Practice"},
+                {"title": "Deaf Etiquette", "duration": "45 min", "type": "Video"},
+                {"title": "Assessment", "duration": "40 min", "type": "Quiz"}
+            ]
+        }
+    ],
+    "Intermediate": [
+        {
+            "id": "mod5",
+            "title": "Advanced Conversational Phrases",
+            "description": "Take your signing to the next level with complex sentence structures and natural conversational flow.",
+            "difficulty": "Intermediate",
+            "duration": "3 weeks",
+            "lessons_count": 12,
+            "estimated_hours": 20,
+            "skills": ["Complex sentences", "Idioms", "Conversational flow", "Natural expressions"],
+            "lessons": [
+                {"title": "Complex Sentence Structures", "duration": "90 min", "type": "Video"},
+                {"title": "ASL Idioms", "duration": "75 min", "type": "Interactive"},
+                {"title": "Describing People", "duration": "90 min", "type": "Interactive"},
+                {"title": "Expressing Opinions", "duration": "75 min", "type": "Practice"},
+                {"title": "Making Plans", "duration": "90 min", "type": "Interactive"},
+                {"title": "Past Events", "duration": "90 min", "type": "Interactive"},
+                {"title": "Future Plans", "duration": "90 min", "type": "Interactive"},
+                {"title": "Giving Directions", "duration": "75 min", "type": "Practice"},
+                {"title": "Agreement", "duration": "60 min", "type": "Practice"},
+                {"title": "Clarification Strategies", "duration": "60 min", "type": "Interactive"},
+                {"title": "Extended Practice", "duration": "120 min", "type": "Practice"},
+                {"title": "Assessment", "duration": "60 min", "type": "Quiz"}
+            ]
+        }
+    ],
+    "Advanced": [
+        {
+            "id": "mod9",
+            "title": "Professional and Technical Signing",
+            "description": "Master specialized vocabulary for professional settings including medical, legal, and business contexts.",
+            "difficulty": "Advanced",
+            "duration": "4 weeks",
+            "lessons_count": 14,
+            "estimated_hours": 25,
+            "skills": ["Professional vocabulary", "Technical terms", "Formal register", "Specialized contexts"],
+            "lessons": [
+                {"title": "Professional Communication", "duration": "90 min", "type": "Video"},
+                {"title": "Medical Terminology", "duration": "120 min", "type": "Interactive"},
+                {"title": "Legal Terms", "duration": "120 min", "type": "Interactive"},
+                {"title": "Educational Settings", "duration": "90 min", "type": "Practice"},
+                {"title": "Business Vocabulary", "duration": "90 min", "type": "Interactive"},
+                {"title": "Technology Signs", "duration": "90 min", "type": "Interactive"},
+                {"title": "Financial Terms", "duration": "75 min", "type": "Practice"},
+                {"title": "Meeting Skills", "duration": "120 min", "type": "Interactive"},
+                {"title": "Interview Signing", "duration": "90 min", "type": "Practice"},
+                {"title": "Formal Register", "duration": "75 min", "type": "Video"},
+                {"title": "Professional Networking", "duration": "90 min", "type": "Interactive"},
+                {"title": "Workplace Scenarios", "duration": "120 min", "type": "Practice"},
+                {"title": "Case Studies", "duration": "90 min", "type": "Project"},
+                {"title": "Assessment", "duration": "75 min", "type": "Quiz"}
+            ]
+        }
+    ]
+}
+
+# Dummy lesson content database
+LESSON_CONTENT = {
+    "Video": {
+        "template": "video_template",
+        "video_url": "https://www.youtube.com/embed/dQw4w9WgXcQ",
+        "transcript": """
+        Welcome to this lesson on American Sign Language!
+
+        In this video, you'll learn the fundamental hand shapes and movements
+        needed to communicate effectively in sign language. Pay close attention
+        to the positioning of fingers and the direction of movement.
+
+        Remember: Sign language is a complete language with its own grammar and syntax!
+        """,
+        "key_points": [
+            "Hand shape is crucial for accuracy",
+            "Movement direction changes meaning",
+            "Facial expressions are part of grammar",
+            "Practice slowly at first for precision"
+        ]
+    },
+    "Interactive": {
+        "template": "interactive_template",
+        "demo_video": "https://www.youtube.com/embed/dQw4w9WgXcQ",
+        "instructions": "Watch the demonstration carefully, then practice the sign yourself using your camera.",
+        "sign_name": "Hello",
+        "feedback_tips": [
+            "Keep your hand at chest level",
+            "Move your hand forward smoothly",
+            "Maintain eye contact",
+            "Smile naturally"
+        ]
+    },
+    "Practice": {
+        "template": "practice_template",
+        "challenges": [
+            {"sign": "Hello", "difficulty": "Easy", "points": 10},
+            {"sign": "Thank You", "difficulty": "Easy", "points": 10},
+            {"sign": "Please", "difficulty": "Medium", "points": 15},
+            {"sign": "Sorry", "difficulty": "Medium", "points": 15},
+            {"sign": "Help", "difficulty": "Hard", "points": 20}
+        ]
+    },
+    "Quiz": {
+        "template": "quiz_template",
+        "questions": [
+            {
+                "question": "What is the most important aspect of sign language?",
+                "options": [
+                    "Speed of signing",
+                    "Hand shape, movement, and location",
+                    "Looking serious",
+                    "Speaking while signing"
+                ],
+                "correct": 1,
+                "explanation": "Sign language relies on precise hand shapes, movements, and locations. All three parameters must be correct for the sign to be understood."
+            },
+            {
+                "question": "True or False: Facial expressions are optional in sign language.",
+                "options": ["True", "False"],
+                "correct": 1,
+                "explanation": "False! Facial expressions are grammatical markers in sign language and can change the meaning of signs."
+            },
+            {
+                "question": "Which of these is NOT a parameter of sign formation?",
+                "options": [
+                    "Hand shape",
+                    "Movement",
+                    "Voice tone",
+                    "Location"
+                ],
+                "correct": 2,
+                "explanation": "Voice tone is not a parameter of sign formation. Sign language is visual, not auditory."
+            }
+        ]
+    }
+}
+
+# Placement assessment questions
+QUIZ_QUESTIONS = {
+    "multiple_choice": [
+        {
+            "id": "mc1",
+            "question": "What is sign language primarily based on?",
+            "options": [
+                "Finger spelling only",
+                "Visual-manual gestures including hand shapes, movements, and facial expressions",
+                "Written symbols",
+                "Morse code patterns"
+            ],
+            "correct": 1,
+            "difficulty": "beginner"
+        },
+        {
+            "id": "mc2",
+            "question": "American Sign Language (ASL) is the same as British Sign Language (BSL).",
+            "options": [
+                "True - All sign languages are universal",
+                "False - Different countries have different sign languages",
+                "Partially true - They share 50% of signs",
+                "True - Only the accents differ"
+            ],
+            "correct": 1,
+            "difficulty": "beginner"
+        },
+        {
+            "id": "mc3",
+            "question": "In sign language, what role do facial expressions play?",
+            "options": [
+                "They are optional and just for emphasis",
+                "They are grammatical markers that can change meaning",
+                "They are only used for emotions",
+                "They have no significance"
+            ],
+            "correct": 1,
+            "difficulty": "intermediate"
+        },
+        {
+            "id": "mc4",
+            "question": "What is 'fingerspelling' in sign language?",
+            "options": [
+                "Making up signs randomly",
+                "Spelling out words letter by letter using hand shapes",
+                "A warm-up exercise",
+                "Pointing at written letters"
+            ],
+            "correct": 1,
+            "difficulty": "beginner"
+        },
+        {
+            "id": "mc5",
+            "question": "In ASL, what do raised eyebrows usually mark?",
+            "options": [
+                "A past-tense verb",
+                "A yes/no question",
+                "The end of a story",
+                "A fingerspelled name"
+            ],
+            "correct": 1,
+            "difficulty": "intermediate"
+        }
+    ],
+    "short_answer": [
+        {
+            "id": "sa1",
+            "question": "Why is it important to learn sign language? (Write 2-3 sentences)",
+            "difficulty": "beginner"
+        },
+        {
+            "id": "sa2",
+            "question": "Describe what you know about deaf culture or the deaf community.",
+            "difficulty": "intermediate"
+        }
+    ]
+}
+
+# Learning path recommended for each placement level
+LEARNING_PATHS = {
+    "Beginner": {
+        "modules": [
+            "ASL Alphabet & Fingerspelling Fundamentals",
+            "Basic Greetings and Introductions",
+            "Numbers and Colors in Sign Language",
+            "Common Everyday Phrases"
+        ],
+        "focus_areas": [
+            "Hand shape formation",
+            "Basic vocabulary building",
+            "Understanding sign language structure",
+            "Introduction to deaf culture"
+        ],
+        "estimated_time": "2-3 months for foundational skills",
+        "next_steps": "Start with daily practice of the alphabet and basic signs for 15-20 minutes"
+    },
+    "Intermediate": {
+        "modules": [
+            "Advanced Conversational Phrases",
+            "Grammar and Sentence Structure",
+            "Storytelling in Sign Language",
+            "Regional Sign Variations"
+        ],
+        "focus_areas": [
+            "Facial expressions and non-manual markers",
+            "Sentence structure and grammar",
+            "Expanding vocabulary to 500+ signs",
+            "Understanding context and nuance"
+        ],
+        "estimated_time": "3-4 months to advance skills",
+        "next_steps": "Practice conversational signing for 30 minutes daily and engage with deaf community events"
+    },
+    "Advanced": {
+        "modules": [
+            "Professional and Technical Signing",
+            "ASL Literature and Poetry",
+            "Interpreting Techniques",
+            "Deaf History and Advocacy"
+        ],
+        "focus_areas": [
+            "Fluency and natural expression",
+            "Complex grammatical structures",
+            "Cultural competency",
+            "Advanced storytelling and narrative techniques"
+        ],
+        "estimated_time": "Ongoing refinement and specialization",
+        "next_steps": "Consider interpreter certification programs or community teaching opportunities"
+    }
+}
@@ -5,6 +5,11 @@ from pathlib import Path
 # Add backend directory to path for imports
 backend_path = Path(__file__).parent.parent / "backend"
 sys.path.insert(0, str(backend_path))
+# Make the `backend` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.core.content_store import open_content_store  # noqa: E402
+from frontend.components import html, inject_styles  # noqa: E402
 
 # Page configuration
 st.set_page_config(
@@ -14,73 +19,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
-    <style>
-    .hero-section {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 3rem 2rem;
-        border-radius: 20px;
-        color: white;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .hero-title {
-        font-size: 3.5rem;
-        font-weight: bold;
-        margin-bottom: 1rem;
-    }
-    .hero-subtitle {
-        font-size: 1.5rem;
-        margin-bottom: 2rem;
-        opacity: 0.95;
-    }
-    .feature-card {
-        background: linear-gradient(145deg, #ffffff, #f0f0f0);
-        padding: 2rem;
-        border-radius: 15px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        height: 100%;
-        transition: transform 0.3s ease, box-shadow 0.3s ease;
-    }
-    .feature-card:hover {
-        transform: translateY(-10px);
-        box-shadow: 0 8px 12px rgba(0, 0, 0, 0.15);
-    }
-    .feature-icon {
-        font-size: 3rem;
-        margin-bottom: 1rem;
-    }
-    .how-it-works {
-        background-color: #f8f9fa;
-        padding: 2rem;
-        border-radius: 15px;
-        margin: 2rem 0;
-    }
-    .step-card {
-        background: white;
-        padding: 1.5rem;
-        border-radius: 10px;
-        border-left: 5px solid #1E88E5;
-        margin-bottom: 1rem;
-        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-    }
-    .cta-section {
-        background: linear-gradient(120deg, #84fab0 0%, #8fd3f4 100%);
-        padding: 2rem;
-        border-radius: 15px;
-        text-align: center;
-        margin-top: 2rem;
-    }
-    .stats-box {
-        background: linear-gradient(145deg, #ffffff, #f8f9fa);
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-    }
-    </style>
-""", unsafe_allow_html=True)
+# Page styles, fetched once and cached by the browser
+inject_styles("home")
 
 # Sidebar
 with st.sidebar:
@@ -100,11 +40,11 @@ with st.sidebar:
     st.markdown("---")
     st.markdown("### 🌟 Quick Stats")
     st.metric("Active Features", "4+")
-    st.metric("Learning Modules", "500+")
+    st.metric("Learning Modules", open_content_store().count_modules())
     st.metric("AI Models", "3")
 
 # Hero Section
-st.markdown("""
+html("""
     <div class="hero-section">
         <div class="hero-title">🤟 Welcome to Poselinguo</div>
         <div class="hero-subtitle">
@@ -116,7 +56,7 @@ st.markdown("""
             accessible, engaging, and effective for everyone.
         </p>
     </div>
-""", unsafe_allow_html=True)
+""")
 
 # Project Overview
 st.markdown("## 📖 What is Poselinguo?")
@@ -140,79 +80,79 @@ st.markdown("## ✨ Key Features")
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    st.markdown("""
+    html("""
         <div class="feature-card">
             <div class="feature-icon">🤖</div>
             <h3>AI-Powered Learning</h3>
             <p>Advanced deep learning models analyze your signing in real-time, providing instant feedback
             on accuracy, hand positioning, and movement patterns.</p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 with col2:
-    st.markdown("""
+    html("""
         <div class="feature-card">
             <div class="feature-icon">📚</div>
             <h3>Personalized Path</h3>
             <p>Take an initial assessment to determine your level, then receive customized learning modules
             and exercises tailored to your proficiency and goals.</p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 with col3:
-    st.markdown("""
+    html("""
         <div class="feature-card">
             <div class="feature-icon">💬</div>
             <h3>RAG Chat Assistant</h3>
             <p>Ask questions about any pose or sign using natural language. Our RAG-powered AI provides
             instant, contextual answers to help you learn faster.</p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
-st.markdown("<br>", unsafe_allow_html=True)
+html("<br>")
 
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    st.markdown("""
+    html("""
         <div class="feature-card">
             <div class="feature-icon">🎥</div>
             <h3>Video Learning</h3>
             <p>Watch demonstrations and guess signs, then practice with your camera on to compare
             your poses with tutorial examples.</p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 with col2:
-    st.markdown("""
+    html("""
         <div class="feature-card">
             <div class="feature-icon">🎯</div>
             <h3>Real-Time Scoring</h3>
             <p>Get immediate feedback with detailed scoring on your pose accuracy, helping you
             improve quickly and track your progress.</p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 with col3:
-    st.markdown("""
+    html("""
         <div class="feature-card">
             <div class="feature-icon">📊</div>
             <h3>Progress Analytics</h3>
             <p>Monitor your learning journey with comprehensive analytics, tracking modules completed,
             practice time, and skill improvements.</p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 st.markdown("---")
 
 # How It Works
 st.markdown("## 🚀 How It Works")
-st.markdown('<div class="how-it-works">', unsafe_allow_html=True)
+html('<div class="how-it-works">')
 
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    st.markdown("""
+    html("""
         <div class="step-card">
             <h3>1️⃣ Assessment</h3>
             <p><strong>Take a quick test</strong> to identify your current sign language proficiency level:</p>
@@ -222,10 +162,10 @@ with col1:
                 <li>Advanced</li>
             </ul>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 with col2:
-    st.markdown("""
+    html("""
         <div class="step-card">
             <h3>2️⃣ Personalization</h3>
             <p><strong>Complete a questionnaire</strong> about your:</p>
@@ -235,10 +175,10 @@ with col2:
                 <li>Available time</li>
             </ul>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 with col3:
-    st.markdown("""
+    html("""
         <div class="step-card">
             <h3>3️⃣ Generate Path</h3>
             <p><strong>Receive custom materials</strong> including:</p>
@@ -248,14 +188,14 @@ with col3:
                 <li>Progress milestones</li>
             </ul>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
-st.markdown("<br>", unsafe_allow_html=True)
+html("<br>")
 
 col1, col2 = st.columns(2)
 
 with col1:
-    st.markdown("""
+    html("""
         <div class="step-card">
             <h3>4️⃣ Interactive Learning</h3>
             <p><strong>Study your modules</strong> with engaging activities:</p>
@@ -265,10 +205,10 @@ with col1:
                 <li><strong>Instant Feedback:</strong> Get scoring and corrections immediately</li>
             </ul>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 with col2:
-    st.markdown("""
+    html("""
         <div class="step-card">
             <h3>5️⃣ Continuous Support</h3>
             <p><strong>Access help anytime</strong> with:</p>
@@ -278,9 +218,9 @@ with col2:
                 <li><strong>Instant Answers:</strong> Get context-aware responses powered by RAG</li>
             </ul>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
-st.markdown('</div>', unsafe_allow_html=True)
+html('</div>')
 
 st.markdown("---")
 
@@ -290,7 +230,7 @@ st.markdown("## 🛠️ Technology Stack")
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    st.markdown("""
+    html("""
         <div class="stats-box">
             <h3>🎨 Frontend</h3>
             <ul style="text-align: left; display: inline-block;">
@@ -299,10 +239,10 @@ with col1:
                 <li>Responsive Design</li>
             </ul>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 with col2:
-    st.markdown("""
+    html("""
         <div class="stats-box">
             <h3>🧠 AI/ML</h3>
             <ul style="text-align: left; display: inline-block;">
@@ -311,10 +251,10 @@ with col2:
                 <li>Computer Vision</li>
             </ul>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 with col3:
-    st.markdown("""
+    html("""
         <div class="stats-box">
             <h3>⚙️ Backend</h3>
             <ul style="text-align: left; display: inline-block;">
@@ -323,7 +263,7 @@ with col3:
                 <li>NLP Processing</li>
             </ul>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 st.markdown("---")
 
@@ -361,14 +301,14 @@ with col2:
 st.markdown("---")
 
 # Call to Action
-st.markdown("""
+html("""
     <div class="cta-section">
         <h2 style="color: #1E3A8A; margin-bottom: 1rem;">🎉 Ready to Start Your Journey?</h2>
         <p style="font-size: 1.2rem; color: #334155; margin-bottom: 2rem;">
             Join our community of learners and start mastering sign language today!
         </p>
     </div>
-""", unsafe_allow_html=True)
+""")
 
 col1, col2, col3 = st.columns([1, 2, 1])
 with col2:
@@ -376,7 +316,7 @@ with col2:
         st.balloons()
         st.success("🎉 Welcome to Poselinguo! Navigate to the About page to learn more about our team, or start exploring the features above!")
 
-st.markdown("<br>", unsafe_allow_html=True)
+html("<br>")
 
 # Quick Links
 col1, col2, col3 = st.columns(3)
@@ -388,15 +328,15 @@ with col2:
         st.info("📖 Check out the **Documentation** page for detailed guides!")
 with col3:
     if st.button("💬 Try AI Chat", use_container_width=True):
-        st.info("🚧 AI Chat feature coming soon!")
+        st.switch_page("pages/Chat.py")
 
 st.markdown("---")
 
 # Footer
-st.markdown("""
+html("""
     <div style="text-align: center; color: #666; padding: 2rem 0;">
         <p style="font-size: 1.1rem;"><strong>Poselinguo</strong> - Empowering Communication Through AI</p>
         <p>Breaking barriers, building bridges through sign language education 🤟</p>
         <p style="font-size: 0.9rem; margin-top: 1rem;">Made with ❤️ by Team Poselinguo | © 2024</p>
     </div>
-""", unsafe_allow_html=True)
+""")
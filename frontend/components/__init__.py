@@ -0,0 +1,16 @@
+"""
+Shared page components
+"""
+
+from .cards import compact, content_version, html, lesson_item, module_card, stat_row
+from .styles import inject_styles
+
+__all__ = [
+    'compact',
+    'content_version',
+    'html',
+    'inject_styles',
+    'lesson_item',
+    'module_card',
+    'stat_row',
+]
@@ -0,0 +1,129 @@
+"""
+HTML fragments
+
+Builders for the HTML cards the pages render with `st.markdown`. Fragments
+built from catalogue content are memoized per content version (the
+content store fingerprint), so a rerun reuses the same string instead of
+formatting it again, and a content update builds fresh ones.
+
+Markup is sent with its indentation collapsed, which is most of the bytes
+of a typical card.
+"""
+
+import re
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+import streamlit as st
+
+from backend.core.content_store import open_content_store
+
+_INDENT = re.compile(r"^[ \t]+", re.MULTILINE)
+
+# (icon, text, badge class) per module status; "" means the module's difficulty badge
+MODULE_STATUS = {
+    "completed": ("✅", "Completed", "badge-completed"),
+    "in_progress": ("🔄", "In Progress", ""),
+    "available": ("📖", "Available", ""),
+}
+
+
+@lru_cache(maxsize=1024)
+def compact(markup: str) -> str:
+    """Markup without leading whitespace on each line"""
+    return _INDENT.sub("", markup.strip())
+
+
+def html(markup: str) -> None:
+    """Render an HTML fragment"""
+    st.markdown(compact(markup), unsafe_allow_html=True)
+
+
+def content_version() -> str:
+    """Fingerprint of the catalogue the fragments are built from"""
+    return open_content_store().fingerprint
+
+
+def stat_row(stats: Sequence[Tuple[str, ...]]) -> str:
+    """
+    A row of stat boxes as one fragment
+
+    Args:
+        stats: (label, value) per box, optionally with an extra class for
+            the value, e.g. ("Current Level", "Beginner", "stat-value-text")
+    """
+    return _stat_row(tuple(tuple(stat) for stat in stats))
+
+
+@lru_cache(maxsize=1024)
+def _stat_row(stats: Tuple[Tuple[str, ...], ...]) -> str:
+    boxes = "".join(
+        f'<div class="stat-box"><div class="stat-label">{label}</div>'
+        f'<div class="{" ".join(("stat-value", *extra))}">{value}</div></div>'
+        for label, value, *extra in stats
+    )
+    return f'<div class="stats-grid">{boxes}</div>'
+
+
+@lru_cache(maxsize=1024)
+def module_card(version: str, module_id: str, position: int, status: str) -> str:
+    """
+    Module card with its metadata and skills
+
+    Args:
+        version: content_version(), so a content update builds a new card
+        module_id: Module in the content store
+        position: Module number shown on the card
+        status: Key of MODULE_STATUS
+    """
+    module = open_content_store().module(module_id)
+    icon, text, badge = MODULE_STATUS[status]
+    badge = badge or f"badge-{module['difficulty'].lower()}"
+    skills = "".join(f"<li>{skill}</li>" for skill in module["skills"])
+    return compact(f"""
+        <div class="module-card">
+            <div class="module-header">
+                <div>
+                    <p style="color: #666; margin: 0; font-size: 0.9rem;">Module {position}</p>
+                    <h3 class="module-title">{icon} {module['title']}</h3>
+                </div>
+                <span class="module-badge {badge}">{text}</span>
+            </div>
+            <p style="color: #555; line-height: 1.6; margin: 1rem 0;">
+                {module['description']}
+            </p>
+            <div class="module-meta">
+                <span><strong>⏱️ Duration:</strong> {module['duration']}</span>
+                <span><strong>📑 Lessons:</strong> {module['lessons_count']}</span>
+                <span><strong>🎯 Hours:</strong> {module['estimated_hours']}h</span>
+                <span><strong>📊 Level:</strong> {module['difficulty']}</span>
+            </div>
+            <p class="module-skills-title"><strong>💪 Skills You'll Learn:</strong></p>
+            <ul class="module-skills">{skills}</ul>
+        </div>
+    """)
+
+
+@lru_cache(maxsize=4096)
+def lesson_item(version: str, module_id: str, lesson_index: int, completed: bool) -> str:
+    """
+    One row of a module's lesson list
+
+    Args:
+        version: content_version()
+        module_id: Module in the content store
+        lesson_index: Lesson number, from 1
+        completed: Whether the learner completed the lesson
+    """
+    lesson = open_content_store().module(module_id)["lessons"][lesson_index - 1]
+    return compact(f"""
+        <div class="lesson-item">
+            <span class="lesson-number {'lesson-completed' if completed else ''}">
+                {'✓' if completed else lesson_index}
+            </span>
+            <div class="lesson-content">
+                <p class="lesson-title">{lesson['title']}</p>
+                <p class="lesson-duration">{lesson['duration']} • {lesson['type']}</p>
+            </div>
+        </div>
+    """)
@@ -0,0 +1,37 @@
+"""
+Page styles
+
+Each page's CSS lives in `frontend/static/css/<name>.css` and is inlined
+in a `<style>` block. The files are read once per process and the block
+for each set of names is built once, so a rerun only sends the cached
+string.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Tuple
+
+import streamlit as st
+
+CSS_DIR = Path(__file__).resolve().parent.parent / "static" / "css"
+
+
+@lru_cache(maxsize=None)
+def _stylesheet(name: str) -> str:
+    """CSS text of a stylesheet"""
+    return (CSS_DIR / f"{name}.css").read_text()
+
+
+@lru_cache(maxsize=None)
+def _style_block(names: Tuple[str, ...]) -> str:
+    return "<style>" + "\n".join(_stylesheet(name) for name in names) + "</style>"
+
+
+def inject_styles(*names: str) -> None:
+    """
+    Apply stylesheets from `frontend/static/css` to the page
+
+    Args:
+        names: Stylesheet names without the `.css` suffix
+    """
+    st.markdown(_style_block(names), unsafe_allow_html=True)
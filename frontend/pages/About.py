@@ -1,5 +1,13 @@
+import sys
+from pathlib import Path
+
 import streamlit as st
 
+# Make the `frontend` package importable from the Streamlit pages
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from frontend.components import html, inject_styles  # noqa: E402
+
 # Page configuration
 st.set_page_config(
     page_title="About Us - Poselinguo",
@@ -7,90 +15,18 @@ st.set_page_config(
     layout="wide"
 )
 
-# Custom CSS for better styling
-st.markdown("""
-    <style>
-    .about-header {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 3rem 2rem;
-        border-radius: 20px;
-        color: white;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .about-title {
-        font-size: 3rem;
-        font-weight: bold;
-        margin-bottom: 0.5rem;
-    }
-    .about-subtitle {
-        font-size: 1.3rem;
-        opacity: 0.95;
-    }
-    .mission-card {
-        background: linear-gradient(145deg, #f0f8ff, #e6f3ff);
-        padding: 2rem;
-        border-radius: 15px;
-        border-left: 5px solid #1E88E5;
-        margin-bottom: 2rem;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-    }
-    .team-card {
-        background: linear-gradient(145deg, #ffffff, #f8f9fa);
-        padding: 2rem;
-        border-radius: 15px;
-        text-align: center;
-        margin-bottom: 1.5rem;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        transition: transform 0.3s ease, box-shadow 0.3s ease;
-        height: 100%;
-    }
-    .team-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 8px 12px rgba(0, 0, 0, 0.15);
-    }
-    .team-icon {
-        font-size: 4rem;
-        margin-bottom: 1rem;
-    }
-    .team-name {
-        font-size: 1.5rem;
-        font-weight: bold;
-        color: #1E88E5;
-        margin-bottom: 0.5rem;
-    }
-    .team-role {
-        font-size: 1rem;
-        color: #7B1FA2;
-        font-weight: 600;
-        margin-bottom: 1rem;
-    }
-    .value-card {
-        background: linear-gradient(145deg, #fff3e0, #ffe0b2);
-        padding: 1.5rem;
-        border-radius: 10px;
-        margin-bottom: 1rem;
-        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-    }
-    .stats-box {
-        background: linear-gradient(145deg, #e8f5e9, #c8e6c9);
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-    }
-    </style>
-""", unsafe_allow_html=True)
+# Page styles, fetched once and cached by the browser
+inject_styles("about")
 
 # Header Section
-st.markdown("""
+html("""
     <div class="about-header">
         <div class="about-title">👥 About Us</div>
         <div class="about-subtitle">
             Meet the passionate team behind Poselinguo
         </div>
     </div>
-""", unsafe_allow_html=True)
+""")
 
 # Mission & Vision
 st.markdown("## 🎯 Our Mission & Vision")
@@ -98,7 +34,7 @@ st.markdown("## 🎯 Our Mission & Vision")
 col1, col2 = st.columns(2)
 
 with col1:
-    st.markdown("""
+    html("""
         <div class="mission-card">
             <h3>🚀 Our Mission</h3>
             <p style="font-size: 1.1rem; line-height: 1.6;">
@@ -111,10 +47,10 @@ with col1:
                 of hearing ability, and that technology can be a powerful tool in bridging communication gaps.
             </p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 with col2:
-    st.markdown("""
+    html("""
         <div class="mission-card">
             <h3>🌟 Our Vision</h3>
             <p style="font-size: 1.1rem; line-height: 1.6;">
@@ -127,7 +63,7 @@ with col2:
                 who can connect, communicate, and collaborate without limitations.
             </p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 st.markdown("---")
 
@@ -154,7 +90,7 @@ st.markdown("### The People Building the Future of Sign Language Education")
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    st.markdown("""
+    html("""
         <div class="team-card">
             <div class="team-icon">👨‍💻</div>
             <div class="team-name">Huy Mai</div>
@@ -171,10 +107,10 @@ with col1:
                 • Model Optimization
             </p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 with col2:
-    st.markdown("""
+    html("""
         <div class="team-card">
             <div class="team-icon">👩‍💻</div>
             <div class="team-name">Tram Anh</div>
@@ -191,10 +127,10 @@ with col2:
                 • Accessibility Features
             </p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 with col3:
-    st.markdown("""
+    html("""
         <div class="team-card">
             <div class="team-icon">👨‍💻</div>
             <div class="team-name">Phuoc Chu</div>
@@ -211,10 +147,10 @@ with col3:
                 • System Integration
             </p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 with col4:
-    st.markdown("""
+    html("""
         <div class="team-card">
             <div class="team-icon">👨‍🏫</div>
             <div class="team-name">Huy Vo</div>
@@ -231,7 +167,7 @@ with col4:
                 • Team Development
             </p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 st.markdown("---")
 
@@ -241,55 +177,55 @@ st.markdown("## 💎 Our Core Values")
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    st.markdown("""
+    html("""
         <div class="value-card">
             <h3>🌍 Accessibility</h3>
             <p>We believe education should be accessible to everyone, everywhere. Our platform is designed
             to remove barriers and provide equal learning opportunities.</p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
-    st.markdown("""
+    html("""
         <div class="value-card">
             <h3>🚀 Innovation</h3>
             <p>We embrace cutting-edge technology and continuously push the boundaries of what's possible
             in AI-powered education.</p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 with col2:
-    st.markdown("""
+    html("""
         <div class="value-card">
             <h3>🤝 Inclusivity</h3>
             <p>We're committed to fostering a community where everyone feels welcome and supported,
             regardless of their background or ability level.</p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
-    st.markdown("""
+    html("""
         <div class="value-card">
             <h3>📚 Learning-First</h3>
             <p>Every feature we build is designed with learner success in mind. We prioritize effectiveness
             and engagement in everything we do.</p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 with col3:
-    st.markdown("""
+    html("""
         <div class="value-card">
             <h3>💡 Transparency</h3>
             <p>We believe in open communication and clear explanations of how our AI systems work and make
             decisions about your learning path.</p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
-    st.markdown("""
+    html("""
         <div class="value-card">
             <h3>🌱 Growth</h3>
             <p>We're dedicated to continuous improvement - both in our technology and in supporting
             your personal learning journey.</p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 st.markdown("---")
 
@@ -299,42 +235,42 @@ st.markdown("## 📊 Our Impact & Goals")
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    st.markdown("""
+    html("""
         <div class="stats-box">
             <h2 style="color: #1E88E5; margin: 0;">500+</h2>
             <p style="margin: 0.5rem 0 0 0;"><strong>Sign Lessons</strong></p>
             <p style="font-size: 0.9rem; color: #666;">Comprehensive curriculum</p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 with col2:
-    st.markdown("""
+    html("""
         <div class="stats-box">
             <h2 style="color: #1E88E5; margin: 0;">3</h2>
             <p style="margin: 0.5rem 0 0 0;"><strong>AI Models</strong></p>
             <p style="font-size: 0.9rem; color: #666;">Powering our platform</p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 with col3:
-    st.markdown("""
+    html("""
         <div class="stats-box">
             <h2 style="color: #1E88E5; margin: 0;">∞</h2>
             <p style="margin: 0.5rem 0 0 0;"><strong>Learning Paths</strong></p>
             <p style="font-size: 0.9rem; color: #666;">Personalized for you</p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
 with col4:
-    st.markdown("""
+    html("""
         <div class="stats-box">
             <h2 style="color: #1E88E5; margin: 0;">24/7</h2>
             <p style="margin: 0.5rem 0 0 0;"><strong>AI Support</strong></p>
             <p style="font-size: 0.9rem; color: #666;">Always available</p>
         </div>
-    """, unsafe_allow_html=True)
+    """)
 
-st.markdown("<br>", unsafe_allow_html=True)
+html("<br>")
 
 st.info("""
 **Our Commitment**: We're dedicated to continuously improving our platform, expanding our curriculum,
@@ -391,7 +327,7 @@ with col2:
 st.markdown("---")
 
 # Footer
-st.markdown("""
+html("""
     <div style="text-align: center; color: #666; padding: 2rem 0;">
         <p style="font-size: 1.2rem; margin-bottom: 1rem;">
             <strong>Poselinguo</strong> - Breaking Barriers, Building Bridges
@@ -403,4 +339,4 @@ st.markdown("""
             Made with ❤️ by Team Poselinguo | © 2024
         </p>
     </div>
-""", unsafe_allow_html=True)
+""")
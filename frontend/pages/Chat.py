@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import sys
+from pathlib import Path
+
+import streamlit as st
+
+# Make the `backend` package importable from the Streamlit pages
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from backend.core.answer_cache import AnswerCache  # noqa: E402
+from backend.core.chat import ChatAssistant, chat_metrics  # noqa: E402
+from frontend.components import html, inject_styles  # noqa: E402
+
+# Page configuration
+st.set_page_config(
+    page_title="AI Chat - Poselinguo",
+    page_icon="💬",
+    layout="wide"
+)
+
+# Page styles, fetched once and cached by the browser
+inject_styles("chat")
+
+
+@st.cache_resource
+def get_assistant() -> ChatAssistant:
+    """Load the retrieval index and answer cache once per server process"""
+    return ChatAssistant(cache=AnswerCache())
+
+
+# Initialize chat state
+if "chat_messages" not in st.session_state:
+    st.session_state.chat_messages = []
+
+# Header
+html("""
+    <div class="chat-header">
+        <h1 style="margin: 0;">💬 Chat with Poselinguo</h1>
+        <p style="margin: 0.5rem 0 0 0; opacity: 0.9;">
+            Ask about signs, hand shapes, lessons or learning modules
+        </p>
+    </div>
+""")
+
+# Conversation so far
+for message in st.session_state.chat_messages:
+    with st.chat_message(message["role"]):
+        st.markdown(message["content"])
+        if message.get("caption"):
+            st.caption(message["caption"])
+
+question = st.chat_input("Ask a question about sign language...")
+if question:
+    st.session_state.chat_messages.append({"role": "user", "content": question})
+    with st.chat_message("user"):
+        st.markdown(question)
+
+    with st.chat_message("assistant"):
+        stream = get_assistant().ask(question)
+        tokens = stream.iter_sync()
+        try:
+            st.write_stream(tokens)
+        finally:
+            # Cancels generation if the script is stopped mid-answer
+            tokens.close()
+
+        metrics = stream.metrics
+        caption = ""
+        if metrics.time_to_first_token is not None:
+            caption = f"First token in {metrics.time_to_first_token * 1000:.0f} ms"
+            if metrics.tokens_per_second is not None:
+                caption += f" · {metrics.tokens_per_second:.0f} tokens/s"
+            if stream.cached:
+                caption += " · answered from cache"
+            st.caption(caption)
+
+    st.session_state.chat_messages.append(
+        {"role": "assistant", "content": stream.text, "caption": caption}
+    )
+
+# Sidebar
+with st.sidebar:
+    st.markdown("### 💡 Try asking")
+    st.markdown("""
+    - Are facial expressions optional?
+    - What will I learn in the greetings module?
+    - Where should my hand be for "Hello"?
+    """)
+    with st.expander("📈 Assistant Metrics"):
+        streams = chat_metrics()
+        cache = get_assistant().cache.stats()
+        st.metric("Median time to first token", f"{streams['ttft_ms_p50']:.1f} ms")
+        st.metric("Median tokens/s", f"{streams['tokens_per_second_p50']:.0f}")
+        st.metric("Cache hit rate", f"{cache['hit_rate']:.0%}")
+        st.metric("Time saved by cache", f"{cache['seconds_saved']:.2f} s")
+    if st.button("🗑️ Clear Conversation", use_container_width=True):
+        st.session_state.chat_messages = []
+        st.rerun()
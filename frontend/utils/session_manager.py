@@ -0,0 +1,148 @@
+"""
+Session manager
+
+Learner state lives in `st.session_state` while a page runs and in the
+backend session store (`backend/core/session_store.py`) between sessions,
+so it survives server restarts and is shared by every Streamlit process
+serving the same users.
+
+The learner is identified by the `uid` query parameter, which is added to
+the URL on the first visit; bookmarking or reloading the page keeps it.
+
+Each page calls `init_session()` before reading state and `save_session()`
+at the end of the script. Saving only queues the keys whose value changed
+since the last save; the store writes them in the background, so a rerun
+never waits on the disk. A key removed from the session is saved as a
+tombstone, so it stays removed for the next session.
+
+Dicts that several tabs of one learner update side by side (`ENTRY_KEYS`)
+are saved one entry per store key, like the progress counters, so a tab
+only writes back the entries it changed and keeps the others' entries.
+"""
+
+import json
+import uuid
+from typing import Any, Dict, Iterator, Tuple
+
+import streamlit as st
+
+from backend.core.session_store import SessionStore, open_session_store
+
+# Session state keys kept across sessions
+PERSISTED_KEYS = (
+    "user_profile",
+    "module_progress",
+    "lesson_state",
+    "current_lesson",
+    "basic_info",
+    "quiz_answers",
+    "assessment_step",
+    "assessment_result",
+    "assessment_complete",
+)
+# Persisted dicts saved one entry per store key, as "<key>/<entry>"
+ENTRY_KEYS = ("module_progress", "lesson_state")
+USER_PARAM = "uid"
+
+# Stored in place of a value removed from the session
+_DELETED = {"_deleted": True}
+
+# Session state key holding the JSON last saved for each persisted key
+_SAVED_KEY = "_persisted_state"
+
+
+@st.cache_resource
+def get_session_store() -> SessionStore:
+    """The session store shared by every session of this server process"""
+    return open_session_store()
+
+
+def get_user_id() -> str:
+    """The learner's id, taken from or added to the page URL"""
+    if "user_id" not in st.session_state:
+        st.session_state.user_id = st.query_params.get(USER_PARAM) or uuid.uuid4().hex
+    if st.query_params.get(USER_PARAM) != st.session_state.user_id:
+        st.query_params[USER_PARAM] = st.session_state.user_id
+    return st.session_state.user_id
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, sort_keys=True)
+
+
+def _restore_int_keys(value: Any) -> Any:
+    """JSON turns dict keys into strings; give integer keys (question indices) back"""
+    if isinstance(value, dict):
+        return {int(key) if isinstance(key, str) and key.isdigit() else key: _restore_int_keys(item)
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [_restore_int_keys(item) for item in value]
+    return value
+
+
+def _is_persisted(store_key: str) -> bool:
+    """Whether a session store key holds a persisted key or one of its entries"""
+    return store_key in PERSISTED_KEYS or store_key.partition("/")[0] in ENTRY_KEYS
+
+
+def _stored_items(key: str) -> Iterator[Tuple[str, Any]]:
+    """(store key, value) pairs a persisted session key is saved as"""
+    value = st.session_state.get(key)
+    if key not in ENTRY_KEYS:
+        yield key, value
+    elif isinstance(value, dict):
+        for entry, item in value.items():
+            yield f"{key}/{entry}", item
+
+
+def init_session() -> str:
+    """
+    Restore the learner's saved state on the first run of a session
+
+    Keys already set in this session are left alone.
+
+    Returns:
+        The learner's id
+    """
+    user_id = get_user_id()
+    if _SAVED_KEY not in st.session_state:
+        saved = {key: value for key, value in get_session_store().load(user_id).items()
+                 if _is_persisted(key) and value != _DELETED}
+        restored: Dict[str, Any] = {key: saved[key] for key in PERSISTED_KEYS if key in saved}
+        for store_key, value in saved.items():
+            key, _, entry = store_key.partition("/")
+            if entry and key in ENTRY_KEYS:
+                # Entries override a whole dict saved before entries were split out
+                base = restored.get(key)
+                restored[key] = {**(base if isinstance(base, dict) else {}), entry: value}
+        for key, value in restored.items():
+            if key not in st.session_state:
+                st.session_state[key] = _restore_int_keys(value)
+        st.session_state[_SAVED_KEY] = {key: _encode(value) for key, value in saved.items()}
+    return user_id
+
+
+def save_session() -> None:
+    """Queue every persisted key that changed or was removed since the last save"""
+    user_id = get_user_id()
+    saved: Dict[str, str] = st.session_state.setdefault(_SAVED_KEY, {})
+    store = get_session_store()
+    current = set()
+    for key in PERSISTED_KEYS:
+        if key not in st.session_state:
+            continue
+        for store_key, value in _stored_items(key):
+            current.add(store_key)
+            try:
+                encoded = _encode(value)
+            except TypeError:
+                # Not JSON-serializable (e.g. a live object); kept for this session only
+                continue
+            if saved.get(store_key) != encoded:
+                store.put(user_id, store_key, value)
+                saved[store_key] = encoded
+    # Saved keys (and entries) no longer in the session, including a whole
+    # dict saved before its entries were split out
+    for store_key in [key for key in saved if key not in current]:
+        store.put(user_id, store_key, _DELETED)
+        del saved[store_key]